@@ -24,8 +24,20 @@ NOT_COUNT = 0
 CREATED = 1
 UPDATED = 2
 ERROR = 3
+SKIPPED = 4  # updated without writing the unchanged resource
 
 JOB_TASK_STAT_EXPIRE_TIME = 3600  # 1 hour
+UNCHANGED_FLUSH_SIZE = 1000  # refresh unchanged resources by chunk of this size
 WATCHDOG_WAITING_TIME = 30  # wait 30 seconds, before watchdog works
+QUEUE_PUSH_SIZE = 1000  # push tasks to queue by chunk of this size
+CLEANUP_CHUNK_SIZE = 1000  # clean up disconnected resources by chunk of this size
+CLEANUP_CURSOR_EXPIRE_TIME = 86400  # resume cleanup from its cursor within 1 day
+HISTORY_INSERT_SIZE = 1000  # insert histories by chunk of this size
+HISTORY_SWEEP_SIZE = 1000  # archive old histories by chunk of this size
 
 MAX_MESSAGE_LENGTH = 2000
+
+# job task errors are aggregated by (error_code, resource_type)
+ERROR_FLUSH_SIZE = 100  # save buffered errors per this number of errors
+MAX_ERROR_SAMPLES = 5  # sample messages per error type
+MAX_ERROR_TYPES = 100  # error types per job task
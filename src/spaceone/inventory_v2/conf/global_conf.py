@@ -53,6 +53,28 @@ CONNECTORS = {
     }
 }
 
+# gRPC Channel Pool Settings
+# Channels not used for this time (seconds) are closed
+GRPC_CHANNEL_IDLE_TIMEOUT = 600
+# Max concurrent calls and streams per channel (0: unlimited)
+GRPC_CHANNEL_MAX_STREAMS = 0
+# Wait time (seconds) for a stream when a channel has max streams
+GRPC_CHANNEL_STREAM_TIMEOUT = 60
+
+# Near Cache Settings
+# Cacheable keys with these prefixes are also cached in process before Redis
+NEAR_CACHE_PREFIXES = ["inventory:project:", "inventory:service-account:"]
+# Values are kept in process for this time (seconds)
+NEAR_CACHE_TTL = 5
+# Max number of values kept in process
+NEAR_CACHE_MAX_SIZE = 10000
+
+# Plugin Endpoint Cache Settings
+# Plugin endpoints are cached for this time (seconds)
+PLUGIN_ENDPOINT_CACHE_TTL = 60
+# Failures of getting plugin endpoint are cached for this time (seconds)
+PLUGIN_ENDPOINT_ERROR_CACHE_TTL = 10
+
 # Queue Settings
 QUEUES = {
     "inventory_q": {
@@ -63,5 +85,74 @@ QUEUES = {
     },
 }
 # Scheduler Settings
-SCHEDULERS = {}
+# Deployments which override SCHEDULERS should keep inventory_deferred_task_scheduler,
+# or deferred collecting tasks are pushed only when a concurrency lease is released,
+# and inventory_history_scheduler, or HISTORY_HOT_DAYS and HISTORY_RETENTION_DAYS
+# are not applied
+SCHEDULERS = {
+    "inventory_deferred_task_scheduler": {
+        "backend": "spaceone.inventory_v2.interface.task.v1.inventory_scheduler."
+        "InventoryDeferredTaskScheduler",
+        "queue": "inventory_q",
+        "interval": 10,
+    },
+    "inventory_history_scheduler": {
+        "backend": "spaceone.inventory_v2.interface.task.v1.inventory_scheduler."
+        "InventoryHistoryScheduler",
+        "queue": "inventory_q",
+        "interval": 3600,
+    },
+}
 WORKERS = {}
+
+# Collector Settings
+# Upsert collected resources by chunk of this size (0: disabled)
+COLLECTING_BATCH_SIZE = 0
+# Resolve match rules from in-memory index of existing assets
+COLLECTING_MATCH_INDEX = False
+# Skip writing assets whose collected data are not changed since the last collecting
+COLLECTING_CONTENT_HASH = False
+# Read, match and write collected resources in parallel stages with queues of this size
+# (0: disabled, not used with COLLECTING_BATCH_SIZE)
+COLLECTING_PIPELINE_QUEUE_SIZE = 0
+# Collecting tasks over the plugin concurrency are pushed again after this delay (seconds)
+# (pushed by InventoryDeferredTaskScheduler or when a concurrency lease is released)
+# Without redis cache, deferred tasks are kept in memory of the worker until the delay
+COLLECTING_DEFER_DELAY = 60
+# Concurrency lease of a job task expires after this time (seconds), if it is not released
+COLLECTING_LEASE_TIMEOUT = 10800
+# Skip per-resource rollbacks while collecting (assets created by a failed sub task
+# are deleted by their asset_ids instead)
+COLLECTING_BULK_MODE = False
+# Max threads to get tasks of secrets in parallel when a collect is requested
+COLLECTING_PLANNING_WORKERS = 16
+# Getting tasks of a secret fails after this time (seconds)
+COLLECTING_PLANNING_TIMEOUT = 60
+# Tasks from plugin are reused by next collects for this time (seconds) (0: disabled)
+COLLECTING_TASKS_CACHE_TTL = 0
+# Collect only creates the job in PLANNING state, and tasks are planned by worker
+COLLECTING_ASYNC_PLANNING = False
+# plugin_info and secret data of job are stored in cache for this time (seconds),
+# and collecting task messages refer to them (0: disabled, embedded in each message)
+COLLECTING_JOB_CONTEXT_TTL = 0
+# Disconnected assets are tracked by collection generation stamped on assets
+# instead of collection states (existing states are moved to assets lazily)
+COLLECTING_GENERATION_MODE = False
+
+# Collector Rule Settings
+# Compiled collector rules are checked for changes by other processes after this time
+# (seconds)
+COLLECTOR_RULE_CACHE_TTL = 10
+# Projects and service accounts of a domain are loaded at once for actions of
+# collector rules, and reloaded after this time (seconds) (0: disabled, query each value)
+IDENTITY_SNAPSHOT_TTL = 300
+
+# History Settings
+# Histories older than this (days) are moved to archive by InventoryHistoryScheduler
+# (0: disabled)
+HISTORY_HOT_DAYS = 0
+# Histories older than this (days) are deleted by InventoryHistoryScheduler, archived
+# ones by month (0: disabled)
+HISTORY_RETENTION_DAYS = 0
+# Before and after values of archived histories over this size (bytes) are compressed
+HISTORY_COMPRESS_SIZE = 4096
@@ -1,3 +1,6 @@
+from spaceone.inventory_v2.connector.pooled_space_connector import (
+    PooledSpaceConnector,
+)
 from spaceone.inventory_v2.connector.collector_plugin_connector import (
     BaseCollectorPluginConnector,
 )
@@ -1,5 +1,8 @@
 from spaceone.core.connector import BaseConnector
-from spaceone.core.connector.space_connector import SpaceConnector
+from spaceone.core.error import ERROR_BASE
+from spaceone.inventory_v2.connector.pooled_space_connector import (
+    PooledSpaceConnector,
+)
 
 
 class BaseCollectorPluginConnector(BaseConnector):
@@ -7,7 +10,7 @@ class BaseCollectorPluginConnector(BaseConnector):
 
     @classmethod
     def init_plugin(cls, endpoint: str, options: dict) -> dict:
-        plugin_connector = SpaceConnector(endpoint=endpoint, token="NO_TOKEN")
+        plugin_connector = PooledSpaceConnector(endpoint=endpoint, token="NO_TOKEN")
         return plugin_connector.dispatch("Collector.init", {"options": options})
 
     def verify_plugin(self, *args, **kwargs):
@@ -19,6 +22,19 @@ class BaseCollectorPluginConnector(BaseConnector):
     def collect(self, *args, **kwargs):
         raise NotImplementedError()
 
+    @staticmethod
+    def _is_unsupported_method(error: Exception) -> bool:
+        # plugins without optional methods (e.g. Job.get_tasks)
+        if not isinstance(error, ERROR_BASE):
+            return False
+
+        if getattr(error, "status_code", None) == "UNIMPLEMENTED":
+            return True
+
+        return error.error_code == "ERROR_CONNECTOR" and "Method not supported" in str(
+            error.message
+        )
+
     @classmethod
     def get_connector_by_collector_version(cls, collector_version: str):
         for subclass in cls.__subclasses__():
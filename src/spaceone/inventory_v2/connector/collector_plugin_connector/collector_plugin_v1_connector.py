@@ -2,12 +2,14 @@ import logging
 
 from typing import Generator
 
-from spaceone.core.connector.space_connector import SpaceConnector
 from spaceone.core.error import ERROR_BASE
 
 from spaceone.inventory_v2.connector.collector_plugin_connector import (
     BaseCollectorPluginConnector,
 )
+from spaceone.inventory_v2.connector.pooled_space_connector import (
+    PooledSpaceConnector,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,17 +21,21 @@ class CollectorPluginV1Connector(BaseCollectorPluginConnector):
         super().__init__(*args, **kwargs)
 
     def verify_plugin(self, endpoint: str, secret_data: dict, options: dict) -> dict:
-        plugin_connector = SpaceConnector(endpoint=endpoint, token="NO_TOKEN")
+        plugin_connector = PooledSpaceConnector(endpoint=endpoint, token="NO_TOKEN")
         params = {"options": options, "secret_data": secret_data}
         return plugin_connector.dispatch("Collect.collect", params)
 
     def get_tasks(self, endpoint: str, options: dict, secret_data: dict) -> dict:
         try:
-            plugin_connector = SpaceConnector(endpoint=endpoint, token="NO_TOKEN")
+            plugin_connector = PooledSpaceConnector(endpoint=endpoint, token="NO_TOKEN")
             params = {"options": options, "secret_data": secret_data}
             return plugin_connector.dispatch("Job.get_tasks", params)
         except Exception as e:
-            return {"tasks": []}
+            # other errors are reported as failed tasks of the secret
+            if self._is_unsupported_method(e):
+                return {"tasks": []}
+
+            raise e
 
     def collect(
         self,
@@ -38,7 +44,7 @@ class CollectorPluginV1Connector(BaseCollectorPluginConnector):
         secret_data: dict,
         task_options: dict = None,
     ) -> Generator[dict, None, None]:
-        plugin_connector = SpaceConnector(endpoint=endpoint, token="NO_TOKEN")
+        plugin_connector = PooledSpaceConnector(endpoint=endpoint, token="NO_TOKEN")
 
         params = {"options": options, "secret_data": secret_data, "filter": {}}
 
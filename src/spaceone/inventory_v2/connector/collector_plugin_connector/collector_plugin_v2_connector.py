@@ -1,17 +1,77 @@
-from spaceone.inventory_v2.connector import BaseCollectorPluginConnector
+import logging
+
+from typing import Generator
+
+from spaceone.inventory_v2.connector.collector_plugin_connector import (
+    BaseCollectorPluginConnector,
+)
+from spaceone.inventory_v2.connector.pooled_space_connector import (
+    PooledSpaceConnector,
+)
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class CollectorPluginV2Connector(BaseCollectorPluginConnector):
-    collector_version = "v1"
+    """
+    Plugins of collector version v2 send resources in batches
+    ({'resources': [resource_data, ...], 'resume_token': 'str'}),
+    and resource_data is already normalized to Asset, AssetType and Region.
+    """
+
+    collector_version = "v2"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.resume_token = None
+
+    def verify_plugin(self, endpoint: str, secret_data: dict, options: dict) -> dict:
+        plugin_connector = PooledSpaceConnector(endpoint=endpoint, token="NO_TOKEN")
+        params = {"options": options, "secret_data": secret_data}
+        return plugin_connector.dispatch("Collector.verify", params)
+
+    def get_tasks(self, endpoint: str, options: dict, secret_data: dict) -> dict:
+        try:
+            plugin_connector = PooledSpaceConnector(endpoint=endpoint, token="NO_TOKEN")
+            params = {"options": options, "secret_data": secret_data}
+            return plugin_connector.dispatch("Job.get_tasks", params)
+        except Exception as e:
+            # other errors are reported as failed tasks of the secret
+            if self._is_unsupported_method(e):
+                return {"tasks": []}
+
+            _LOGGER.error(f"[get_tasks] failed to get tasks: {e}")
+            raise e
+
+    def collect(
+        self,
+        endpoint: str,
+        options: dict,
+        secret_data: dict,
+        task_options: dict = None,
+        resume_token: str = None,
+    ) -> Generator[dict, None, None]:
+        plugin_connector = PooledSpaceConnector(endpoint=endpoint, token="NO_TOKEN")
+
+        params = {"options": options, "secret_data": secret_data, "filter": {}}
+
+        if task_options:
+            params["task_options"] = task_options
+
+        if resume_token:
+            # plugin skips the batches which are already sent before the token
+            params["resume_token"] = resume_token
 
-    def verify_plugin(self, endpoint, secret_data, options):
-        pass
+        self.resume_token = resume_token
 
-    def get_tasks(self, params):
-        pass
+        for message in plugin_connector.dispatch("Collector.collect", params):
+            if "resources" in message:
+                yield from message["resources"]
+            elif "resource_type" in message or message.get("state") == "FAILURE":
+                # error of plugin is sent as a single resource_data
+                yield message
 
-    def collect(self, params):
-        pass
+            # token is updated when the consumer pulls past the last resource of the
+            # batch, so it is only accurate for a consumer which writes as it reads
+            if message.get("resume_token"):
+                self.resume_token = message["resume_token"]
@@ -0,0 +1,70 @@
+import logging
+import types
+from typing import Any, Generator
+
+from spaceone.core.connector.space_connector import SpaceConnector
+from spaceone.core.error import *
+
+from spaceone.inventory_v2.lib.channel_pool import PooledChannel, get_channel_pool
+
+__all__ = ["PooledSpaceConnector"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PooledSpaceConnector(SpaceConnector):
+    """
+    SpaceConnector which takes the channel from process-wide channel pool for each call.
+    A stream of the channel is held until the response (or response stream) is consumed.
+    """
+
+    name = "SpaceConnector"
+
+    def dispatch(self, method: str, params: dict = None, **kwargs) -> Any:
+        channel_pool = get_channel_pool()
+        endpoint = self._get_endpoint()
+
+        pooled_channel = channel_pool.get_channel(endpoint, self._timeout)
+        pooled_channel.acquire_stream(channel_pool.stream_timeout)
+        self._client = pooled_channel.client
+
+        try:
+            response_or_iterator = super().dispatch(method, params, **kwargs)
+        except Exception as e:
+            self._release_stream(pooled_channel, e)
+            raise e
+
+        if isinstance(response_or_iterator, types.GeneratorType):
+            return self._generate_pooled_response(pooled_channel, response_or_iterator)
+
+        self._release_stream(pooled_channel)
+        return response_or_iterator
+
+    def _init_client(self) -> None:
+        # client is taken from channel pool when dispatching
+        pass
+
+    def _generate_pooled_response(
+        self, pooled_channel: PooledChannel, response_iterator: Generator
+    ) -> Generator[Any, None, None]:
+        error = None
+
+        try:
+            yield from response_iterator
+        except Exception as e:
+            error = e
+            raise e
+        finally:
+            self._release_stream(pooled_channel, error)
+
+    def _release_stream(
+        self, pooled_channel: PooledChannel, error: Exception = None
+    ) -> None:
+        pooled_channel.release_stream()
+
+        if isinstance(error, ERROR_GRPC_CONNECTION):
+            # channel is created again at the next call
+            _LOGGER.debug(
+                f"[_release_stream] remove channel from pool: {pooled_channel.endpoint}"
+            )
+            get_channel_pool().remove_channel(pooled_channel)
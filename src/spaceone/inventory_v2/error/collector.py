@@ -17,6 +17,10 @@ class ERROR_VERIFY_PLUGIN_FAILURE(ERROR_BASE):
     _message = "Fail to verify plugin, params={params}"
 
 
+class ERROR_PLUGIN_ENDPOINT(ERROR_BASE):
+    _message = "Fail to get plugin endpoint, plugin_id={plugin_id}, reason={reason}"
+
+
 class ERROR_NO_PLUGIN_PARAMETER(ERROR_BASE):
     _message = "parameter: {param} is required"
 
@@ -55,10 +59,18 @@ class ERROR_COLLECTOR_COLLECTING(ERROR_BASE):
     _message = "collecting failed, plugin_info: {plugin_info}, filter: {filter}"
 
 
+class ERROR_COLLECTOR_PLANNING(ERROR_BASE):
+    _message = "Fail to get tasks of secret, secret_id={secret_id}, reason={reason}"
+
+
 class ERROR_COLLECT_CANCELED(ERROR_BASE):
     _message = "collecting canceled, job_id: {job_id}"
 
 
+class ERROR_JOB_CONTEXT_NOT_FOUND(ERROR_BASE):
+    _message = "job context is expired or not found, job_id: {job_id}, job_task_id: {job_task_id}"
+
+
 class ERROR_UNSUPPORTED_RESOURCE_TYPE(ERROR_BASE):
     _message = "collector can not find resource_type: {resource_type}"
 
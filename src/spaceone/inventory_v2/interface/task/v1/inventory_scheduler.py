@@ -2,11 +2,16 @@ import logging
 from datetime import datetime
 from spaceone.core.error import ERROR_CONFIGURATION
 from spaceone.core.locator import Locator
-from spaceone.core.scheduler import HourlyScheduler
+from spaceone.core.scheduler import HourlyScheduler, IntervalScheduler
 from spaceone.core import config, utils
+from spaceone.inventory_v2.manager.concurrency_manager import ConcurrencyManager
 from spaceone.inventory_v2.service.collector_service import CollectorService
 
-__all__ = ["InventoryHourlyScheduler"]
+__all__ = [
+    "InventoryHourlyScheduler",
+    "InventoryDeferredTaskScheduler",
+    "InventoryHistoryScheduler",
+]
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -71,3 +76,48 @@ class InventoryHourlyScheduler(HourlyScheduler):
             "executionEngine": "BaseWorker",
             "stages": [schedule_job],
         }
+
+
+class InventoryDeferredTaskScheduler(IntervalScheduler):
+    """Push collecting tasks deferred by concurrency when they are due"""
+
+    def __init__(self, queue, interval):
+        super().__init__(queue, interval)
+        self.locator = Locator()
+
+    def create_task(self):
+        try:
+            concurrency_mgr: ConcurrencyManager = self.locator.get_manager(
+                ConcurrencyManager
+            )
+            tasks = [
+                utils.load_json(json_task)
+                for json_task in concurrency_mgr.pop_deferred_tasks()
+            ]
+            _LOGGER.debug(f"[create_task] deferred tasks: {len(tasks)}")
+            return tasks
+        except Exception as e:
+            _LOGGER.error(e, exc_info=True)
+            return []
+
+
+class InventoryHistoryScheduler(IntervalScheduler):
+    """Archive old histories and delete expired histories (HISTORY_HOT_DAYS)"""
+
+    def create_task(self):
+        sweep_task = {
+            "locator": "MANAGER",
+            "name": "HistoryManager",
+            "metadata": {},
+            "method": "sweep_histories",
+            "params": {"params": {}},
+        }
+
+        return [
+            {
+                "name": "sweep_histories",
+                "version": "v1",
+                "executionEngine": "BaseWorker",
+                "stages": [sweep_task],
+            }
+        ]
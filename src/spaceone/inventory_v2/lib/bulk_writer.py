@@ -0,0 +1,133 @@
+"""
+This is used by collector to write many documents with one round trip.
+Documents are built the same way as MongoModel.create() and MongoModel.update()
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Type
+
+from pymongo.errors import BulkWriteError
+from spaceone.core import utils
+from spaceone.core.error import *
+from spaceone.core.model.mongo_model import MongoModel
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def make_document(model: Type[MongoModel], data: dict) -> dict:
+    create_data = {}
+
+    for name, field in model._fields.items():
+        if name in data:
+            create_data[name] = data[name]
+        else:
+            generate_id = getattr(field, "generate_id", None)
+            if generate_id:
+                create_data[name] = utils.generate_id(generate_id)
+
+            if getattr(field, "auto_now", False):
+                create_data[name] = datetime.utcnow()
+            elif getattr(field, "auto_now_add", False):
+                create_data[name] = datetime.utcnow()
+
+    for key, value in create_data.items():
+        create_data[key] = model._trim_value(value)
+
+    try:
+        document = model(**create_data)
+        document.validate()
+    except Exception as e:
+        raise ERROR_DB_QUERY(reason=e)
+
+    return document.to_mongo().to_dict()
+
+
+def make_update_data(model: Type[MongoModel], data: dict) -> dict:
+    updatable_fields = model._meta.get(
+        "updatable_fields",
+        [name for name in model._fields.keys() if name != "id"],
+    )
+
+    for name, field in model._fields.items():
+        if getattr(field, "auto_now", False):
+            if name not in data.keys():
+                data[name] = datetime.utcnow()
+
+    update_data = {}
+    for key, value in data.items():
+        if key in updatable_fields:
+            field = model._fields[key]
+            value = model._trim_value(value)
+
+            if value is None:
+                update_data[field.db_field] = None
+            else:
+                update_data[field.db_field] = field.to_mongo(value)
+
+    return update_data
+
+
+def bulk_write(model: Type[MongoModel], operations: list) -> Dict[int, ERROR_BASE]:
+    """Execute unordered bulk write
+
+    Returns:
+        failures (dict): {index of operation: error}
+    """
+
+    failures = {}
+
+    if len(operations) == 0:
+        return failures
+
+    try:
+        model._get_collection().bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            failures[write_error["index"]] = ERROR_DB_QUERY(
+                reason=write_error.get("errmsg")
+            )
+
+        _LOGGER.error(
+            f"[bulk_write] {model.__name__}: {len(failures)} of "
+            f"{len(operations)} operations failed."
+        )
+
+    return failures
+
+
+def insert_many(
+    model: Type[MongoModel], documents: List[dict], chunk_size: int = 1000
+) -> Dict[int, ERROR_BASE]:
+    """Insert documents with unordered insert_many by chunk of chunk_size
+
+    Returns:
+        failures (dict): {index of document: error}
+    """
+
+    failures = {}
+    collection = model._get_collection()
+
+    for offset in range(0, len(documents), chunk_size):
+        chunk = documents[offset : offset + chunk_size]
+
+        try:
+            collection.insert_many(chunk, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                failures[offset + write_error["index"]] = ERROR_DB_QUERY(
+                    reason=write_error.get("errmsg")
+                )
+
+    if len(failures) > 0:
+        _LOGGER.error(
+            f"[insert_many] {model.__name__}: {len(failures)} of "
+            f"{len(documents)} documents failed."
+        )
+
+    return failures
+
+
+def is_rollback_enabled(transaction) -> bool:
+    # failed job task of collecting bulk mode is cleaned up by CleanupManager
+    return not transaction.get_meta("collecting_bulk_mode", False)
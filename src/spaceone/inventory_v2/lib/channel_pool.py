@@ -0,0 +1,228 @@
+"""
+Process-wide pool of gRPC channels used by connectors of this package.
+Channels are keyed by endpoint and reused by all managers and tasks of the process.
+"""
+
+import logging
+import threading
+import time
+from typing import Union
+
+import grpc
+from spaceone.core import config, utils
+from spaceone.core.error import *
+from spaceone.core.pygrpc.client import GRPCClient
+
+__all__ = ["PooledChannel", "get_channel_pool"]
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAX_MESSAGE_LENGTH = 1024 * 1024 * 256
+_READY_TIMEOUT = 3
+_UNHEALTHY_STATES = [
+    grpc.ChannelConnectivity.TRANSIENT_FAILURE,
+    grpc.ChannelConnectivity.SHUTDOWN,
+]
+
+_CHANNEL_POOL = None
+_CHANNEL_POOL_LOCK = threading.Lock()
+
+
+class PooledChannel(object):
+    def __init__(
+        self,
+        endpoint: str,
+        timeout: Union[int, None],
+        channel: grpc.Channel,
+        client: GRPCClient,
+        max_streams: int,
+    ):
+        self.endpoint = endpoint
+        self.key = (endpoint, timeout)
+        self.client = client
+        self.state = None
+        self.is_removed = False
+        self.active_streams = 0
+        self.last_used_at = time.time()
+        self._channel = channel
+        self._lock = threading.Lock()
+
+        if max_streams > 0:
+            self._streams = threading.BoundedSemaphore(max_streams)
+        else:
+            self._streams = None
+
+        # connectivity state is updated by grpc in background
+        self._channel.subscribe(self._set_state)
+
+    def is_healthy(self) -> bool:
+        return self.state not in _UNHEALTHY_STATES
+
+    def is_idle(self, idle_timeout: int) -> bool:
+        return (
+            self.active_streams == 0 and time.time() - self.last_used_at > idle_timeout
+        )
+
+    def acquire_stream(self, timeout: int) -> None:
+        if self._streams and not self._streams.acquire(timeout=timeout):
+            raise ERROR_GRPC_CONNECTION(
+                channel=self.endpoint, message="Too many streams in the channel."
+            )
+
+        with self._lock:
+            self.active_streams += 1
+            self.last_used_at = time.time()
+
+    def release_stream(self) -> None:
+        with self._lock:
+            self.active_streams -= 1
+            self.last_used_at = time.time()
+            is_closable = self.is_removed and self.active_streams == 0
+
+        if self._streams:
+            self._streams.release()
+
+        if is_closable:
+            self.close()
+
+    def retire(self) -> None:
+        # channel removed from pool is closed after its streams are finished
+        with self._lock:
+            self.is_removed = True
+            is_closable = self.active_streams == 0
+
+        if is_closable:
+            self.close()
+
+    def close(self) -> None:
+        try:
+            self._channel.unsubscribe(self._set_state)
+            self._channel.close()
+        except Exception as e:
+            _LOGGER.debug(f"[PooledChannel] failed to close channel: {e}")
+
+    def _set_state(self, state: grpc.ChannelConnectivity) -> None:
+        self.state = state
+
+
+class ChannelPool(object):
+    def __init__(self, idle_timeout: int, max_streams: int, stream_timeout: int):
+        self.idle_timeout = idle_timeout
+        self.max_streams = max_streams
+        self.stream_timeout = stream_timeout
+        self._channels = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "created_count": 0,
+            "reused_count": 0,
+            "idle_evicted_count": 0,
+            "unhealthy_evicted_count": 0,
+        }
+
+    def get_channel(self, endpoint: str, timeout: int = None) -> PooledChannel:
+        key = (endpoint, timeout)
+
+        with self._lock:
+            self._evict_idle_channels()
+
+            pooled_channel: PooledChannel = self._channels.get(key)
+            if pooled_channel and not pooled_channel.is_healthy():
+                _LOGGER.debug(
+                    f"[get_channel] evict unhealthy channel: {endpoint} "
+                    f"(state = {pooled_channel.state})"
+                )
+                self._remove_channel(key)
+                self._stats["unhealthy_evicted_count"] += 1
+                pooled_channel = None
+
+            if pooled_channel:
+                # not to be evicted before the caller acquires a stream
+                pooled_channel.last_used_at = time.time()
+                self._stats["reused_count"] += 1
+                return pooled_channel
+
+        # channel is created without lock, since it waits until the channel is ready
+        pooled_channel = self._create_channel(endpoint, timeout)
+
+        with self._lock:
+            if key in self._channels:
+                # the channel is already created by other thread
+                pooled_channel.close()
+                self._stats["reused_count"] += 1
+            else:
+                self._channels[key] = pooled_channel
+                self._stats["created_count"] += 1
+                _LOGGER.debug(
+                    f"[get_channel] create channel: {endpoint} "
+                    f"(created = {self._stats['created_count']}, "
+                    f"reused = {self._stats['reused_count']})"
+                )
+
+            return self._channels[key]
+
+    def remove_channel(self, pooled_channel: PooledChannel) -> None:
+        with self._lock:
+            # the channel can be already replaced by other thread
+            if self._channels.get(pooled_channel.key) is pooled_channel:
+                self._remove_channel(pooled_channel.key)
+                self._stats["unhealthy_evicted_count"] += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "channel_count": len(self._channels)}
+
+    def _evict_idle_channels(self) -> None:
+        for key, pooled_channel in list(self._channels.items()):
+            if pooled_channel.is_idle(self.idle_timeout):
+                _LOGGER.debug(f"[_evict_idle_channels] evict idle channel: {key[0]}")
+                self._remove_channel(key)
+                self._stats["idle_evicted_count"] += 1
+
+    def _remove_channel(self, key: tuple) -> None:
+        pooled_channel: PooledChannel = self._channels.pop(key)
+        pooled_channel.retire()
+
+    def _create_channel(
+        self, endpoint: str, timeout: Union[int, None]
+    ) -> PooledChannel:
+        endpoint_info = utils.parse_grpc_endpoint(endpoint)
+        options = [
+            ("grpc.max_send_message_length", _MAX_MESSAGE_LENGTH),
+            ("grpc.max_receive_message_length", _MAX_MESSAGE_LENGTH),
+        ]
+
+        if endpoint_info["ssl_enabled"]:
+            channel = grpc.secure_channel(
+                endpoint_info["endpoint"], grpc.ssl_channel_credentials(), options
+            )
+        else:
+            channel = grpc.insecure_channel(endpoint_info["endpoint"], options)
+
+        try:
+            grpc.channel_ready_future(channel).result(timeout=_READY_TIMEOUT)
+            client = GRPCClient(channel, {}, endpoint_info["endpoint"], timeout)
+        except Exception as e:
+            channel.close()
+
+            if hasattr(e, "details"):
+                message = e.details()
+            else:
+                message = str(e) or "Channel is not ready."
+
+            raise ERROR_GRPC_CONNECTION(channel=endpoint, message=message)
+
+        return PooledChannel(endpoint, timeout, channel, client, self.max_streams)
+
+
+def get_channel_pool() -> ChannelPool:
+    global _CHANNEL_POOL
+
+    with _CHANNEL_POOL_LOCK:
+        if _CHANNEL_POOL is None:
+            _CHANNEL_POOL = ChannelPool(
+                config.get_global("GRPC_CHANNEL_IDLE_TIMEOUT", 600),
+                config.get_global("GRPC_CHANNEL_MAX_STREAMS", 0),
+                config.get_global("GRPC_CHANNEL_STREAM_TIMEOUT", 60),
+            )
+
+    return _CHANNEL_POOL
@@ -0,0 +1,55 @@
+"""
+This is used by HistoryManager to store large before/after values of history diff.
+Values of diff are always str or None, so a compressed value is stored as a dict.
+"""
+
+import base64
+import logging
+import zlib
+from typing import List
+
+__all__ = ["compress_diff", "decompress_diff"]
+
+_LOGGER = logging.getLogger(__name__)
+
+_COMPRESSED_TYPE = "zlib"
+_COMPRESSION_LEVEL = 6
+
+
+def compress_diff(diff: List[dict], min_size: int) -> List[dict]:
+    for diff_data in diff:
+        for key in ["before", "after"]:
+            diff_data[key] = _compress_value(diff_data.get(key), min_size)
+
+    return diff
+
+
+def decompress_diff(diff: List[dict]) -> List[dict]:
+    for diff_data in diff:
+        for key in ["before", "after"]:
+            diff_data[key] = _decompress_value(diff_data.get(key))
+
+    return diff
+
+
+def _compress_value(value: any, min_size: int) -> any:
+    if isinstance(value, str) and len(value) >= min_size:
+        compressed = zlib.compress(value.encode("utf-8"), _COMPRESSION_LEVEL)
+        return {
+            "compressed": _COMPRESSED_TYPE,
+            "value": base64.b64encode(compressed).decode("ascii"),
+        }
+
+    return value
+
+
+def _decompress_value(value: any) -> any:
+    if isinstance(value, dict) and value.get("compressed") == _COMPRESSED_TYPE:
+        try:
+            compressed = base64.b64decode(value["value"])
+            return zlib.decompress(compressed).decode("utf-8")
+        except Exception as e:
+            _LOGGER.error(f"[_decompress_value] failed to decompress value: {e}")
+            return None
+
+    return value
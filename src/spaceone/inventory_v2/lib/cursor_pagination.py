@@ -0,0 +1,242 @@
+"""
+Keyset (cursor) pagination for list methods of large collections.
+A cursor is an opaque token of the sort values and _id of the first or last item
+of a page, and the next page is queried with a range condition on (sort keys, _id)
+instead of skip, so that deep pages are read by index without scanning prefixes.
+total_count is not computed in cursor mode.
+"""
+
+import base64
+import logging
+from typing import List, Tuple, Union
+
+from bson import json_util
+from spaceone.core import utils
+from spaceone.core.error import ERROR_DB_QUERY, ERROR_INVALID_PARAMETER
+
+__all__ = ["list_by_cursor", "exclude_empty_cursors"]
+
+_LOGGER = logging.getLogger(__name__)
+
+_DEFAULT_LIMIT = 100
+_MAX_LIMIT = 1000
+
+
+def list_by_cursor(
+    models: list, query: dict, cursor: str, **query_options
+) -> Tuple[list, Union[str, None], Union[str, None]]:
+    """List items of models with the same query in keyset order
+    Items of models are returned in the order of models, so models must not
+    overlap in the sort order (e.g. History and HistoryArchive by -created_at).
+    An empty cursor ("") means the first page.
+
+    Returns:
+        vos (list)
+        next_cursor (str)
+        prev_cursor (str)
+    """
+
+    query = dict(query or {})
+    page = query.pop("page", None) or {}
+    limit = min(page.get("limit") or _DEFAULT_LIMIT, _MAX_LIMIT)
+
+    sort = _get_sort(models[0], query.get("sort"))
+    query["sort"] = sort
+    query.pop("count_only", None)
+
+    cursor_info = _decode_cursor(cursor, sort) if cursor else None
+    is_prev = cursor_info is not None and cursor_info["d"] == "prev"
+
+    if cursor_info:
+        keyset_filter = _make_keyset_filter(
+            sort, cursor_info["v"], cursor_info["i"], is_prev
+        )
+    else:
+        keyset_filter = None
+
+    order_by = _make_order_by(sort, is_prev)
+
+    vos = []
+    for model in reversed(models) if is_prev else models:
+        vos += _query_model(
+            model, query, keyset_filter, order_by, limit + 1 - len(vos), query_options
+        )
+
+        if len(vos) > limit:
+            break
+
+    has_more = len(vos) > limit
+    vos = vos[:limit]
+
+    if is_prev:
+        vos.reverse()
+
+    if len(vos) == 0:
+        return vos, None, None
+
+    if is_prev:
+        next_cursor = _encode_cursor(vos[-1], sort, "next")
+        prev_cursor = _encode_cursor(vos[0], sort, "prev") if has_more else None
+    else:
+        next_cursor = _encode_cursor(vos[-1], sort, "next") if has_more else None
+        prev_cursor = _encode_cursor(vos[0], sort, "prev") if cursor_info else None
+
+    return vos, next_cursor, prev_cursor
+
+
+def exclude_empty_cursors(data: dict) -> dict:
+    # response of page mode has no cursor keys
+    for key in ["next_cursor", "prev_cursor"]:
+        if data.get(key) is None:
+            data.pop(key, None)
+
+    return data
+
+
+def _get_sort(model, sort: Union[list, None]) -> List[dict]:
+    if sort:
+        return [
+            {"key": sort_option["key"], "desc": bool(sort_option.get("desc"))}
+            for sort_option in sort
+            if sort_option.get("key") not in ["id", "_id"]
+        ]
+
+    sort = []
+    for key in model._meta.get("ordering") or []:
+        if key.startswith("-"):
+            sort.append({"key": key[1:], "desc": True})
+        else:
+            sort.append({"key": key.lstrip("+"), "desc": False})
+
+    return sort
+
+
+def _query_model(
+    model,
+    query: dict,
+    keyset_filter: Union[dict, None],
+    order_by: List[str],
+    limit: int,
+    query_options: dict,
+) -> list:
+    query = dict(query)
+    minimal = query.pop("minimal", False)
+
+    # sort keys are always loaded, because cursors are made from their values
+    sort_keys = [key.lstrip("-") for key in order_by]
+
+    if only := query.get("only"):
+        query["only"] = list(dict.fromkeys(list(only) + sort_keys))
+
+    vos, _ = model.query(**query, include_count=False, **query_options)
+
+    try:
+        if keyset_filter:
+            vos = vos.filter(__raw__=keyset_filter)
+
+        if minimal and (minimal_fields := model._meta.get("minimal_fields")):
+            vos = vos.only(*dict.fromkeys(minimal_fields + sort_keys))
+
+        return list(vos.order_by(*order_by).limit(limit))
+
+    except Exception as e:
+        raise ERROR_DB_QUERY(reason=e)
+
+
+def _make_order_by(sort: List[dict], is_prev: bool) -> List[str]:
+    order_by = []
+    for sort_option in sort:
+        is_desc = sort_option["desc"] is not is_prev
+        order_by.append(f'-{sort_option["key"]}' if is_desc else sort_option["key"])
+
+    # ties are ordered by id, the same as MongoModel.query()
+    order_by.append("-id" if is_prev else "id")
+    return order_by
+
+
+def _make_keyset_filter(
+    sort: List[dict], values: list, last_id: any, is_prev: bool
+) -> dict:
+    # (k1 after v1) or (k1 = v1 and k2 after v2) or ... or (all equal and _id after)
+    conditions = []
+    equal_conditions = {}
+
+    for sort_option, value in zip(sort, values):
+        key = _get_db_key(sort_option["key"])
+        is_desc = sort_option["desc"] is not is_prev
+
+        conditions.append(
+            {**equal_conditions, **_make_after_condition(key, value, is_desc)}
+        )
+        equal_conditions[key] = value
+
+    conditions.append(
+        {**equal_conditions, "_id": {"$lt" if is_prev else "$gt": last_id}}
+    )
+
+    return {"$or": conditions}
+
+
+def _make_after_condition(key: str, value: any, is_desc: bool) -> dict:
+    # null (or missing) values are ordered before all other values
+    if is_desc:
+        if value is None:
+            return {"_id": {"$exists": False}}
+
+        return {"$or": [{key: {"$lt": value}}, {key: None}]}
+    else:
+        if value is None:
+            return {key: {"$ne": None}}
+
+        return {key: {"$gt": value}}
+
+
+def _get_db_key(key: str) -> str:
+    return "_id" if key == "id" else key
+
+
+def _encode_cursor(vo, sort: List[dict], direction: str) -> str:
+    data = vo.to_mongo().to_dict()
+    cursor_info = {
+        "s": _get_sort_signature(sort),
+        "v": [utils.get_dict_value(data, sort_option["key"]) for sort_option in sort],
+        "i": data["_id"],
+        "d": direction,
+    }
+
+    cursor = json_util.dumps(cursor_info, separators=(",", ":"))
+    return base64.urlsafe_b64encode(cursor.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort: List[dict]) -> dict:
+    try:
+        cursor_info = json_util.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        )
+        is_valid = (
+            cursor_info["d"] in ["next", "prev"]
+            and len(cursor_info["v"]) == len(sort)
+            and "i" in cursor_info
+        )
+        signature = cursor_info["s"]
+    except Exception as e:
+        _LOGGER.debug(f"[_decode_cursor] invalid cursor: {e}")
+        is_valid = False
+        signature = None
+
+    if not is_valid:
+        raise ERROR_INVALID_PARAMETER(key="cursor", reason="Invalid cursor.")
+
+    if signature != _get_sort_signature(sort):
+        raise ERROR_INVALID_PARAMETER(
+            key="cursor", reason="Cursor does not match the sort of query."
+        )
+
+    return cursor_info
+
+
+def _get_sort_signature(sort: List[dict]) -> list:
+    return [
+        f'-{sort_option["key"]}' if sort_option["desc"] else sort_option["key"]
+        for sort_option in sort
+    ]
@@ -0,0 +1,182 @@
+"""
+This is used by HistoryManager to make diff of asset data.
+Sub-trees are compared by identity first and by fingerprint next, so that equal
+branches are skipped without walking or serializing them. Fingerprints ignore
+the order of dict keys and list items, the same as before/after values of diff.
+AssetManager.merge_data() keeps unchanged sub-trees of old data as they are,
+so those are skipped by identity without computing fingerprints.
+"""
+
+import hashlib
+import logging
+from operator import itemgetter
+from typing import List, Union
+
+from spaceone.core import utils
+
+__all__ = ["DiffEngine"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DiffEngine(object):
+    """
+    Fingerprints and diff values are cached by id of value for the lifetime of engine.
+    Values are kept in the cache with them, so create an engine per diff.
+    """
+
+    def __init__(self, exclude_keys: list = None, max_depth: int = 3):
+        self.exclude_keys = set(exclude_keys or [])
+        self.max_depth = max_depth
+        self._fingerprints = {}
+        self._diff_values = {}
+
+    def make_diff(self, key: str, new_value: any, old_value: any) -> List[dict]:
+        diff = []
+        self._make_diff(diff, key, new_value, old_value, 1, None)
+        return diff
+
+    def is_equal(self, new_value: any, old_value: any) -> bool:
+        if new_value is old_value:
+            return True
+        elif new_value is None or old_value is None:
+            return False
+        elif not isinstance(new_value, (dict, list)) and not isinstance(
+            old_value, (dict, list)
+        ):
+            # scalars are compared by value as before (e.g. 1 == 1.0, True == 1)
+            return new_value == old_value
+        else:
+            return self.fingerprint(new_value) == self.fingerprint(old_value)
+
+    def fingerprint(self, value: any) -> str:
+        if isinstance(value, (dict, list)):
+            if cached := self._fingerprints.get(id(value)):
+                return cached[1]
+
+            if isinstance(value, dict):
+                parts = sorted(
+                    f"{sub_key}={self.fingerprint(sub_value)}"
+                    for sub_key, sub_value in value.items()
+                )
+                fingerprint = self._hash("d", parts)
+            else:
+                parts = sorted(self.fingerprint(sub_value) for sub_value in value)
+                fingerprint = self._hash("l", parts)
+
+            self._fingerprints[id(value)] = (value, fingerprint)
+            return fingerprint
+        elif value is None:
+            return "n"
+        elif isinstance(value, (bool, int, float)):
+            # numbers equal by value have the same fingerprint (e.g. 1, 1.0, True)
+            if isinstance(value, float) and not value.is_integer():
+                return self._hash("f", [repr(value)])
+            else:
+                return self._hash("f", [str(int(value))])
+        else:
+            return self._hash("s", [str(value)])
+
+    def to_diff_value(self, value: any) -> Union[str, None]:
+        if isinstance(value, (dict, list)):
+            if cached := self._diff_values.get(id(value)):
+                return cached[1]
+
+            diff_value = utils.dump_json(self._sort_value(value))
+            self._diff_values[id(value)] = (value, diff_value)
+            return diff_value
+        elif value is None:
+            return value
+        else:
+            return str(value)
+
+    def _make_diff(
+        self,
+        diff: list,
+        key: str,
+        new_value: any,
+        old_value: any,
+        depth: int,
+        parent_key: Union[str, None],
+    ) -> None:
+        if self.is_equal(new_value, old_value):
+            return None
+
+        if depth < self.max_depth and isinstance(new_value, dict):
+            parent_key = key if parent_key is None else f"{parent_key}.{key}"
+
+            if not isinstance(old_value, dict):
+                old_value = {}
+
+            for sub_key, sub_value in new_value.items():
+                self._make_diff(
+                    diff,
+                    sub_key,
+                    sub_value,
+                    old_value.get(sub_key),
+                    depth + 1,
+                    parent_key,
+                )
+        else:
+            diff_key = key if parent_key is None else f"{parent_key}.{key}"
+
+            # excluded keys are checked before serializing values
+            if diff_key in self.exclude_keys:
+                return None
+
+            diff.append(
+                {
+                    "key": diff_key,
+                    "before": self.to_diff_value(old_value),
+                    "after": self.to_diff_value(new_value),
+                    "type": "ADDED" if old_value is None else "CHANGED",
+                }
+            )
+
+    def _sort_value(self, value: any) -> any:
+        # values are copied while sorting, not to change asset data
+        if isinstance(value, dict):
+            return self._sort_dict_value(value)
+        elif isinstance(value, list):
+            return self._sort_list_values(value)
+        else:
+            return value
+
+    def _sort_dict_value(self, value: dict) -> dict:
+        sorted_value = {
+            sub_key: self._sort_value(sub_value) for sub_key, sub_value in value.items()
+        }
+
+        try:
+            return dict(sorted(sorted_value.items()))
+        except Exception:
+            return sorted_value
+
+    def _sort_list_values(self, values: list) -> list:
+        if len(values) == 0:
+            return values
+
+        sorted_values = [self._sort_value(value) for value in values]
+
+        try:
+            if isinstance(sorted_values[0], dict):
+                sort_keys = list(sorted_values[0].keys())
+                if len(sort_keys) > 0:
+                    return sorted(sorted_values, key=itemgetter(*sort_keys[:3]))
+            else:
+                return sorted(sorted_values)
+        except Exception:
+            pass
+
+        return sorted_values
+
+    @staticmethod
+    def _hash(prefix: str, parts: List[str]) -> str:
+        hash_object = hashlib.blake2b(digest_size=16)
+        hash_object.update(prefix.encode())
+
+        for part in parts:
+            hash_object.update(b"\x00")
+            hash_object.update(part.encode())
+
+        return hash_object.hexdigest()
@@ -0,0 +1,113 @@
+"""
+Process-wide snapshots of identity resources (projects, service accounts) of a domain.
+A snapshot is loaded once per TTL and shared by all threads of the process,
+and resources are looked up by any key with indexes built on first use.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, List, Union
+
+from spaceone.core import utils
+
+__all__ = ["IdentitySnapshot", "get_snapshot"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# {(resource_type, domain_id): IdentitySnapshot}
+_SNAPSHOTS = {}
+_SNAPSHOTS_LOCK = threading.Lock()
+_LOADING_LOCKS = {}
+
+
+class IdentitySnapshot(object):
+    def __init__(self, resources: List[dict]):
+        self.resources = resources
+        self.loaded_at = time.time()
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def is_expired(self, ttl: int) -> bool:
+        return time.time() - self.loaded_at > ttl
+
+    def find(self, target_key: str, target_value: any) -> Union[dict, None]:
+        """Return the first resource whose target_key is target_value
+        None is returned for values not found, the same as empty results of query.
+        """
+
+        index = self._indexes.get(target_key)
+
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(target_key)
+                if index is None:
+                    index = self._make_index(target_key)
+                    self._indexes[target_key] = index
+
+        try:
+            return index.get(target_value)
+        except TypeError:
+            # unhashable value (e.g. list) does not match any resource
+            return None
+
+    def _make_index(self, target_key: str) -> dict:
+        index = {}
+        for resource in self.resources:
+            value = utils.get_dict_value(resource, target_key)
+            values = value if isinstance(value, list) else [value]
+
+            for value in values:
+                if value is None:
+                    continue
+
+                try:
+                    index.setdefault(value, resource)
+                except TypeError:
+                    pass
+
+        return index
+
+
+def get_snapshot(
+    resource_type: str, domain_id: str, ttl: int, loader: Callable[[], List[dict]]
+) -> IdentitySnapshot:
+    key = (resource_type, domain_id)
+
+    with _SNAPSHOTS_LOCK:
+        snapshot = _SNAPSHOTS.get(key)
+        if snapshot and not snapshot.is_expired(ttl):
+            return snapshot
+
+        loading_lock = _LOADING_LOCKS.setdefault(key, threading.Lock())
+
+    # only one thread loads the snapshot, and others wait for it
+    with loading_lock:
+        with _SNAPSHOTS_LOCK:
+            snapshot = _SNAPSHOTS.get(key)
+            if snapshot and not snapshot.is_expired(ttl):
+                return snapshot
+
+        try:
+            resources = loader()
+        except Exception as e:
+            if snapshot is None:
+                raise e
+
+            # stale snapshot is used until the next load succeeds
+            _LOGGER.error(
+                f"[get_snapshot] failed to load {resource_type} ({domain_id}): {e}"
+            )
+            snapshot.loaded_at = time.time()
+            return snapshot
+
+        snapshot = IdentitySnapshot(resources)
+        _LOGGER.debug(
+            f"[get_snapshot] load {resource_type} snapshot ({domain_id}): "
+            f"{len(resources)} resources"
+        )
+
+        with _SNAPSHOTS_LOCK:
+            _SNAPSHOTS[key] = snapshot
+
+        return snapshot
@@ -0,0 +1,215 @@
+import logging
+import threading
+from typing import Tuple, Union
+
+from spaceone.inventory_v2.lib import rule_matcher
+from spaceone.inventory_v2.lib.resource_manager import ResourceManager
+
+_LOGGER = logging.getLogger(__name__)
+
+SCOPE_KEYS = ["provider", "asset_type_id"]
+DEFAULT_INDEX_KEYS = ["asset_id", "resource_id"]
+MATCH_VALUE_TYPES = (str, int, float, bool)
+
+
+class MatchIndex(object):
+    """
+    This is used by collector to resolve match rules from memory.
+    Existing resources of a scope (domain_id, workspace_id, provider, asset_type_id)
+    are loaded once with one scan, and indexed by asset_id, resource_id and
+    other match rule keys seen in the stream.
+    find() returns None if the index can not answer (e.g. match rule without provider
+    and asset_type_id), then caller falls back to DB.
+    """
+
+    def __init__(
+        self,
+        resource_manager: ResourceManager,
+        resource_type: str,
+        domain_id: str,
+        workspace_id: str,
+    ):
+        self.resource_manager = resource_manager
+        self.domain_id = domain_id
+        self.workspace_id = workspace_id
+
+        # same scope as match queries of DB (rule_matcher.make_query)
+        self.scope_filter = rule_matcher.make_scope_filter(
+            resource_type, domain_id, workspace_id
+        )
+        self.workspaces = self._get_scope_workspaces(self.scope_filter)
+        self._scopes = {}
+        self._lock = threading.RLock()
+
+    def find(self, resource: dict, conditions: dict) -> Union[Tuple[list, int], None]:
+        # index can be shared by matcher and writer of collecting pipeline
+        with self._lock:
+            return self._find(resource, conditions)
+
+    def add(self, resource: dict) -> None:
+        with self._lock:
+            self._add(resource)
+
+    def _find(self, resource: dict, conditions: dict) -> Union[Tuple[list, int], None]:
+        scope = self._get_scope(resource)
+
+        # index is scoped by provider and asset_type_id, so it can answer only the
+        # match rules which include both of them as the DB query does
+        if not all(key in conditions for key in SCOPE_KEYS):
+            return None
+
+        match_conditions = {
+            key: value for key, value in conditions.items() if key not in SCOPE_KEYS
+        }
+
+        if scope is None or len(match_conditions) == 0:
+            return None
+
+        for key, value in match_conditions.items():
+            if "." in key or not isinstance(value, MATCH_VALUE_TYPES):
+                return None
+
+        scope_index = self._load_scope(scope, list(match_conditions.keys()))
+
+        candidates = None
+        for key, value in match_conditions.items():
+            asset_ids = scope_index["postings"][key].get(value, set())
+            if candidates is None:
+                candidates = set(asset_ids)
+            else:
+                candidates &= asset_ids
+
+            if len(candidates) == 0:
+                break
+
+        match_resource = [
+            {
+                key: scope_index["records"][asset_id].get(key)
+                for key in self.resource_manager.resource_keys
+            }
+            for asset_id in candidates
+        ]
+
+        return match_resource, len(match_resource)
+
+    def _add(self, resource: dict) -> None:
+        scope = self._get_scope(resource)
+
+        if scope is None or scope not in self._scopes:
+            return None
+
+        scope_index = self._scopes[scope]
+        asset_id = resource.get("asset_id")
+        if asset_id is None:
+            return None
+
+        record = scope_index["records"].get(asset_id, {"asset_id": asset_id})
+        self._remove_record(scope_index, asset_id)
+
+        if resource.get("workspace_id", self.workspace_id) not in self.workspaces:
+            # the resource is moved to other workspace by collector rule
+            return None
+
+        for key in self.resource_manager.resource_keys + list(
+            scope_index["postings"].keys()
+        ):
+            if key in resource:
+                record[key] = resource[key]
+
+        self._add_record(scope_index, asset_id, record)
+
+    @staticmethod
+    def _get_scope_workspaces(scope_filter: list) -> list:
+        for condition in scope_filter:
+            if condition["k"] == "workspace_id":
+                if condition["o"] == "in":
+                    return list(condition["v"])
+                else:
+                    return [condition["v"]]
+
+        return []
+
+    @staticmethod
+    def _get_scope(resource: dict) -> Union[tuple, None]:
+        scope = tuple(resource.get(key) for key in SCOPE_KEYS)
+
+        if all(isinstance(value, str) for value in scope):
+            return scope
+        else:
+            return None
+
+    def _load_scope(self, scope: tuple, keys: list) -> dict:
+        if scope not in self._scopes:
+            self._scopes[scope] = {"records": {}, "postings": {}}
+
+        scope_index = self._scopes[scope]
+        new_keys = [
+            key
+            for key in DEFAULT_INDEX_KEYS + keys
+            if key not in scope_index["postings"]
+        ]
+
+        if len(new_keys) > 0:
+            self._scan(scope, scope_index, list(dict.fromkeys(new_keys)))
+
+        return scope_index
+
+    def _scan(self, scope: tuple, scope_index: dict, keys: list) -> None:
+        query = {"filter": list(self.scope_filter)}
+
+        for key, value in zip(SCOPE_KEYS, scope):
+            query["filter"].append({"k": key, "v": value, "o": "eq"})
+
+        resources = self.resource_manager.find_resources_by_keys(query, keys)
+
+        _LOGGER.debug(
+            f"[_scan] load match index: {scope} => {len(resources)} resources "
+            f"(keys = {keys})"
+        )
+
+        for key in keys:
+            scope_index["postings"][key] = {}
+
+        for resource in resources:
+            asset_id = resource.get("asset_id")
+            record = scope_index["records"].setdefault(asset_id, {})
+            record.update(
+                {
+                    key: resource.get(key)
+                    for key in self.resource_manager.resource_keys + keys
+                }
+            )
+
+            for key in keys:
+                self._add_posting(scope_index, key, record.get(key), asset_id)
+
+    def _add_record(self, scope_index: dict, asset_id: str, record: dict) -> None:
+        scope_index["records"][asset_id] = record
+
+        for key in scope_index["postings"].keys():
+            self._add_posting(scope_index, key, record.get(key), asset_id)
+
+    def _remove_record(self, scope_index: dict, asset_id: str) -> None:
+        record = scope_index["records"].pop(asset_id, None)
+
+        if record:
+            for key, postings in scope_index["postings"].items():
+                for value in self._get_index_values(record.get(key)):
+                    if asset_ids := postings.get(value):
+                        asset_ids.discard(asset_id)
+
+    def _add_posting(
+        self, scope_index: dict, key: str, value: any, asset_id: str
+    ) -> None:
+        postings = scope_index["postings"][key]
+        for index_value in self._get_index_values(value):
+            postings.setdefault(index_value, set()).add(asset_id)
+
+    @staticmethod
+    def _get_index_values(value: any) -> list:
+        if isinstance(value, list):
+            return [v for v in value if isinstance(v, MATCH_VALUE_TYPES)]
+        elif isinstance(value, MATCH_VALUE_TYPES):
+            return [value]
+        else:
+            return []
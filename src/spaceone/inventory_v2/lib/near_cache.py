@@ -0,0 +1,217 @@
+"""
+Near cache (in-process LRU with short TTL) in front of the default cache (Redis).
+It is used for keys of cacheable methods whose prefix is in NEAR_CACHE_PREFIXES,
+and deletions are broadcast to near caches of all processes through Redis pub/sub.
+Other keys are cached in the default cache only, the same as cache.cacheable.
+"""
+
+import copy
+import fnmatch
+import inspect
+import logging
+import threading
+import time
+from typing import Union
+
+from cachetools import TTLCache
+from spaceone.core import cache, config, utils
+
+__all__ = ["cacheable", "get", "set", "delete", "delete_pattern", "get_stats"]
+
+_LOGGER = logging.getLogger(__name__)
+
+_INVALIDATION_CHANNEL = "inventory-v2:near-cache:invalidation"
+
+_NEAR_CACHE = None
+_NEAR_CACHE_LOCK = threading.Lock()
+_STATS = {
+    "near_hits": 0,
+    "near_misses": 0,
+    "redis_hits": 0,
+    "redis_misses": 0,
+}
+
+
+def cacheable(key: str, expire: int = None):
+    """Same as cache.cacheable(action='cache') of the default alias with near cache"""
+
+    def wrapper(func):
+        signature = inspect.signature(func)
+
+        def wrapped_func(*args, **kwargs):
+            if not cache.is_set():
+                return func(*args, **kwargs)
+
+            bound_args = signature.bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            cache_key = _make_cache_key(key, bound_args.arguments)
+
+            data = get(cache_key)
+            if data is not None:
+                return data
+
+            result = func(*args, **kwargs)
+            set(cache_key, result, expire=expire)
+
+            return result
+
+        return wrapped_func
+
+    return wrapper
+
+
+def get(key: str) -> any:
+    near_cache = _get_near_cache(key)
+
+    if near_cache is not None:
+        with _NEAR_CACHE_LOCK:
+            value = near_cache.get(key)
+
+        if value is not None:
+            _count("near_hits")
+            return copy.deepcopy(value)
+
+        _count("near_misses")
+
+    value = cache.get(key)
+    _count("redis_misses" if value is None else "redis_hits")
+
+    if near_cache is not None and value is not None:
+        with _NEAR_CACHE_LOCK:
+            near_cache[key] = copy.deepcopy(value)
+
+    return value
+
+
+def set(key: str, value: any, expire: int = None) -> None:
+    cache.set(key, value, expire=expire)
+
+    near_cache = _get_near_cache(key)
+    if near_cache is not None and value is not None:
+        with _NEAR_CACHE_LOCK:
+            near_cache[key] = copy.deepcopy(value)
+
+
+def delete(*keys: str) -> None:
+    cache.delete(*keys)
+    _invalidate({"keys": list(keys)})
+
+
+def delete_pattern(pattern: str) -> None:
+    cache.delete_pattern(pattern)
+    _invalidate({"pattern": pattern})
+
+
+def get_stats() -> dict:
+    with _NEAR_CACHE_LOCK:
+        stats = dict(_STATS)
+        stats["near_size"] = len(_NEAR_CACHE) if _NEAR_CACHE is not None else 0
+
+    return stats
+
+
+def _get_near_cache(key: str) -> Union[TTLCache, None]:
+    global _NEAR_CACHE
+
+    if not _is_near_cache_key(key):
+        return None
+
+    if _NEAR_CACHE is None:
+        with _NEAR_CACHE_LOCK:
+            if _NEAR_CACHE is None:
+                _NEAR_CACHE = TTLCache(
+                    maxsize=config.get_global("NEAR_CACHE_MAX_SIZE", 10000),
+                    ttl=config.get_global("NEAR_CACHE_TTL", 5),
+                )
+                _start_listener()
+
+    return _NEAR_CACHE
+
+
+def _is_near_cache_key(key: str) -> bool:
+    for prefix in config.get_global("NEAR_CACHE_PREFIXES", []):
+        if key.startswith(prefix):
+            return True
+
+    return False
+
+
+def _invalidate(message: dict) -> None:
+    _invalidate_near_cache(message)
+
+    # near caches of other processes are invalidated by the listener
+    try:
+        backend = _get_cache_backend()
+        if hasattr(backend, "conn"):
+            backend.conn.publish(_INVALIDATION_CHANNEL, utils.dump_json(message))
+    except Exception as e:
+        _LOGGER.error(f"[_invalidate] failed to publish invalidation: {e}")
+
+
+def _invalidate_near_cache(message: dict) -> None:
+    if _NEAR_CACHE is None:
+        return None
+
+    with _NEAR_CACHE_LOCK:
+        if pattern := message.get("pattern"):
+            for key in list(_NEAR_CACHE.keys()):
+                if fnmatch.fnmatchcase(key, pattern):
+                    _NEAR_CACHE.pop(key, None)
+        else:
+            for key in message.get("keys", []):
+                _NEAR_CACHE.pop(key, None)
+
+
+def _start_listener() -> None:
+    backend = _get_cache_backend()
+
+    if not hasattr(backend, "conn"):
+        _LOGGER.debug("[_start_listener] cache backend does not support pub/sub.")
+        return None
+
+    listener = threading.Thread(
+        target=_listen, args=(backend.conn,), name="NearCacheListener", daemon=True
+    )
+    listener.start()
+
+
+def _listen(conn) -> None:
+    while True:
+        try:
+            pubsub = conn.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(_INVALIDATION_CHANNEL)
+
+            for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _invalidate_near_cache(utils.load_json(message["data"]))
+
+        except Exception as e:
+            _LOGGER.error(f"[_listen] near cache listener error: {e}")
+
+        # invalidations can be missed while disconnected
+        with _NEAR_CACHE_LOCK:
+            _NEAR_CACHE.clear()
+
+        time.sleep(1)
+
+
+def _count(name: str) -> None:
+    with _NEAR_CACHE_LOCK:
+        _STATS[name] += 1
+
+
+def _make_cache_key(key_format: str, args_dict: dict) -> str:
+    # same key format as cache.cacheable
+    key_data = {}
+    for name, value in args_dict.items():
+        if isinstance(value, (list, tuple)):
+            key_data[name] = ",".join(sorted(value))
+        else:
+            key_data[name] = value
+
+    return key_format.format(**key_data)
+
+
+@cache.connect
+def _get_cache_backend(cache_cls):
+    return cache_cls
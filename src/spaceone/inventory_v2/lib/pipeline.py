@@ -0,0 +1,235 @@
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Generator, Iterable, List
+
+from spaceone.core.transaction import create_transaction, delete_transaction
+
+_LOGGER = logging.getLogger(__name__)
+
+_WAIT_TIMEOUT = 1
+_JOIN_TIMEOUT = 10
+
+
+class _EndOfStream(object):
+    pass
+
+
+class _StreamError(object):
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class _StageStat(object):
+    def __init__(self, name: str, queue_size: int = None):
+        self.name = name
+        self.queue_size = queue_size
+        self.count = 0
+        self.busy_time = 0.0
+        self.max_queue_depth = 0
+        self.total_queue_depth = 0
+
+    def add_queue_depth(self, depth: int) -> None:
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self.total_queue_depth += depth
+
+    def to_dict(self, elapsed_time: float) -> dict:
+        stat_info = {
+            "stage": self.name,
+            "count": self.count,
+            "busy_time": round(self.busy_time, 3),
+            "throughput": round(self.count / elapsed_time, 2) if elapsed_time else 0,
+        }
+
+        # depth of the input queue of the stage
+        if self.queue_size:
+            stat_info["queue_size"] = self.queue_size
+            stat_info["max_queue_depth"] = self.max_queue_depth
+            stat_info["avg_queue_depth"] = (
+                round(self.total_queue_depth / self.count, 2) if self.count else 0
+            )
+
+        return stat_info
+
+
+class Pipeline(object):
+    """
+    This is used by collector to overlap the plugin stream and DB I/O.
+    The source and each stage run in their own thread connected by bounded queues,
+    and the output of the last stage is consumed by the caller in order.
+    If the source or a stage raises an error, it is raised to the caller
+    after the items before it are consumed.
+    """
+
+    def __init__(
+        self, source_name: str, queue_size: int, transaction_meta: dict = None
+    ):
+        self.queue_size = queue_size
+        self.transaction_meta = transaction_meta or {}
+        self._source_name = source_name
+        self._stages = []
+        self._stats: List[_StageStat] = []
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._start_time = None
+        self._elapsed_time = 0.0
+
+    def add_stage(self, name: str, func: Callable[[any], any]) -> None:
+        self._stages.append((name, func))
+
+    def run(self, source: Iterable, consumer_name: str) -> Generator[any, None, None]:
+        """Start the source and stages, then yield the output of the last stage.
+        close() should be called when the caller stops consuming.
+        """
+
+        self._start_time = time.time()
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self._stages) + 1)]
+        self._stats = [_StageStat(self._source_name)] + [
+            _StageStat(name, self.queue_size)
+            for name in [name for name, func in self._stages] + [consumer_name]
+        ]
+
+        self._threads = [
+            threading.Thread(
+                target=self._run_source, args=(source, queues[0], self._stats[0])
+            )
+        ]
+        for index, (name, func) in enumerate(self._stages):
+            self._threads.append(
+                threading.Thread(
+                    target=self._run_stage,
+                    args=(
+                        func,
+                        queues[index],
+                        queues[index + 1],
+                        self._stats[index + 1],
+                    ),
+                )
+            )
+
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+        consumer_stat = self._stats[-1]
+
+        try:
+            while True:
+                item = self._get(queues[-1], consumer_stat)
+                if item is None or isinstance(item, _EndOfStream):
+                    break
+                elif isinstance(item, _StreamError):
+                    raise item.error
+
+                consumer_start_time = time.time()
+                yield item
+                consumer_stat.busy_time += time.time() - consumer_start_time
+                consumer_stat.count += 1
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._stop_event.is_set():
+            return None
+
+        self._stop_event.set()
+        for thread in self._threads:
+            # the source can be blocked by the stream, then it is left as daemon
+            thread.join(_JOIN_TIMEOUT)
+
+        self._elapsed_time = time.time() - self._start_time
+
+    def get_stats(self) -> List[dict]:
+        return [stat.to_dict(self._elapsed_time) for stat in self._stats]
+
+    def _run_source(
+        self, source: Iterable, output_queue: queue.Queue, stat: _StageStat
+    ) -> None:
+        self._set_transaction()
+
+        try:
+            iterator = iter(source)
+            while not self._stop_event.is_set():
+                start_time = time.time()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+
+                stat.busy_time += time.time() - start_time
+                stat.count += 1
+
+                if not self._put(output_queue, item):
+                    return
+
+            self._put(output_queue, _EndOfStream())
+
+        except Exception as e:
+            _LOGGER.error(f"[_run_source] {self._source_name} error: {e}")
+            self._put(output_queue, _StreamError(e))
+
+        finally:
+            delete_transaction()
+
+    def _run_stage(
+        self,
+        func: Callable[[any], any],
+        input_queue: queue.Queue,
+        output_queue: queue.Queue,
+        stat: _StageStat,
+    ) -> None:
+        self._set_transaction()
+
+        try:
+            while True:
+                item = self._get(input_queue, stat)
+                if item is None:
+                    return
+                elif isinstance(item, (_EndOfStream, _StreamError)):
+                    self._put(output_queue, item)
+                    return
+
+                start_time = time.time()
+                try:
+                    item = func(item)
+                except Exception as e:
+                    _LOGGER.error(f"[_run_stage] {stat.name} error: {e}")
+                    item = _StreamError(e)
+
+                stat.busy_time += time.time() - start_time
+                stat.count += 1
+
+                if not self._put(output_queue, item) or isinstance(item, _StreamError):
+                    return
+
+        finally:
+            delete_transaction()
+
+    def _set_transaction(self) -> None:
+        # transaction is stored per thread, so stages use a copy of caller's meta
+        create_transaction(
+            meta=self.transaction_meta, thread_id=str(threading.current_thread().ident)
+        )
+
+    def _put(self, output_queue: queue.Queue, item: any) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                output_queue.put(item, timeout=_WAIT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def _get(self, input_queue: queue.Queue, stat: _StageStat) -> any:
+        # queue depth is sampled whenever a stage takes an item
+        stat.add_queue_depth(input_queue.qsize())
+
+        while not self._stop_event.is_set():
+            try:
+                return input_queue.get(timeout=_WAIT_TIMEOUT)
+            except queue.Empty:
+                pass
+
+        return None
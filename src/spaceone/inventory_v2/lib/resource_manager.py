@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Tuple, List
 from spaceone.core.error import *
 
 
@@ -26,6 +26,18 @@ class ResourceManager(object):
 
         return resources, total_count
 
+    def find_resources_by_keys(self, query: dict, keys: list) -> List[dict]:
+        """Find resources with the values of the given keys (used for bulk matching)"""
+
+        self._check_resource_finder_state()
+        only_keys = [key.split(".", 1)[0] for key in keys]
+        query["only"] = list(dict.fromkeys(self.resource_keys + only_keys))
+        query["include_count"] = False
+
+        vos, total_count = getattr(self, self.query_method)(query)
+
+        return [vo.to_dict() for vo in vos]
+
     def delete_resources(self, query: dict) -> int:
         self._check_resource_finder_state()
         query["only"] = self.resource_keys + ["updated_at"]
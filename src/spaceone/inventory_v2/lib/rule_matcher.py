@@ -33,10 +33,7 @@ def dict_key_int_parser(data: dict) -> dict:
     return data
 
 
-def make_query(
-    key: str, rules: dict, resource: dict, domain_id: str, workspace_id: str
-) -> dict:
-    resource_type = resource.get("resource_type")
+def make_scope_filter(resource_type: str, domain_id: str, workspace_id: str) -> list:
     _filter = [{"k": "domain_id", "v": domain_id, "o": "eq"}]
 
     if resource_type in ["inventory.Asset"]:
@@ -45,10 +42,27 @@ def make_query(
         workspaces = list({workspace_id, "*"})
         _filter.append({"k": "workspace_id", "v": workspaces, "o": "in"})
 
+    return _filter
+
+
+def make_match_conditions(key: str, rules: dict, resource: dict) -> dict:
+    conditions = {}
     for rule in rules[key]:
         value = find_data(resource, rule)
         if value:
-            _filter.append({"k": rule, "v": value, "o": "eq"})
+            conditions[rule] = value
+
+    return conditions
+
+
+def make_query(
+    key: str, rules: dict, resource: dict, domain_id: str, workspace_id: str
+) -> dict:
+    resource_type = resource.get("resource_type")
+    _filter = make_scope_filter(resource_type, domain_id, workspace_id)
+
+    for rule, value in make_match_conditions(key, rules, resource).items():
+        _filter.append({"k": rule, "v": value, "o": "eq"})
 
     return {
         "filter": _filter,
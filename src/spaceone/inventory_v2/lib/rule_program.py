@@ -0,0 +1,115 @@
+"""
+This is used by CollectorRuleManager to apply collector rules to every collected asset.
+Rules of a collector are compiled once to predicates with pre-split key paths and
+pre-lowered operands, and the program is shared by all managers of the process.
+"""
+
+import logging
+from typing import Callable, List, Tuple
+
+__all__ = ["RuleProgram", "compile_rules"]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RuleProgram(object):
+    def __init__(self, managed_rules: List[tuple], custom_rules: List[tuple]):
+        # rule: (predicate, actions, stop_processing)
+        self.managed_rules = managed_rules
+        self.custom_rules = custom_rules
+
+
+def compile_rules(managed_rule_vos: list, custom_rule_vos: list) -> RuleProgram:
+    return RuleProgram(
+        [_compile_rule(rule_vo) for rule_vo in managed_rule_vos],
+        [_compile_rule(rule_vo) for rule_vo in custom_rule_vos],
+    )
+
+
+def _compile_rule(rule_vo) -> Tuple[Callable, dict, bool]:
+    conditions_policy = rule_vo.conditions_policy
+    actions = dict(rule_vo.actions or {})
+    stop_processing = bool(rule_vo.options and rule_vo.options.stop_processing)
+
+    if conditions_policy == "ALWAYS":
+        return _always, actions, stop_processing
+
+    checks = [
+        _compile_condition(condition.key, condition.value, condition.operator)
+        for condition in rule_vo.conditions
+    ]
+
+    if conditions_policy == "ALL":
+
+        def predicate(asset_data: dict) -> bool:
+            return all(check(asset_data) for check in checks)
+
+    else:
+
+        def predicate(asset_data: dict) -> bool:
+            return any(check(asset_data) for check in checks)
+
+    return predicate, actions, stop_processing
+
+
+def _always(asset_data: dict) -> bool:
+    return True
+
+
+def _compile_condition(key: str, value: any, operator: str) -> Callable:
+    key_paths = key.split(".")
+    lower_value = value.lower() if isinstance(value, str) else value
+
+    if operator == "eq":
+
+        def check(asset_data: dict) -> bool:
+            asset_value = _get_value(asset_data, key_paths)
+            return asset_value is not None and asset_value == value
+
+    elif operator == "not":
+
+        def check(asset_data: dict) -> bool:
+            asset_value = _get_value(asset_data, key_paths)
+            return asset_value is not None and asset_value != value
+
+    elif operator in ["contain", "not_contain"] and isinstance(lower_value, str):
+        is_contain = operator == "contain"
+
+        def check(asset_data: dict) -> bool:
+            asset_value = _get_value(asset_data, key_paths)
+            if not isinstance(asset_value, str):
+                return False
+
+            return (lower_value in asset_value.lower()) is is_contain
+
+    else:
+        _LOGGER.debug(f"[_compile_condition] unsupported condition: {key} {operator}")
+        return _never
+
+    return check
+
+
+def _never(asset_data: dict) -> bool:
+    return False
+
+
+def _get_value(data: any, key_paths: List[str], index: int = 0) -> any:
+    # same as utils.get_dict_value() with pre-split key paths
+    last_index = len(key_paths) - 1
+
+    while index < last_index:
+        key = key_paths[index]
+
+        if not isinstance(data, dict) or key not in data:
+            return None
+
+        data = data[key]
+        index += 1
+
+        if isinstance(data, list):
+            return [_get_value(value, key_paths, index) for value in data]
+
+    if isinstance(data, dict):
+        return data.get(key_paths[last_index])
+
+    return None
@@ -0,0 +1,46 @@
+"""
+This is used by AssetService and AssetManager to hash keys of tags.
+Distinct tag keys are few compared to the number of assets and queries,
+so hashes are memoized in a bounded LRU cache of the process.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+from spaceone.core import utils
+
+__all__ = ["hash_tag_key", "convert_tags_to_hash", "get_cache_info"]
+
+_TAG_HASH_CACHE_SIZE = 16384
+
+
+@lru_cache(maxsize=_TAG_HASH_CACHE_SIZE)
+def hash_tag_key(key: str) -> str:
+    return utils.string_to_hash(key)
+
+
+def convert_tags_to_hash(dot_tags: dict, provider: str) -> Tuple[dict, dict]:
+    """Convert tags of a provider to hashed tags and tag keys at once
+
+    Returns:
+        tags (dict): {provider: {hashed_key: {'key': key, 'value': value}}}
+        tag_keys (dict): {provider: [key, ...]}
+    """
+
+    _hash_tag_key = hash_tag_key
+    hashed_tags = {
+        _hash_tag_key(key): {"key": key, "value": value}
+        for key, value in dot_tags.items()
+    }
+
+    return {provider: hashed_tags}, {provider: list(dot_tags.keys())}
+
+
+def get_cache_info() -> dict:
+    cache_info = hash_tag_key.cache_info()
+    return {
+        "hits": cache_info.hits,
+        "misses": cache_info.misses,
+        "size": cache_info.currsize,
+        "max_size": cache_info.maxsize,
+    }
@@ -0,0 +1,61 @@
+"""
+This is used to push many worker tasks to queue with few round trips.
+Tasks are validated by SPACEONE_TASK_SCHEMA with the validator compiled once.
+"""
+
+import logging
+from functools import lru_cache
+from typing import List
+
+from jsonschema.validators import validator_for
+from spaceone.core import queue
+from spaceone.core.scheduler.task_schema import SPACEONE_TASK_SCHEMA
+
+from spaceone.inventory_v2.conf.collector_conf import QUEUE_PUSH_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def validate_task(task: dict) -> None:
+    _get_task_validator().validate(task)
+
+
+def put_tasks(topic: str, tasks: List[str]) -> None:
+    """Push tasks to the queue of topic
+
+    Tasks are pushed by RPUSH of many values in one pipeline, if the queue is
+    backed by redis. Otherwise, tasks are pushed one by one.
+    """
+
+    if len(tasks) == 0:
+        return None
+
+    queue_backend = _get_queue_backend(topic)
+    conn = getattr(queue_backend, "conn", None)
+    channel = getattr(queue_backend, "channel", None)
+
+    if conn is None or channel is None or not queue_backend.initialized:
+        for task in tasks:
+            queue.put(topic, task)
+        return None
+
+    # pipeline is executed as a transaction not to push tasks partially
+    pipeline = conn.pipeline(transaction=True)
+    for index in range(0, len(tasks), QUEUE_PUSH_SIZE):
+        pipeline.rpush(channel, *tasks[index : index + QUEUE_PUSH_SIZE])
+
+    pipeline.execute()
+    _LOGGER.debug(f"[put_tasks] push {len(tasks)} tasks to {topic}")
+
+
+@lru_cache(maxsize=1)
+def _get_task_validator():
+    validator_cls = validator_for(SPACEONE_TASK_SCHEMA)
+    validator_cls.check_schema(SPACEONE_TASK_SCHEMA)
+    return validator_cls(SPACEONE_TASK_SCHEMA)
+
+
+@queue.connection
+def _get_queue_backend(queue_backend: queue.BaseQueue) -> queue.BaseQueue:
+    # queue.connection creates the connection of topic or reuses it
+    return queue_backend
@@ -1,17 +1,21 @@
 import logging
-import copy
 import math
 import pytz
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Union
 from datetime import datetime
 
+from bson import ObjectId
+from pymongo import ASCENDING, InsertOne, UpdateOne
 from spaceone.core.model.mongo_model import QuerySet
 from spaceone.core.manager import BaseManager
 from spaceone.core import utils
 
+from spaceone.inventory_v2.lib import bulk_writer, cursor_pagination
 from spaceone.inventory_v2.lib.resource_manager import ResourceManager
+from spaceone.inventory_v2.lib.tag_hasher import hash_tag_key
 from spaceone.inventory_v2.manager.identity_manager import IdentityManager
 from spaceone.inventory_v2.model.asset.database import Asset, History
+from spaceone.inventory_v2.error.asset import ERROR_RESOURCE_ALREADY_DELETED
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +30,11 @@ MERGE_KEYS = [
     "data",
 ]
 
+# dict fields which are updated by $set/$unset of changed dotted paths
+PARTIAL_UPDATE_KEYS = ["data", "tags"]
+
+MAX_PARTIAL_UPDATE_DEPTH = 3
+
 SIZE_MAP = {
     "KB": 1024,
     "MB": 1024 * 1024,
@@ -39,7 +48,7 @@ SIZE_MAP = {
 
 
 class AssetManager(BaseManager, ResourceManager):
-    resource_keys = ["asset_id"]
+    resource_keys = ["asset_id", "content_hash"]
     query_method = "list_assets"
 
     def __init__(self, *args, **kwargs):
@@ -58,8 +67,11 @@ class AssetManager(BaseManager, ResourceManager):
         if "asset_id" not in params:
             params["asset_id"] = utils.generate_id("asset")
 
+        self._track_created_assets([params["asset_id"]])
         asset_vo: Asset = self.asset_model.create(params)
-        self.transaction.add_rollback(_rollback, asset_vo)
+
+        if bulk_writer.is_rollback_enabled(self.transaction):
+            self.transaction.add_rollback(_rollback, asset_vo)
 
         return asset_vo
 
@@ -68,11 +80,212 @@ class AssetManager(BaseManager, ResourceManager):
             _LOGGER.info(f'[ROLLBACK] Revert Data : {old_data.get("asset_id")}')
             asset_vo.update(old_data)
 
-        self.transaction.add_rollback(_rollback, asset_vo.to_dict())
-        asset_vo: Asset = asset_vo.update(params)
+        # same check as Asset.update(), which is not called by bulk write
+        if asset_vo.state == "DELETED":
+            raise ERROR_RESOURCE_ALREADY_DELETED(
+                resource_type="Asset", resource_id=asset_vo.asset_id
+            )
+
+        if bulk_writer.is_rollback_enabled(self.transaction):
+            self.transaction.add_rollback(_rollback, asset_vo.to_dict())
+
+        update = self._make_update_operation(params, asset_vo)
+        failures = bulk_writer.bulk_write(
+            self.asset_model, [UpdateOne({"_id": asset_vo.pk}, update)]
+        )
+
+        if 0 in failures:
+            raise failures[0]
+
+        asset_vo.reload()
 
         return asset_vo
 
+    def create_assets(self, params_list: List[dict]) -> Dict[int, Exception]:
+        """Create assets with one bulk write
+
+        Returns:
+            failures (dict): {index of params_list: error}
+        """
+
+        def _rollback(asset_ids: List[str]):
+            _LOGGER.info(f"[ROLLBACK] Delete assets : {len(asset_ids)} assets")
+            self.asset_model.filter(asset_id=asset_ids).delete()
+
+        failures = {}
+        operations = []
+        operation_indexes = []
+
+        for index, params in enumerate(params_list):
+            params["state"] = "ACTIVE"
+            if "asset_id" not in params:
+                params["asset_id"] = utils.generate_id("asset")
+
+            try:
+                document = bulk_writer.make_document(self.asset_model, params)
+                operations.append(InsertOne(document))
+                operation_indexes.append(index)
+            except Exception as e:
+                failures[index] = e
+
+        self._track_created_assets(
+            [params_list[index]["asset_id"] for index in operation_indexes]
+        )
+        write_failures = bulk_writer.bulk_write(self.asset_model, operations)
+        for operation_index, error in write_failures.items():
+            failures[operation_indexes[operation_index]] = error
+
+        if bulk_writer.is_rollback_enabled(self.transaction):
+            created_asset_ids = [
+                params_list[index]["asset_id"]
+                for index in operation_indexes
+                if index not in failures
+            ]
+            self.transaction.add_rollback(_rollback, created_asset_ids)
+
+        return failures
+
+    def update_assets_by_vos(
+        self, params_list: List[dict], asset_vos: List[Asset]
+    ) -> Dict[int, Exception]:
+        """Update assets with one bulk write
+
+        Returns:
+            failures (dict): {index of params_list: error}
+        """
+
+        def _rollback(old_assets: List[Tuple[Asset, dict]]):
+            _LOGGER.info(f"[ROLLBACK] Revert Data : {len(old_assets)} assets")
+            for vo, old_data in old_assets:
+                vo.update(old_data)
+
+        failures = {}
+        operations = []
+        operation_indexes = []
+
+        for index, (params, asset_vo) in enumerate(zip(params_list, asset_vos)):
+            # matched deleted asset is an error as in update_asset_by_vo
+            if asset_vo.state == "DELETED":
+                failures[index] = ERROR_RESOURCE_ALREADY_DELETED(
+                    resource_type="Asset", resource_id=asset_vo.asset_id
+                )
+                continue
+
+            update = self._make_update_operation(params, asset_vo)
+            operations.append(UpdateOne({"_id": asset_vo.pk}, update))
+            operation_indexes.append(index)
+
+        write_failures = bulk_writer.bulk_write(self.asset_model, operations)
+        for operation_index, error in write_failures.items():
+            failures[operation_indexes[operation_index]] = error
+
+        if bulk_writer.is_rollback_enabled(self.transaction):
+            self.transaction.add_rollback(
+                _rollback,
+                [
+                    (asset_vos[index], asset_vos[index].to_dict())
+                    for index in operation_indexes
+                    if index not in failures
+                ],
+            )
+
+        return failures
+
+    def touch_assets(
+        self, asset_ids: List[str], domain_id: str, collection_generation: int = None
+    ) -> None:
+        # only refresh last_collected_at of assets which are not changed
+        update_data = {"last_collected_at": datetime.utcnow()}
+
+        if collection_generation is not None:
+            update_data["collection_generation"] = collection_generation
+            update_data["disconnected_count"] = 0
+
+        asset_vos = self.filter_assets(asset_id=asset_ids, domain_id=domain_id)
+        asset_vos.update(update_data)
+
+    def delete_assets_by_asset_ids(self, asset_ids: List[str], domain_id: str) -> int:
+        asset_vos = self.filter_assets(asset_id=asset_ids, domain_id=domain_id)
+        deleted_count = asset_vos.count()
+        asset_vos.delete()
+
+        return deleted_count
+
+    def get_active_assets(self, asset_ids: List[str], domain_id: str) -> List[dict]:
+        conditions = {
+            "asset_id": {"$in": asset_ids},
+            "domain_id": domain_id,
+            "state": "ACTIVE",
+        }
+        projection = {
+            "_id": 0,
+            "asset_id": 1,
+            "project_id": 1,
+            "workspace_id": 1,
+            "domain_id": 1,
+        }
+
+        return list(self.asset_model._get_collection().find(conditions, projection))
+
+    def delete_active_assets(self, asset_ids: List[str], domain_id: str) -> int:
+        # disconnected assets are deleted, so that they are created again if collected
+        conditions = {
+            "asset_id": {"$in": asset_ids},
+            "domain_id": domain_id,
+            "state": "ACTIVE",
+        }
+
+        result = self.asset_model._get_collection().delete_many(conditions)
+
+        return result.deleted_count
+
+    def increment_disconnected_count(
+        self,
+        collector_id: str,
+        secret_id: str,
+        collection_generation: int,
+        domain_id: str,
+    ) -> int:
+        # assets not stamped by the generation are disconnected from collector
+        result = self.asset_model._get_collection().update_many(
+            {
+                "collector_id": collector_id,
+                "secret_id": secret_id,
+                "domain_id": domain_id,
+                "state": "ACTIVE",
+                "collection_generation": {"$lt": collection_generation},
+            },
+            {"$inc": {"disconnected_count": 1}},
+        )
+
+        return result.modified_count
+
+    def list_disconnected_assets(
+        self,
+        collector_id: str,
+        domain_id: str,
+        disconnected_count: int,
+        last_id: Union[ObjectId, None],
+        limit: int,
+    ) -> List[dict]:
+        # assets are read by _id range, so that the memory is bounded by limit
+        conditions = {
+            "collector_id": collector_id,
+            "domain_id": domain_id,
+            "state": "ACTIVE",
+            "disconnected_count": {"$gte": disconnected_count},
+        }
+
+        if last_id:
+            conditions["_id"] = {"$gt": last_id}
+
+        return list(
+            self.asset_model._get_collection()
+            .find(conditions, projection={"_id": 1, "asset_id": 1})
+            .sort("_id", ASCENDING)
+            .limit(limit)
+        )
+
     @staticmethod
     def delete_cloud_service_by_vo(asset_vo: Asset) -> None:
         asset_vo.delete()
@@ -94,6 +307,9 @@ class AssetManager(BaseManager, ResourceManager):
 
         return self.asset_model.get(**conditions)
 
+    def filter_assets(self, **conditions) -> QuerySet:
+        return self.asset_model.filter(**conditions)
+
     def list_assets(
             self,
             query: dict,
@@ -103,18 +319,27 @@ class AssetManager(BaseManager, ResourceManager):
             reference_filter: dict = None,
     ) -> Tuple[QuerySet, int]:
         if change_filter:
-            query = self._change_filter_tags(query)
-            query = self._change_only_tags(query)
-            query = self._change_sort_tags(query)
-            query = self._change_filter_project_group_id(query, domain_id)
-
-            # Append Query for DELETED filter (Temporary Logic)
-            query = self._append_state_query(query)
+            query = self._change_list_query(query, domain_id)
 
         return self.asset_model.query(
             **query, target=target, reference_filter=reference_filter
         )
 
+    def list_assets_by_cursor(
+            self,
+            query: dict,
+            cursor: str,
+            change_filter: bool = False,
+            domain_id: str = None,
+            reference_filter: dict = None,
+    ) -> Tuple[List[Asset], Union[str, None], Union[str, None]]:
+        if change_filter:
+            query = self._change_list_query(query, domain_id)
+
+        return cursor_pagination.list_by_cursor(
+            [self.asset_model], query, cursor, reference_filter=reference_filter
+        )
+
     def analyze_assets(
             self,
             query: dict,
@@ -134,6 +359,24 @@ class AssetManager(BaseManager, ResourceManager):
     def list_histories(self, query: dict) -> Tuple[QuerySet, int]:
         return self.asset_history_model.query(**query)
 
+    def _track_created_assets(self, asset_ids: List[str]) -> None:
+        # assets are tracked before writing, so that a failed sub task of
+        # collecting bulk mode can delete only the assets which it created
+        created_asset_ids = self.transaction.get_meta("collecting_created_asset_ids")
+        if created_asset_ids is not None:
+            created_asset_ids.extend(asset_ids)
+
+    def _change_list_query(self, query: dict, domain_id: str = None) -> dict:
+        query = self._change_filter_tags(query)
+        query = self._change_only_tags(query)
+        query = self._change_sort_tags(query)
+        query = self._change_filter_project_group_id(query, domain_id)
+
+        # Append Query for DELETED filter (Temporary Logic)
+        query = self._append_state_query(query)
+
+        return query
+
     def _change_filter_tags(self, query: dict) -> dict:
         change_filter = []
 
@@ -241,12 +484,77 @@ class AssetManager(BaseManager, ResourceManager):
             return key
 
         prefix, provider, key = key.split(".", 2)
-        hash_key = utils.string_to_hash(key)
+        hash_key = hash_tag_key(key)
         if only:
             return f"{prefix}.{provider}.{hash_key}"
         else:
             return f"{prefix}.{provider}.{hash_key}.value"
 
+    def _make_update_operation(self, params: dict, asset_vo: Asset) -> dict:
+        # only changed paths of dict fields are written, not the whole sub-document
+        update_data = bulk_writer.make_update_data(self.asset_model, params)
+
+        set_data = {}
+        unset_data = {}
+        for key, value in update_data.items():
+            old_value = getattr(asset_vo, key, None)
+            if (
+                key in PARTIAL_UPDATE_KEYS
+                and isinstance(value, dict)
+                and isinstance(old_value, dict)
+            ):
+                self._make_partial_update(key, value, old_value, set_data, unset_data)
+            else:
+                set_data[key] = value
+
+        update = {"$set": set_data}
+        if unset_data:
+            update["$unset"] = unset_data
+
+        return update
+
+    def _make_partial_update(
+        self,
+        path: str,
+        new_value: dict,
+        old_value: dict,
+        set_data: dict,
+        unset_data: dict,
+        depth: int = 1,
+    ) -> None:
+        if depth > MAX_PARTIAL_UPDATE_DEPTH or not self._is_dotted_path_keys(
+            list(new_value.keys()) + list(old_value.keys())
+        ):
+            set_data[path] = new_value
+            return None
+
+        for key, value in new_value.items():
+            sub_path = f"{path}.{key}"
+
+            if key not in old_value:
+                set_data[sub_path] = value
+            elif value == old_value[key]:
+                continue
+            elif isinstance(value, dict) and isinstance(old_value[key], dict):
+                self._make_partial_update(
+                    sub_path, value, old_value[key], set_data, unset_data, depth + 1
+                )
+            else:
+                set_data[sub_path] = value
+
+        for key in old_value.keys():
+            if key not in new_value:
+                unset_data[f"{path}.{key}"] = ""
+
+    @staticmethod
+    def _is_dotted_path_keys(keys: list) -> bool:
+        # keys with "." or "$" can not be a part of dotted path
+        for key in keys:
+            if not isinstance(key, str) or key == "" or "." in key or key[0] == "$":
+                return False
+
+        return True
+
     @staticmethod
     def merge_data(new_data: dict, old_data: dict) -> dict:
         for key in MERGE_KEYS:
@@ -254,6 +562,7 @@ class AssetManager(BaseManager, ResourceManager):
                 new_value = new_data[key]
                 old_value = old_data.get(key)
                 if key in ["data", "tags"]:
+                    old_value = old_value or {}
                     is_changed = False
                     for sub_key, sub_value in new_value.items():
                         if sub_value != old_value.get(sub_key):
@@ -261,7 +570,9 @@ class AssetManager(BaseManager, ResourceManager):
                             break
 
                     if is_changed:
-                        merged_value = copy.deepcopy(old_value)
+                        # unchanged sub values are shared with old data, so that
+                        # history diff skips them by identity
+                        merged_value = dict(old_value)
                         merged_value.update(new_value)
                         new_data[key] = merged_value
                     else:
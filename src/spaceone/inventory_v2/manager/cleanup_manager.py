@@ -1,31 +1,47 @@
 import logging
-from typing import Tuple
+from typing import List, Tuple, Union
 from datetime import datetime, timedelta
 
-from spaceone.core import config
+from bson import ObjectId
+from spaceone.core import cache, config
 from spaceone.core.manager import BaseManager
 from spaceone.inventory_v2.manager.collection_state_manager import (
     CollectionStateManager,
 )
 from spaceone.inventory_v2.manager.asset_manager import AssetManager
+from spaceone.inventory_v2.manager.history_manager import HistoryManager
 from spaceone.inventory_v2.conf.collector_conf import *
 
 _LOGGER = logging.getLogger(__name__)
 
+_CLEANUP_CURSOR_KEY = "inventory-v2:cleanup-cursor:{domain_id}:{collector_id}:{target}"
+
 
 class CleanupManager(BaseManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def update_disconnected_and_deleted_count(
-        self, collector_id: str, secret_id: str, job_task_id: str, domain_id: str
+        self,
+        collector_id: str,
+        secret_id: str,
+        job_task_id: str,
+        domain_id: str,
+        collection_generation: int = None,
     ) -> dict:
         state_mgr = CollectionStateManager()
-        disconnected_count = self._increment_disconnected_count_by_collector(
-            state_mgr, collector_id, secret_id, job_task_id, domain_id
-        )
+
+        if collection_generation is None:
+            disconnected_count = self._increment_disconnected_count_by_collector(
+                state_mgr, collector_id, secret_id, job_task_id, domain_id
+            )
+        else:
+            disconnected_count = self._increment_disconnected_count_by_generation(
+                state_mgr, collector_id, secret_id, collection_generation, domain_id
+            )
+
         deleted_count = self._delete_resources_by_collector(
-            state_mgr, collector_id, domain_id
+            state_mgr, collector_id, domain_id, collection_generation is not None
         )
 
         return {
@@ -33,6 +49,34 @@ class CleanupManager(BaseManager):
             "deleted_count": deleted_count,
         }
 
+    @staticmethod
+    def delete_resources_by_asset_ids(asset_ids: List[str], domain_id: str) -> int:
+        """Delete assets created by a failed sub task of collecting bulk mode
+        with their collection states and histories.
+        Updated assets are kept with collected data and their histories.
+
+        Returns:
+            deleted_count (int)
+        """
+
+        if len(asset_ids) == 0:
+            return 0
+
+        asset_mgr = AssetManager()
+        state_mgr = CollectionStateManager()
+        history_mgr = HistoryManager()
+
+        deleted_count = asset_mgr.delete_assets_by_asset_ids(asset_ids, domain_id)
+        state_mgr.delete_collection_state_by_asset_ids(asset_ids)
+        history_mgr.filter_histories(asset_id=asset_ids, domain_id=domain_id).delete()
+
+        _LOGGER.debug(
+            f"[delete_resources_by_asset_ids] delete asset {deleted_count} "
+            f"of {len(asset_ids)} created assets"
+        )
+
+        return deleted_count
+
     def delete_resources_by_policy(self, resource_type, hour, domain_id):
         updated_at = datetime.utcnow() - timedelta(hours=hour)
         query = {
@@ -64,49 +108,87 @@ class CleanupManager(BaseManager):
             _LOGGER.error(f"[delete_resources] {e}", exc_info=True)
             return 0
 
-    @staticmethod
     def _delete_resources_by_collector(
-        state_mgr: CollectionStateManager, collector_id: str, domain_id: str
+        self,
+        state_mgr: CollectionStateManager,
+        collector_id: str,
+        domain_id: str,
+        use_generation: bool = False,
     ) -> int:
+        """Delete disconnected resources of collector by chunk of _id range
+        Cursor of the last cleaned chunk is kept in cache, so the next cleanup
+        resumes from it, if a worker stops in the middle of cleanup.
+        In generation mode, disconnected assets are read from assets directly.
+
+        Returns:
+            deleted_count (int)
+        """
+
         disconnected_count = config.get_global(
             "DEFAULT_DISCONNECTED_STATE_DELETE_POLICY", 3
         )
+        asset_mgr = AssetManager()
+        history_mgr = HistoryManager()
 
-        query = {
-            "filter": [
-                {"k": "collector_id", "v": collector_id, "o": "eq"},
-                {"k": "disconnected_count", "v": disconnected_count, "o": "gte"},
-                {"k": "domain_id", "v": domain_id, "o": "eq"},
-            ],
-            "only": ["cloud_service_id"],
-        }
-
-        state_vos, total_count = state_mgr.list_collection_states(query)
-
-        asset_ids = [state_vo.asset_id for state_vo in state_vos]
+        cursor_key = _CLEANUP_CURSOR_KEY.format(
+            domain_id=domain_id,
+            collector_id=collector_id,
+            target="asset" if use_generation else "state",
+        )
+        last_id = self._get_cleanup_cursor(cursor_key)
         total_deleted_count = 0
 
-        if len(asset_ids) > 0:
-            asset_mgr = AssetManager()
+        while True:
+            if use_generation:
+                resource_infos = asset_mgr.list_disconnected_assets(
+                    collector_id,
+                    domain_id,
+                    disconnected_count,
+                    last_id,
+                    CLEANUP_CHUNK_SIZE,
+                )
+            else:
+                resource_infos = state_mgr.list_disconnected_states(
+                    collector_id,
+                    domain_id,
+                    disconnected_count,
+                    last_id,
+                    CLEANUP_CHUNK_SIZE,
+                )
 
-            query = {
-                "filter": [
-                    {"k": "asset_id", "v": asset_ids, "o": "in"},
-                    {"k": "domain_id", "v": domain_id, "o": "eq"},
-                ]
-            }
+            if len(resource_infos) == 0:
+                break
+
+            asset_ids = [resource_info["asset_id"] for resource_info in resource_infos]
 
             try:
-                deleted_count = asset_mgr.delete_resources(query)
-                _LOGGER.debug(
-                    f"[_delete_resources_by_collector] delete asset {deleted_count} in {domain_id}"
-                )
-                total_deleted_count = deleted_count
+                assets = asset_mgr.get_active_assets(asset_ids, domain_id)
+                if len(assets) > 0:
+                    history_mgr.add_delete_histories(assets)
+                    total_deleted_count += asset_mgr.delete_active_assets(
+                        [asset_info["asset_id"] for asset_info in assets], domain_id
+                    )
+
+                if not use_generation:
+                    state_mgr.delete_collection_states_by_ids(
+                        [resource_info["_id"] for resource_info in resource_infos]
+                    )
             except Exception as e:
                 _LOGGER.error(
-                    f"[_delete_resources_by_collector] delete cloud service error: {e}",
+                    f"[_delete_resources_by_collector] delete asset error: {e}",
                     exc_info=True,
                 )
+                return total_deleted_count
+
+            last_id = resource_infos[-1]["_id"]
+            self._set_cleanup_cursor(cursor_key, last_id)
+
+        self._delete_cleanup_cursor(cursor_key)
+
+        if total_deleted_count > 0:
+            _LOGGER.debug(
+                f"[_delete_resources_by_collector] delete asset {total_deleted_count} in {domain_id}"
+            )
 
         return total_deleted_count
 
@@ -117,20 +199,45 @@ class CleanupManager(BaseManager):
         secret_id: str,
         job_task_id: str,
         domain_id: str,
-    ):
+    ) -> int:
         updated_at = datetime.utcnow() - timedelta(hours=1)
 
-        query = {
-            "filter": [
-                {"k": "collector_id", "v": collector_id, "o": "eq"},
-                {"k": "secret_id", "v": secret_id, "o": "eq"},
-                {"k": "job_task_id", "v": job_task_id, "o": "not"},
-                {"k": "domain_id", "v": domain_id, "o": "eq"},
-                {"k": "updated_at", "v": updated_at, "o": "lt"},
-            ]
-        }
+        return state_mgr.increment_disconnected_count(
+            collector_id, secret_id, job_task_id, domain_id, updated_at
+        )
 
-        state_vos, total_count = state_mgr.list_collection_states(query)
-        state_vos.increment("disconnected_count")
+    @staticmethod
+    def _increment_disconnected_count_by_generation(
+        state_mgr: CollectionStateManager,
+        collector_id: str,
+        secret_id: str,
+        collection_generation: int,
+        domain_id: str,
+    ) -> int:
+        asset_mgr = AssetManager()
 
-        return total_count
+        # collection states made before generation mode are moved to assets first
+        state_mgr.migrate_collection_states(collector_id, secret_id, domain_id)
+
+        return asset_mgr.increment_disconnected_count(
+            collector_id, secret_id, collection_generation, domain_id
+        )
+
+    @staticmethod
+    def _get_cleanup_cursor(cursor_key: str) -> Union[ObjectId, None]:
+        if cache.is_set():
+            if last_id := cache.get(cursor_key):
+                _LOGGER.debug(f"[_get_cleanup_cursor] resume cleanup from {last_id}")
+                return ObjectId(last_id)
+
+        return None
+
+    @staticmethod
+    def _set_cleanup_cursor(cursor_key: str, last_id: ObjectId) -> None:
+        if cache.is_set():
+            cache.set(cursor_key, str(last_id), expire=CLEANUP_CURSOR_EXPIRE_TIME)
+
+    @staticmethod
+    def _delete_cleanup_cursor(cursor_key: str) -> None:
+        if cache.is_set():
+            cache.delete(cursor_key)
@@ -1,16 +1,24 @@
 import datetime
+import hashlib
+import json
 import logging
-import time
 from datetime import datetime
-from typing import Generator
+from itertools import islice, product
+from typing import Generator, List, Tuple, Union
 
-from spaceone.core import utils
+from spaceone.core import config, utils
 from spaceone.core.manager import BaseManager
 
+from spaceone.inventory_v2.lib.match_index import MatchIndex
+from spaceone.inventory_v2.lib.pipeline import Pipeline
 from spaceone.inventory_v2.lib.resource_manager import ResourceManager
+from spaceone.inventory_v2.manager.job_context_manager import JobContextManager
 from spaceone.inventory_v2.manager.job_manager import JobManager
 from spaceone.inventory_v2.manager.job_task_manager import JobTaskManager
+from spaceone.inventory_v2.manager.cleanup_manager import CleanupManager
 from spaceone.inventory_v2.manager.collector_manager import CollectorManager
+from spaceone.inventory_v2.manager.collector_rule_manager import CollectorRuleManager
+from spaceone.inventory_v2.manager.concurrency_manager import ConcurrencyManager
 from spaceone.inventory_v2.manager.plugin_manager import PluginManager
 from spaceone.inventory_v2.manager.collector_plugin_manager import (
     CollectorPluginManager,
@@ -34,6 +42,9 @@ class CollectingManager(BaseManager):
 
         self.db_queue = DB_QUEUE_NAME
         self._service_and_manager_map = {}
+        self._match_index_map = {}
+        self._unchanged_resources = {}
+        self._content_hash_salt = None
 
     def collecting_resources(self, params: dict) -> bool:
         """Execute collecting task to get resources from plugin
@@ -48,7 +59,10 @@ class CollectingManager(BaseManager):
                 'is_sub_task': 'bool',
                 'secret_info': 'dict',
                 'secret_data': 'dict',
-                'token': 'str'
+                'use_job_context': 'bool',  # plugin_info and secrets are in job context
+                'collection_generation': 'int',   # generation mode of collection state
+                'token': 'str',
+                'resume_token': 'str'       # collector version v2 (see _get_resume_token)
             }
         """
 
@@ -56,18 +70,12 @@ class CollectingManager(BaseManager):
         token = params["token"]
         self.transaction.set_meta("token", token)
 
-        plugin_manager = PluginManager()
-        collector_plugin_mgr = CollectorPluginManager()
-
         job_id = params["job_id"]
         job_task_id = params["job_task_id"]
         collector_id = params["collector_id"]
         domain_id = params["domain_id"]
         task_options = params.get("task_options")
         is_sub_task = params.get("is_sub_task", False)
-        secret_info = params["secret_info"]
-        secret_data = params["secret_data"]
-        plugin_info = params["plugin_info"]
 
         if is_sub_task:
             _LOGGER.debug(
@@ -77,14 +85,59 @@ class CollectingManager(BaseManager):
         else:
             _LOGGER.debug(f"[collecting_resources] start job task: {job_task_id}")
 
-        if not self._check_concurrency(collector_id, job_id, domain_id):
-            time.sleep(60)
-            _LOGGER.debug(f"[collecting_resources] retry sub task: {job_task_id}")
-            self.job_task_mgr.push_job_task(params)
+        max_concurrency = self._get_max_concurrency(collector_id, domain_id)
+        if max_concurrency is None:
+            return self._collecting_resources(params)
+
+        concurrency_mgr: ConcurrencyManager = self.locator.get_manager(
+            ConcurrencyManager
+        )
+
+        use_lease = concurrency_mgr.is_enabled()
+        if use_lease:
+            is_admitted = concurrency_mgr.acquire_lease(
+                job_id, collector_id, job_task_id, max_concurrency
+            )
+        else:
+            is_admitted = self._check_concurrency(job_id, domain_id, max_concurrency)
+
+        if not is_admitted:
+            # defer the task instead of holding the worker thread
+            _LOGGER.debug(f"[collecting_resources] defer sub task: {job_task_id}")
+            self.job_task_mgr.defer_job_task(
+                params, config.get_global("COLLECTING_DEFER_DELAY", 60)
+            )
             return True
 
+        try:
+            return self._collecting_resources(params)
+        finally:
+            if use_lease:
+                concurrency_mgr.release_lease(job_id, collector_id, job_task_id)
+
+    def _collecting_resources(self, params: dict) -> bool:
+        plugin_manager = PluginManager()
+        collector_plugin_mgr = CollectorPluginManager()
+
+        job_id = params["job_id"]
+        job_task_id = params["job_task_id"]
+        domain_id = params["domain_id"]
+        task_options = params.get("task_options")
+
         job_task_vo = self.job_task_mgr.get_job_task(job_task_id, domain_id)
 
+        if params.get("use_job_context"):
+            try:
+                params = JobContextManager.load_context(params)
+            except ERROR_JOB_CONTEXT_NOT_FOUND as e:
+                self.job_task_mgr.add_error(job_task_vo, e.error_code, e.message)
+                self.job_task_mgr.make_failure_by_vo(job_task_vo)
+                raise e
+
+        secret_info = params["secret_info"]
+        secret_data = params["secret_data"]
+        plugin_info = params["plugin_info"]
+
         # add workspace_id to params from secret_info
         params["workspace_id"] = secret_info["workspace_id"]
 
@@ -114,6 +167,7 @@ class CollectingManager(BaseManager):
                 plugin_info["options"],
                 secret_data.get("data", {}),
                 task_options,
+                params.get("resume_token"),
             )
 
             # delete secret_data in params for security
@@ -155,12 +209,20 @@ class CollectingManager(BaseManager):
                 f"[collecting_resources] upsert resources error ({job_task_id}): {error_message}",
                 exc_info=True,
             )
+
+            additional = None
+            if resume_token := self._get_resume_token(collector_plugin_mgr):
+                additional = {"resume_token": resume_token}
+
             self.job_task_mgr.add_error(
-                job_task_vo, "ERROR_COLLECTOR_PLUGIN", error_message
+                job_task_vo, "ERROR_COLLECTOR_PLUGIN", error_message, additional
             )
             job_task_status = "FAILURE"
             collecting_count_info = {"failure_count": 1}
 
+            if self.transaction.get_meta("collecting_bulk_mode"):
+                self._delete_created_resources(job_task_id, domain_id)
+
         _LOGGER.debug(
             f"[collecting_resources] job task summary ({job_task_id}: {job_task_status}) "
             f"=> {collecting_count_info}"
@@ -175,7 +237,53 @@ class CollectingManager(BaseManager):
 
         return True
 
-    def _check_concurrency(self, collector_id: str, job_id: str, domain_id: str):
+    def _get_resume_token(
+        self, collector_plugin_mgr: CollectorPluginManager
+    ) -> Union[str, None]:
+        """Resume token of the last batch which is fully written
+        The token is recorded in the error of failed job task, and the task can be
+        pushed again by an operator (JobTaskManager.push_job_task) with it to skip
+        the batches already written. No component re-pushes the task by itself.
+
+        The token is only valid in sequential mode without bulk mode.
+        Batch and pipeline modes read resources ahead of the writer, and bulk mode
+        deletes resources created by failed sub task, so no token is recorded for them.
+        """
+
+        if config.get_global("COLLECTING_BATCH_SIZE", 0) > 0:
+            return None
+
+        if config.get_global("COLLECTING_PIPELINE_QUEUE_SIZE", 0) > 0:
+            return None
+
+        if self.transaction.get_meta("collecting_bulk_mode"):
+            return None
+
+        return collector_plugin_mgr.get_resume_token()
+
+    def _delete_created_resources(self, job_task_id: str, domain_id: str) -> None:
+        # rollbacks are not registered in bulk mode, so delete the assets which are
+        # created by this sub task only. other sub tasks of the job task may succeed.
+        cleanup_mgr: CleanupManager = self.locator.get_manager(CleanupManager)
+        asset_ids = self.transaction.get_meta("collecting_created_asset_ids", [])
+
+        try:
+            deleted_count = cleanup_mgr.delete_resources_by_asset_ids(
+                list(set(asset_ids)), domain_id
+            )
+            _LOGGER.debug(
+                f"[_delete_created_resources] delete {deleted_count} resources "
+                f"created by failed sub task ({job_task_id})"
+            )
+        except Exception as e:
+            _LOGGER.error(
+                f"[_delete_created_resources] cleanup error ({job_task_id}): {e}",
+                exc_info=True,
+            )
+
+    def _get_max_concurrency(
+        self, collector_id: str, domain_id: str
+    ) -> Union[int, None]:
         collector_mgr: CollectorManager = self.locator.get_manager(CollectorManager)
         try:
             collector_vo = collector_mgr.get_collector(collector_id, domain_id)
@@ -183,22 +291,30 @@ class CollectingManager(BaseManager):
             metadata = plugin_info.get("metadata", {})
         except Exception as e:
             _LOGGER.warning(
-                f"[_check_concurrency] failed to get collector metadata: {e}"
+                f"[_get_max_concurrency] failed to get collector metadata: {e}"
             )
             metadata = {}
 
         max_concurrency = metadata.get("concurrency")
         if max_concurrency and isinstance(max_concurrency, int):
-            job_task_vos = self.job_task_mgr.filter_job_tasks(
-                job_id=job_id, domain_id=domain_id, status="IN_PROGRESS"
-            )
-            current_concurrency = job_task_vos.count()
-            if job_task_vos.count() >= max_concurrency:
-                _LOGGER.debug(
-                    f"[_check_concurrency] job task concurrency exceeded ({job_id}): "
-                    f"{current_concurrency}/{max_concurrency}"
-                )
-                return False
+            return max_concurrency
+
+        return None
+
+    def _check_concurrency(
+        self, job_id: str, domain_id: str, max_concurrency: int
+    ) -> bool:
+        # used when redis cache is not set
+        job_task_vos = self.job_task_mgr.filter_job_tasks(
+            job_id=job_id, domain_id=domain_id, status="IN_PROGRESS"
+        )
+        current_concurrency = job_task_vos.count()
+        if current_concurrency >= max_concurrency:
+            _LOGGER.debug(
+                f"[_check_concurrency] job task concurrency exceeded ({job_id}): "
+                f"{current_concurrency}/{max_concurrency}"
+            )
+            return False
 
         return True
 
@@ -219,65 +335,454 @@ class CollectingManager(BaseManager):
             }
         """
 
-        created_count = 0
-        updated_count = 0
-        failure_count = 0
-        total_count = 0
+        collecting_count_info = {
+            "total_count": 0,
+            "created_count": 0,
+            "updated_count": 0,
+            "failure_count": 0,
+            "skipped_count": 0,
+        }
 
         self._set_transaction_meta(params)
+        self._match_index_map = {}
+        self._unchanged_resources = {}
+        self._content_hash_salt = self._make_content_hash_salt(params)
+
+        batch_size = config.get_global("COLLECTING_BATCH_SIZE", 0)
+        if batch_size > 0:
+            return self._upsert_collecting_resources_in_batch(
+                resources, params, job_task_vo, batch_size
+            )
+
+        queue_size = config.get_global("COLLECTING_PIPELINE_QUEUE_SIZE", 0)
+        if queue_size > 0:
+            return self._upsert_collecting_resources_in_pipeline(
+                resources, params, job_task_vo, queue_size
+            )
 
         for resource_data in resources:
-            resource_type = resource_data.get("resource_type")
-            total_count += 1
+            self._upsert_collected_resource(
+                resource_data, params, job_task_vo, collecting_count_info
+            )
+
+        self._flush_unchanged_resources(job_task_vo, collecting_count_info)
+
+        return collecting_count_info
+
+    def _upsert_collected_resource(
+        self,
+        resource_data: dict,
+        params: dict,
+        job_task_vo: JobTask,
+        collecting_count_info: dict,
+        match_result: Union[Tuple[list, int], Exception] = None,
+    ) -> None:
+        resource_type = resource_data.get("resource_type")
+        collecting_count_info["total_count"] += 1
+
+        try:
+            if resource_type in [
+                "inventory.NamespaceGroup",
+                "inventory.Namespace",
+                "inventory.Metric",
+            ]:
+                # self._upsert_metric_and_namespace(resource_data, params)
+                # total_count -= 1
+                pass
+
+            elif resource_type in ["inventory.Region"]:
+                pass
+
+            else:
+                upsert_result = self._upsert_resource(
+                    resource_data, params, job_task_vo, match_result
+                )
+
+                self._count_upsert_result(collecting_count_info, upsert_result)
+
+                if self._get_unchanged_count() >= UNCHANGED_FLUSH_SIZE:
+                    self._flush_unchanged_resources(job_task_vo, collecting_count_info)
+
+        except Exception as e:
+            _LOGGER.error(
+                f"[_upsert_collecting_resources] upsert resource error: {e}",
+                exc_info=True,
+            )
+            self.job_task_mgr.add_error(
+                job_task_vo,
+                "ERROR_UNKNOWN",
+                f"failed to upsert {resource_type}: {e}",
+                {"resource_type": resource_type},
+            )
+            collecting_count_info["failure_count"] += 1
+
+    def _upsert_collecting_resources_in_pipeline(
+        self,
+        resources: Generator[dict, None, None],
+        params: dict,
+        job_task_vo: JobTask,
+        queue_size: int,
+    ) -> dict:
+        """Upsert resources with reader, matcher and writer stages.
+        Reader pulls resources from plugin and matcher resolves match rules in
+        background threads, so plugin stream and DB writes are overlapped.
+        Writer upserts resources in order in the current thread.
+        """
+
+        collecting_count_info = {
+            "total_count": 0,
+            "created_count": 0,
+            "updated_count": 0,
+            "failure_count": 0,
+            "skipped_count": 0,
+        }
+
+        # match index should be shared by matcher and writer
+        self._get_match_index("inventory.Asset", params)
+        match_signatures = set()
+
+        pipeline = Pipeline("reader", queue_size, self.transaction.meta)
+        pipeline.add_stage(
+            "matcher",
+            lambda resource_data: self._match_resource_in_pipeline(
+                resource_data, params, match_signatures
+            ),
+        )
+
+        try:
+            for resource_data, match_result in pipeline.run(resources, "writer"):
+                self._upsert_collected_resource(
+                    resource_data,
+                    params,
+                    job_task_vo,
+                    collecting_count_info,
+                    match_result,
+                )
+
+            self._flush_unchanged_resources(job_task_vo, collecting_count_info)
+
+        finally:
+            pipeline.close()
+            self.job_task_mgr.add_pipeline_stats(job_task_vo, pipeline.get_stats())
+
+        return collecting_count_info
+
+    def _match_resource_in_pipeline(
+        self, resource_data: dict, params: dict, match_signatures: set
+    ) -> Tuple[dict, Union[Tuple[list, int], Exception, None]]:
+        """
+        Returns:
+            resource_data (dict): resource information from plugin
+            match_result (tuple): (match_resource, total_count), error or None
+                                  (None: writer matches the resource)
+        """
+
+        resource_type = resource_data.get("resource_type")
+        match_rules = resource_data.get("match_rules")
+
+        if resource_type not in RESOURCE_MAP or resource_type in [
+            "inventory.Region",
+            "inventory.ErrorResource",
+        ]:
+            return resource_data, None
+
+        if resource_data.get("state") == "FAILURE" or not match_rules:
+            return resource_data, None
+
+        signatures = self._make_match_signatures(resource_data)
+        if not signatures.isdisjoint(match_signatures):
+            # resource can be matched with the former one which is not written yet
+            return resource_data, None
+
+        match_signatures.update(signatures)
+
+        try:
+            service, manager = self._get_resource_map(resource_type)
+            request_data = self._make_request_data(resource_data, params)
+            match_result = self._query_with_match_rules(
+                request_data,
+                match_rules,
+                params["domain_id"],
+                params["workspace_id"],
+                manager,
+                self._get_match_index(resource_type, params),
+            )
+        except Exception as e:
+            match_result = e
+
+        return resource_data, match_result
+
+    def _upsert_collecting_resources_in_batch(
+        self,
+        resources: Generator[dict, None, None],
+        params: dict,
+        job_task_vo: JobTask,
+        batch_size: int,
+    ) -> dict:
+        """Upsert resources chunk by chunk.
+        Matches of a chunk are resolved with one query per match rule order and
+        assets are written with unordered bulk writes.
+        """
+
+        collecting_count_info = {
+            "total_count": 0,
+            "created_count": 0,
+            "updated_count": 0,
+            "failure_count": 0,
+            "skipped_count": 0,
+        }
+
+        for chunk in self._make_chunks(resources, batch_size):
+            bulk_resources = []
+            for resource_data in chunk:
+                resource_type = resource_data.get("resource_type")
+                collecting_count_info["total_count"] += 1
 
-            try:
                 if resource_type in [
                     "inventory.NamespaceGroup",
                     "inventory.Namespace",
                     "inventory.Metric",
+                    "inventory.Region",
                 ]:
-                    # self._upsert_metric_and_namespace(resource_data, params)
-                    # total_count -= 1
                     pass
 
-                elif resource_type in ["inventory.Region"]:
-                    pass
+                elif self._is_bulk_resource_type(resource_type):
+                    bulk_resources.append(resource_data)
 
                 else:
-                    upsert_result = self._upsert_resource(
-                        resource_data, params, job_task_vo
+                    try:
+                        upsert_result = self._upsert_resource(
+                            resource_data, params, job_task_vo
+                        )
+                    except Exception as e:
+                        _LOGGER.error(
+                            f"[_upsert_collecting_resources_in_batch] upsert resource error: {e}",
+                            exc_info=True,
+                        )
+                        self.job_task_mgr.add_error(
+                            job_task_vo,
+                            "ERROR_UNKNOWN",
+                            f"failed to upsert {resource_type}: {e}",
+                            {"resource_type": resource_type},
+                        )
+                        upsert_result = ERROR
+
+                    self._count_upsert_result(collecting_count_info, upsert_result)
+
+            for round_resources in self._split_duplicated_resources(bulk_resources):
+                for upsert_result in self._upsert_resources_in_batch(
+                    round_resources, params, job_task_vo
+                ):
+                    self._count_upsert_result(collecting_count_info, upsert_result)
+
+            self._flush_unchanged_resources(job_task_vo, collecting_count_info)
+
+        return collecting_count_info
+
+    def _upsert_resources_in_batch(
+        self, resources_data: List[dict], params: dict, job_task_vo: JobTask
+    ) -> List[int]:
+        """
+        Args:
+            resources_data (list): resources of the same chunk
+            params (dict): same as _upsert_resource
+
+        Returns:
+            upsert results of each resource (same as _upsert_resource)
+        """
+
+        job_task_id = params["job_task_id"]
+        domain_id = params["domain_id"]
+        workspace_id = params["workspace_id"]
+
+        upsert_results = [ERROR] * len(resources_data)
+        request_data_list = [
+            self._make_request_data(resource_data, params)
+            for resource_data in resources_data
+        ]
+        content_hashes = [
+            self._get_content_hash(resource_data.get("resource_type"), request_data)
+            for resource_data, request_data in zip(resources_data, request_data_list)
+        ]
+
+        # group valid resources by resource type
+        resource_indexes_by_type = {}
+        for index, resource_data in enumerate(resources_data):
+            if self._check_resource_data(
+                resource_data, request_data_list[index], job_task_id, job_task_vo
+            ):
+                resource_type = resource_data.get("resource_type")
+                resource_indexes_by_type.setdefault(resource_type, []).append(index)
+
+        for resource_type, indexes in resource_indexes_by_type.items():
+            service, manager = self._get_resource_map(resource_type)
+            match_index = self._get_match_index(resource_type, params)
+
+            match_results = self._query_with_match_rules_in_batch(
+                [request_data_list[index] for index in indexes],
+                [resources_data[index].get("match_rules") for index in indexes],
+                domain_id,
+                workspace_id,
+                manager,
+                match_index,
+            )
+
+            create_indexes = []
+            update_indexes = []
+            total_count_map = {}
+            for index, match_result in zip(indexes, match_results):
+                if isinstance(match_result, Exception):
+                    self._add_match_error(
+                        match_result, resource_type, job_task_id, job_task_vo
+                    )
+                    continue
+
+                match_resource, total_count = match_result
+                total_count_map[index] = total_count
+                if total_count == 0:
+                    self._set_content_hash(
+                        resource_type, request_data_list[index], content_hashes[index]
                     )
+                    create_indexes.append(index)
+                elif total_count == 1:
+                    request_data_list[index].update(match_resource[0])
+                    if self._is_unchanged(
+                        request_data_list[index], content_hashes[index]
+                    ):
+                        self._add_unchanged_resource(
+                            resource_type, request_data_list[index]
+                        )
+                        upsert_results[index] = SKIPPED
+                        continue
+
+                    self._set_content_hash(
+                        resource_type, request_data_list[index], content_hashes[index]
+                    )
+                    update_indexes.append(index)
+
+            for upsert_indexes, upsert_method, response in [
+                (create_indexes, service.create_resources, CREATED),
+                (update_indexes, service.update_resources, UPDATED),
+            ]:
+                if len(upsert_indexes) == 0:
+                    continue
+
+                try:
+                    errors = upsert_method(
+                        [request_data_list[index] for index in upsert_indexes]
+                    )
+                except Exception as e:
+                    errors = [e] * len(upsert_indexes)
+
+                for index, error in zip(upsert_indexes, errors):
+                    if error is None:
+                        upsert_results[index] = response
 
-                    if upsert_result == NOT_COUNT:
-                        # skip count for cloud service type and region
-                        total_count -= 1
-                        pass
-                    elif upsert_result == CREATED:
-                        created_count += 1
-                    elif upsert_result == UPDATED:
-                        updated_count += 1
+                        if match_index:
+                            match_index.add(request_data_list[index])
                     else:
-                        failure_count += 1
+                        self._add_upsert_error(
+                            error,
+                            resource_type,
+                            total_count_map[index],
+                            request_data_list[index],
+                            job_task_id,
+                            job_task_vo,
+                        )
 
-            except Exception as e:
-                _LOGGER.error(
-                    f"[_upsert_collecting_resources] upsert resource error: {e}",
-                    exc_info=True,
-                )
-                self.job_task_mgr.add_error(
-                    job_task_vo,
-                    "ERROR_UNKNOWN",
-                    f"failed to upsert {resource_type}: {e}",
-                    {"resource_type": resource_type},
+            if resource_type in ["inventory.CloudServiceType", "inventory.Region"]:
+                for index in indexes:
+                    if upsert_results[index] in [CREATED, UPDATED]:
+                        upsert_results[index] = NOT_COUNT
+
+        return upsert_results
+
+    def _is_bulk_resource_type(self, resource_type: str) -> bool:
+        if resource_type not in RESOURCE_MAP:
+            return False
+
+        service, manager = self._get_resource_map(resource_type)
+        return hasattr(service, "create_resources") and hasattr(
+            service, "update_resources"
+        )
+
+    @staticmethod
+    def _count_upsert_result(collecting_count_info: dict, upsert_result: int) -> None:
+        if upsert_result == NOT_COUNT:
+            # skip count for cloud service type and region
+            collecting_count_info["total_count"] -= 1
+        elif upsert_result == CREATED:
+            collecting_count_info["created_count"] += 1
+        elif upsert_result == UPDATED:
+            collecting_count_info["updated_count"] += 1
+        elif upsert_result == SKIPPED:
+            # count as updated to keep job accounting unchanged
+            collecting_count_info["updated_count"] += 1
+            collecting_count_info["skipped_count"] += 1
+        else:
+            collecting_count_info["failure_count"] += 1
+
+    @staticmethod
+    def _split_duplicated_resources(resources_data: List[dict]) -> List[List[dict]]:
+        """Split resources into rounds that are upserted one after another.
+        Resources with the same match keys go to later rounds, so the latter one
+        updates the asset created by the former like the sequential upsert does.
+        """
+
+        rounds = []
+        rounds_signatures = []
+
+        for resource_data in resources_data:
+            signatures = CollectingManager._make_match_signatures(resource_data)
+
+            round_index = 0
+            for index, round_signatures in enumerate(rounds_signatures):
+                if not round_signatures.isdisjoint(signatures):
+                    round_index = index + 1
+
+            if round_index == len(rounds):
+                rounds.append([])
+                rounds_signatures.append(set())
+
+            rounds[round_index].append(resource_data)
+            rounds_signatures[round_index].update(signatures)
+
+        return rounds
+
+    @staticmethod
+    def _make_match_signatures(resource_data: dict) -> set:
+        # resources with the same signature can be matched with the same resource
+        resource = resource_data.get("resource", {})
+        match_rules = rule_matcher.dict_key_int_parser(
+            resource_data.get("match_rules") or {}
+        )
+
+        signatures = set()
+        for order in match_rules.keys():
+            conditions = rule_matcher.make_match_conditions(
+                order, match_rules, resource
+            )
+            if conditions:
+                signatures.add(
+                    (
+                        order,
+                        tuple(
+                            sorted(
+                                (key, str(value)) for key, value in conditions.items()
+                            )
+                        ),
+                    )
                 )
-                failure_count += 1
 
-        return {
-            "total_count": total_count,
-            "created_count": created_count,
-            "updated_count": updated_count,
-            "failure_count": failure_count,
-        }
+        return signatures
+
+    @staticmethod
+    def _make_chunks(
+        resources: Generator[dict, None, None], batch_size: int
+    ) -> Generator[List[dict], None, None]:
+        resources = iter(resources)
+        while chunk := list(islice(resources, batch_size)):
+            yield chunk
 
     def _upsert_metric_and_namespace(self, resource_data: dict, params: dict) -> None:
         """
@@ -348,7 +853,11 @@ class CollectingManager(BaseManager):
                     self.metric_mgr.update_metric_by_vo(request_data, metric_vo)
 
     def _upsert_resource(
-        self, resource_data: dict, params: dict, job_task_vo: JobTask
+        self,
+        resource_data: dict,
+        params: dict,
+        job_task_vo: JobTask,
+        match_result: Union[Tuple[list, int], Exception] = None,
     ) -> int:
         """
         Args:
@@ -363,6 +872,7 @@ class CollectingManager(BaseManager):
                 'task_options': 'dict',
                 'secret_info': 'dict'
             }
+            match_result (tuple): (match_resource, total_count) matched in advance
         Returns:
             0: NOT_COUNT (for cloud service type and region)
             1: CREATED
@@ -374,17 +884,83 @@ class CollectingManager(BaseManager):
         domain_id = params["domain_id"]
         workspace_id = params["workspace_id"]
         resource_type = resource_data.get("resource_type")
-        resource_state = resource_data.get("state")
         match_rules = resource_data.get("match_rules")
-        request_data = resource_data.get("resource", {})
-        request_data["domain_id"] = domain_id
-        request_data["workspace_id"] = workspace_id
-        request_data["last_collected_at"] = datetime.utcnow()
+        request_data = self._make_request_data(resource_data, params)
 
         service, manager = self._get_resource_map(resource_type)
+        match_index = self._get_match_index(resource_type, params)
+        content_hash = self._get_content_hash(resource_type, request_data)
 
         response = ERROR
 
+        if not self._check_resource_data(
+            resource_data, request_data, job_task_id, job_task_vo
+        ):
+            return ERROR
+
+        try:
+            if match_result is None:
+                match_result = self._query_with_match_rules(
+                    request_data,
+                    match_rules,
+                    domain_id,
+                    workspace_id,
+                    manager,
+                    match_index,
+                )
+            elif isinstance(match_result, Exception):
+                raise match_result
+
+            match_resource, total_count = match_result
+
+        except Exception as e:
+            self._add_match_error(e, resource_type, job_task_id, job_task_vo)
+            return ERROR
+
+        try:
+            if total_count == 0:
+                # Create resource
+                self._set_content_hash(resource_type, request_data, content_hash)
+                service.create_resource(request_data)
+                response = CREATED
+            elif total_count == 1:
+                request_data.update(match_resource[0])
+                if self._is_unchanged(request_data, content_hash):
+                    # Refresh unchanged resource later in bulk
+                    self._add_unchanged_resource(resource_type, request_data)
+                    response = SKIPPED
+                else:
+                    # Update resource
+                    self._set_content_hash(resource_type, request_data, content_hash)
+                    service.update_resource(request_data)
+                    response = UPDATED
+            else:
+                response = ERROR
+
+            if match_index and response in [CREATED, UPDATED]:
+                match_index.add(request_data)
+
+        except Exception as e:
+            self._add_upsert_error(
+                e, resource_type, total_count, request_data, job_task_id, job_task_vo
+            )
+            response = ERROR
+
+        finally:
+            if response in [CREATED, UPDATED]:
+                if resource_type in ["inventory.CloudServiceType", "inventory.Region"]:
+                    response = NOT_COUNT
+
+            return response
+
+    @staticmethod
+    def _make_request_data(resource_data: dict, params: dict) -> dict:
+        resource_type = resource_data.get("resource_type")
+        request_data = resource_data.get("resource", {})
+        request_data["domain_id"] = params["domain_id"]
+        request_data["workspace_id"] = params["workspace_id"]
+        request_data["last_collected_at"] = datetime.utcnow()
+
         if resource_type in [
             "inventory.AssetType",
             "inventory.AssetGroup",
@@ -397,6 +973,19 @@ class CollectingManager(BaseManager):
             request_data["workspace_id"] = "*"
             request_data["is_managed"] = True
 
+        return request_data
+
+    def _check_resource_data(
+        self,
+        resource_data: dict,
+        request_data: dict,
+        job_task_id: str,
+        job_task_vo: JobTask,
+    ) -> bool:
+        resource_type = resource_data.get("resource_type")
+        resource_state = resource_data.get("state")
+        match_rules = resource_data.get("match_rules")
+
         if resource_state == "FAILURE":
             error_message = resource_data.get("message", "Unknown error.")
             _LOGGER.error(
@@ -407,7 +996,7 @@ class CollectingManager(BaseManager):
                 job_task_vo, "ERROR_PLUGIN", error_message, request_data
             )
 
-            return ERROR
+            return False
 
         if not match_rules:
             error_message = "Match rule is not defined."
@@ -420,33 +1009,32 @@ class CollectingManager(BaseManager):
                 error_message,
                 {"resource_type": resource_type},
             )
-            return ERROR
+            return False
 
-        try:
-            match_resource, total_count = self._query_with_match_rules(
-                request_data,
-                match_rules,
-                domain_id,
-                workspace_id,
-                manager,
-            )
+        return True
 
-        except ERROR_TOO_MANY_MATCH as e:
+    def _add_match_error(
+        self,
+        error: Exception,
+        resource_type: str,
+        job_task_id: str,
+        job_task_vo: JobTask,
+    ) -> None:
+        if isinstance(error, ERROR_TOO_MANY_MATCH):
             _LOGGER.error(
-                f"[_upsert_resource] match resource error ({job_task_id}): {e}"
+                f"[_upsert_resource] match resource error ({job_task_id}): {error}"
             )
             self.job_task_mgr.add_error(
                 job_task_vo,
-                e.error_code,
-                e.message,
+                error.error_code,
+                error.message,
                 {"resource_type": resource_type},
             )
-            return ERROR
-        except Exception as e:
-            if isinstance(e, ERROR_BASE):
-                error_message = e.message
+        else:
+            if isinstance(error, ERROR_BASE):
+                error_message = error.message
             else:
-                error_message = str(e)
+                error_message = str(error)
 
             _LOGGER.error(
                 f"[_upsert_resource] match resource error ({job_task_id}): {error_message}",
@@ -458,24 +1046,19 @@ class CollectingManager(BaseManager):
                 f"Failed to match resource: {error_message}",
                 {"resource_type": resource_type},
             )
-            return ERROR
 
-        try:
-            if total_count == 0:
-                # Create resource
-                service.create_resource(request_data)
-                response = CREATED
-            elif total_count == 1:
-                # Update resource
-                request_data.update(match_resource[0])
-                service.update_resource(request_data)
-                response = UPDATED
-            else:
-                response = ERROR
-
-        except ERROR_BASE as e:
+    def _add_upsert_error(
+        self,
+        error: Exception,
+        resource_type: str,
+        total_count: int,
+        request_data: dict,
+        job_task_id: str,
+        job_task_vo: JobTask,
+    ) -> None:
+        if isinstance(error, ERROR_BASE):
             _LOGGER.error(
-                f"[_upsert_resource] resource upsert error ({job_task_id}): {e.message}"
+                f"[_upsert_resource] resource upsert error ({job_task_id}): {error.message}"
             )
             _LOGGER.error(request_data)
             additional = self._set_error_addition_info(
@@ -483,12 +1066,10 @@ class CollectingManager(BaseManager):
             )
             # todo: refactoring job task error
             self.job_task_mgr.add_error(
-                job_task_vo, e.error_code, e.message, additional
+                job_task_vo, error.error_code, error.message, additional
             )
-            response = ERROR
-
-        except Exception as e:
-            error_message = str(e)
+        else:
+            error_message = str(error)
 
             _LOGGER.debug(
                 f"[_upsert_resource] unknown error ({job_task_id}): {error_message}",
@@ -500,14 +1081,6 @@ class CollectingManager(BaseManager):
                 error_message,
                 {"resource_type": resource_type},
             )
-            response = ERROR
-
-        finally:
-            if response in [CREATED, UPDATED]:
-                if resource_type in ["inventory.CloudServiceType", "inventory.Region"]:
-                    response = NOT_COUNT
-
-            return response
 
     def _set_transaction_meta(self, params):
         secret_info = params["secret_info"]
@@ -517,6 +1090,16 @@ class CollectingManager(BaseManager):
         self.transaction.set_meta("collector_id", params["collector_id"])
         self.transaction.set_meta("secret.secret_id", secret_info["secret_id"])
         self.transaction.set_meta("disable_info_log", "true")
+        self.transaction.set_meta(
+            "collecting_bulk_mode", config.get_global("COLLECTING_BULK_MODE", False)
+        )
+        self.transaction.set_meta(
+            "collection_generation", params.get("collection_generation")
+        )
+
+        if self.transaction.get_meta("collecting_bulk_mode"):
+            # asset ids created by this sub task (see AssetManager)
+            self.transaction.set_meta("collecting_created_asset_ids", [])
 
         if plugin_id := params["plugin_info"].get("plugin_id"):
             self.transaction.set_meta("plugin_id", plugin_id)
@@ -532,6 +1115,122 @@ class CollectingManager(BaseManager):
                 "secret.service_account_id", secret_info["service_account_id"]
             )
 
+    def _make_content_hash_salt(self, params: dict) -> Union[str, None]:
+        # content hash is also changed when collector rules or secret are changed
+        if not config.get_global("COLLECTING_CONTENT_HASH", False):
+            return None
+
+        collector_rule_mgr: CollectorRuleManager = self.locator.get_manager(
+            CollectorRuleManager
+        )
+        collector_rule_vos = collector_rule_mgr.filter_collector_rules(
+            collector_id=params["collector_id"], domain_id=params["domain_id"]
+        )
+
+        return utils.dict_to_hash(
+            {
+                "collector_id": params["collector_id"],
+                "plugin_id": params["plugin_info"].get("plugin_id"),
+                "secret_info": params["secret_info"],
+                "collector_rules": [
+                    [
+                        collector_rule_vo.collector_rule_id,
+                        utils.datetime_to_iso8601(collector_rule_vo.updated_at),
+                    ]
+                    for collector_rule_vo in collector_rule_vos
+                ],
+            }
+        )
+
+    def _get_content_hash(
+        self, resource_type: str, request_data: dict
+    ) -> Union[str, None]:
+        if self._content_hash_salt is None or resource_type != "inventory.Asset":
+            return None
+
+        content = {
+            key: value
+            for key, value in request_data.items()
+            if key != "last_collected_at"
+        }
+        encoded = json.dumps(
+            [self._content_hash_salt, content], sort_keys=True, default=str
+        ).encode()
+
+        return hashlib.md5(encoded).hexdigest()
+
+    @staticmethod
+    def _set_content_hash(
+        resource_type: str, request_data: dict, content_hash: Union[str, None]
+    ) -> None:
+        # content hash of asset is cleared when the hash is disabled
+        if resource_type == "inventory.Asset":
+            request_data["content_hash"] = content_hash
+
+    @staticmethod
+    def _is_unchanged(request_data: dict, content_hash: Union[str, None]) -> bool:
+        return content_hash is not None and (
+            request_data.get("content_hash") == content_hash
+        )
+
+    def _add_unchanged_resource(self, resource_type: str, request_data: dict) -> None:
+        self._unchanged_resources.setdefault(resource_type, []).append(
+            {
+                "asset_id": request_data["asset_id"],
+                "domain_id": request_data["domain_id"],
+            }
+        )
+
+    def _get_unchanged_count(self) -> int:
+        return sum(
+            len(resources_data) for resources_data in self._unchanged_resources.values()
+        )
+
+    def _flush_unchanged_resources(
+        self, job_task_vo: JobTask, collecting_count_info: dict
+    ) -> None:
+        unchanged_resources = self._unchanged_resources
+        self._unchanged_resources = {}
+
+        for resource_type, resources_data in unchanged_resources.items():
+            service, manager = self._get_resource_map(resource_type)
+
+            try:
+                service.touch_resources(resources_data)
+            except Exception as e:
+                _LOGGER.error(
+                    f"[_flush_unchanged_resources] touch resources error: {e}",
+                    exc_info=True,
+                )
+                self.job_task_mgr.add_error(
+                    job_task_vo,
+                    "ERROR_UNKNOWN",
+                    f"failed to touch {resource_type}: {e}",
+                    {"resource_type": resource_type},
+                )
+
+                # resources counted as updated are failed
+                collecting_count_info["updated_count"] -= len(resources_data)
+                collecting_count_info["skipped_count"] -= len(resources_data)
+                collecting_count_info["failure_count"] += len(resources_data)
+
+    def _get_match_index(
+        self, resource_type: str, params: dict
+    ) -> Union[MatchIndex, None]:
+        if not config.get_global("COLLECTING_MATCH_INDEX", False):
+            return None
+
+        if resource_type != "inventory.Asset":
+            return None
+
+        if resource_type not in self._match_index_map:
+            service, manager = self._get_resource_map(resource_type)
+            self._match_index_map[resource_type] = MatchIndex(
+                manager, resource_type, params["domain_id"], params["workspace_id"]
+            )
+
+        return self._match_index_map[resource_type]
+
     def _get_resource_map(self, resource_type: str):
         if resource_type not in RESOURCE_MAP:
             raise ERROR_UNSUPPORTED_RESOURCE_TYPE(resource_type=resource_type)
@@ -577,12 +1276,14 @@ class CollectingManager(BaseManager):
         domain_id: str,
         workspace_id: str,
         resource_manager: ResourceManager,
+        match_index: MatchIndex = None,
     ):
         """match resource based on match rules
 
         Args:
             resource_data (dict): resource data from plugin
             match_rules (list): e.g. {1:['reference.resource_id'], 2:['name']}
+            match_index (MatchIndex): resolve match rules from memory if possible
 
         Return:
             match_resource (dict) : resource_id for update (e.g. {'asset_id': 'asset-abcde12345'})
@@ -595,11 +1296,23 @@ class CollectingManager(BaseManager):
         match_rules = rule_matcher.dict_key_int_parser(match_rules)
 
         for order in sorted(match_rules.keys()):
-            query = rule_matcher.make_query(
-                order, match_rules, resource_data, domain_id, workspace_id
-            )
-            _LOGGER.debug(f"[_query_with_match_rules] query: {query}")
-            match_resource, total_count = resource_manager.find_resources(query)
+            match_result = None
+            if match_index:
+                match_result = match_index.find(
+                    resource_data,
+                    rule_matcher.make_match_conditions(
+                        order, match_rules, resource_data
+                    ),
+                )
+
+            if match_result:
+                match_resource, total_count = match_result
+            else:
+                query = rule_matcher.make_query(
+                    order, match_rules, resource_data, domain_id, workspace_id
+                )
+                _LOGGER.debug(f"[_query_with_match_rules] query: {query}")
+                match_resource, total_count = resource_manager.find_resources(query)
 
             _LOGGER.debug(f"[_query_with_match_rules] match_resource: {match_resource}")
 
@@ -614,3 +1327,141 @@ class CollectingManager(BaseManager):
                 return match_resource, total_count
 
         return match_resource, total_count
+
+    @staticmethod
+    def _query_with_match_rules_in_batch(
+        resources_data: List[dict],
+        match_rules_list: List[dict],
+        domain_id: str,
+        workspace_id: str,
+        resource_manager: ResourceManager,
+        match_index: MatchIndex = None,
+    ) -> List[Union[Tuple[list, int], Exception]]:
+        """match resources based on match rules with one query per match rule order
+
+        Args:
+            resources_data (list): resource data from plugin
+            match_rules_list (list): match rules of each resource
+            match_index (MatchIndex): resolve match rules from memory if possible
+
+        Return:
+            match results (list): (match_resource, total_count) or error of each resource
+        """
+
+        match_rules_list = [
+            rule_matcher.dict_key_int_parser(match_rules)
+            for match_rules in match_rules_list
+        ]
+        match_results = [(None, 0)] * len(resources_data)
+        pending_indexes = set(range(len(resources_data)))
+
+        orders = sorted(
+            {order for match_rules in match_rules_list for order in match_rules.keys()}
+        )
+
+        for order in orders:
+            level_results = {}
+            groups = {}
+
+            for index in sorted(pending_indexes):
+                match_rules = match_rules_list[index]
+                if order not in match_rules:
+                    continue
+
+                resource_data = resources_data[index]
+                conditions = rule_matcher.make_match_conditions(
+                    order, match_rules, resource_data
+                )
+
+                if match_index:
+                    try:
+                        if match_result := match_index.find(resource_data, conditions):
+                            level_results[index] = match_result
+                            continue
+                    except Exception as e:
+                        level_results[index] = e
+                        continue
+
+                if len(conditions) == 0 or not all(
+                    isinstance(value, (str, int, float, bool))
+                    for value in conditions.values()
+                ):
+                    # fallback to single query for complex match values
+                    try:
+                        query = rule_matcher.make_query(
+                            order, match_rules, resource_data, domain_id, workspace_id
+                        )
+                        level_results[index] = resource_manager.find_resources(query)
+                    except Exception as e:
+                        level_results[index] = e
+                    continue
+
+                group_key = (
+                    resource_data.get("resource_type"),
+                    tuple(conditions.keys()),
+                )
+                groups.setdefault(group_key, []).append((index, conditions))
+
+            for (resource_type, keys), group in groups.items():
+                query = {
+                    "filter": rule_matcher.make_scope_filter(
+                        resource_type, domain_id, workspace_id
+                    )
+                }
+
+                for key in keys:
+                    values = list({conditions[key] for index, conditions in group})
+                    query["filter"].append({"k": key, "v": values, "o": "in"})
+
+                try:
+                    _LOGGER.debug(f"[_query_with_match_rules_in_batch] query: {query}")
+                    resources = resource_manager.find_resources_by_keys(
+                        query, list(keys)
+                    )
+                except Exception as e:
+                    for index, conditions in group:
+                        level_results[index] = e
+                    continue
+
+                resource_index = {}
+                for resource in resources:
+                    match_resource = {
+                        key: resource.get(key) for key in resource_manager.resource_keys
+                    }
+                    values = []
+                    for key in keys:
+                        value = rule_matcher.find_data(resource, key)
+                        values.append(value if isinstance(value, list) else [value])
+
+                    for match_values in set(product(*values)):
+                        resource_index.setdefault(match_values, []).append(
+                            match_resource
+                        )
+
+                for index, conditions in group:
+                    match_resource = resource_index.get(
+                        tuple(conditions[key] for key in keys), []
+                    )
+                    level_results[index] = (match_resource, len(match_resource))
+
+            for index, level_result in level_results.items():
+                if isinstance(level_result, Exception):
+                    match_results[index] = level_result
+                    pending_indexes.discard(index)
+                    continue
+
+                match_resource, total_count = level_result
+                match_results[index] = level_result
+
+                if total_count > 1:
+                    if data := resources_data[index].get("data"):
+                        match_results[index] = ERROR_TOO_MANY_MATCH(
+                            match_key=match_rules_list[index][order],
+                            resources=match_resource,
+                            more=data,
+                        )
+                        pending_indexes.discard(index)
+                elif total_count == 1 and match_resource:
+                    pending_indexes.discard(index)
+
+        return match_results
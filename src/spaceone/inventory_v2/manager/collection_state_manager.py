@@ -1,9 +1,20 @@
 import logging
+from datetime import datetime
 from typing import Union, Tuple, List
 
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 from spaceone.core.model.mongo_model import QuerySet
 from spaceone.core.manager import BaseManager
-from spaceone.inventory_v2.model.collection_state.database import CollectionState
+
+from spaceone.inventory_v2.conf.collector_conf import CLEANUP_CHUNK_SIZE
+from spaceone.inventory_v2.lib import bulk_writer
+from spaceone.inventory_v2.model.asset.database import Asset
+from spaceone.inventory_v2.model.collection_state.database import (
+    CollectionState,
+    CollectionGeneration,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,7 +25,9 @@ class CollectionStateManager(BaseManager):
         self.collector_id = self.transaction.get_meta("collector_id")
         self.job_task_id = self.transaction.get_meta("job_task_id")
         self.secret_id = self.transaction.get_meta("secret.secret_id")
+        self.collection_generation = self.transaction.get_meta("collection_generation")
         self.collection_state_model = CollectionState
+        self.collection_generation_model = CollectionGeneration
 
     def create_collection_state(self, asset_id: str, domain_id: str) -> None:
         def _rollback(vo: CollectionState):
@@ -24,7 +37,7 @@ class CollectionStateManager(BaseManager):
             )
             vo.terminate()
 
-        if self.collector_id and self.job_task_id and self.secret_id:
+        if self._is_state_enabled():
             state_data = {
                 "collector_id": self.collector_id,
                 "job_task_id": self.job_task_id,
@@ -34,7 +47,9 @@ class CollectionStateManager(BaseManager):
             }
 
             state_vo = self.collection_state_model.create(state_data)
-            self.transaction.add_rollback(_rollback, state_vo)
+
+            if bulk_writer.is_rollback_enabled(self.transaction):
+                self.transaction.add_rollback(_rollback, state_vo)
 
     def update_collection_state_by_vo(
         self, params: dict, state_vo: CollectionState
@@ -46,19 +61,47 @@ class CollectionStateManager(BaseManager):
             )
             state_vo.update(old_data)
 
-        self.transaction.add_rollback(_rollback, state_vo.to_dict())
+        if bulk_writer.is_rollback_enabled(self.transaction):
+            self.transaction.add_rollback(_rollback, state_vo.to_dict())
+
         return state_vo.update(params)
 
     def reset_collection_state(self, state_vo: CollectionState) -> None:
-        if self.job_task_id:
+        if self._is_state_enabled():
             params = {"disconnected_count": 0, "job_task_id": self.job_task_id}
 
             self.update_collection_state_by_vo(params, state_vo)
 
+    def reset_collection_states(self, asset_ids: List[str], domain_id: str) -> None:
+        # reset existing collection states and create missing ones with one bulk write
+        if self._is_state_enabled():
+            updated_at = datetime.utcnow()
+            operations = [
+                UpdateOne(
+                    {
+                        "collector_id": self.collector_id,
+                        "secret_id": self.secret_id,
+                        "asset_id": asset_id,
+                        "domain_id": domain_id,
+                    },
+                    {
+                        "$set": {
+                            "job_task_id": self.job_task_id,
+                            "disconnected_count": 0,
+                            "updated_at": updated_at,
+                        }
+                    },
+                    upsert=True,
+                )
+                for asset_id in asset_ids
+            ]
+
+            bulk_writer.bulk_write(self.collection_state_model, operations)
+
     def get_collection_state(
         self, asset_id: str, domain_id: str
     ) -> Union[CollectionState, None]:
-        if self.collector_id and self.secret_id:
+        if self.collector_id and self.secret_id and self.collection_generation is None:
             state_vos = self.collection_state_model.filter(
                 collector_id=self.collector_id,
                 secret_id=self.secret_id,
@@ -77,6 +120,57 @@ class CollectionStateManager(BaseManager):
     def list_collection_states(self, query: dict) -> Tuple[QuerySet, int]:
         return self.collection_state_model.query(**query)
 
+    def increment_disconnected_count(
+        self,
+        collector_id: str,
+        secret_id: str,
+        job_task_id: str,
+        domain_id: str,
+        updated_at: datetime,
+    ) -> int:
+        result = self.collection_state_model._get_collection().update_many(
+            {
+                "collector_id": collector_id,
+                "secret_id": secret_id,
+                "job_task_id": {"$ne": job_task_id},
+                "domain_id": domain_id,
+                "updated_at": {"$lt": updated_at},
+            },
+            {"$inc": {"disconnected_count": 1}},
+        )
+
+        return result.modified_count
+
+    def list_disconnected_states(
+        self,
+        collector_id: str,
+        domain_id: str,
+        disconnected_count: int,
+        last_id: Union[ObjectId, None],
+        limit: int,
+    ) -> List[dict]:
+        # states are read by _id range, so that the memory is bounded by limit
+        conditions = {
+            "collector_id": collector_id,
+            "domain_id": domain_id,
+            "disconnected_count": {"$gte": disconnected_count},
+        }
+
+        if last_id:
+            conditions["_id"] = {"$gt": last_id}
+
+        return list(
+            self.collection_state_model._get_collection()
+            .find(conditions, projection={"_id": 1, "asset_id": 1})
+            .sort("_id", ASCENDING)
+            .limit(limit)
+        )
+
+    def delete_collection_states_by_ids(self, state_ids: List[ObjectId]) -> None:
+        self.collection_state_model._get_collection().delete_many(
+            {"_id": {"$in": state_ids}}
+        )
+
     def delete_collection_state_by_asset_id(
         self, resource_id: str, domain_id: str
     ) -> None:
@@ -96,3 +190,117 @@ class CollectionStateManager(BaseManager):
             collector_id=collector_id, domain_id=domain_id
         )
         state_vos.delete()
+
+        generation_vos = self.collection_generation_model.filter(
+            collector_id=collector_id, domain_id=domain_id
+        )
+        generation_vos.delete()
+
+    def allocate_generation(
+        self, collector_id: str, secret_id: str, domain_id: str
+    ) -> int:
+        """Increase collection generation of (collector_id, secret_id)
+
+        Returns:
+            generation (int)
+        """
+
+        collection = self.collection_generation_model._get_collection()
+        conditions = {
+            "collector_id": collector_id,
+            "secret_id": secret_id,
+            "domain_id": domain_id,
+        }
+        update = {
+            "$inc": {"generation": 1},
+            "$set": {"updated_at": datetime.utcnow()},
+        }
+
+        # concurrent upserts of the first generation can conflict once
+        for _ in range(2):
+            try:
+                generation_data = collection.find_one_and_update(
+                    conditions,
+                    update,
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+                return generation_data["generation"]
+            except DuplicateKeyError:
+                continue
+
+        generation_data = collection.find_one_and_update(
+            conditions, update, return_document=ReturnDocument.AFTER
+        )
+        return generation_data["generation"]
+
+    def migrate_collection_states(
+        self, collector_id: str, secret_id: str, domain_id: str
+    ) -> int:
+        """Move collection states of (collector_id, secret_id) to assets
+        Assets not stamped with generation yet get generation 0 and the
+        disconnected_count of their state, and the states are deleted.
+
+        Returns:
+            migrated_count (int)
+        """
+
+        state_collection = self.collection_state_model._get_collection()
+        migrated_count = 0
+
+        while True:
+            state_infos = list(
+                state_collection.find(
+                    {
+                        "collector_id": collector_id,
+                        "secret_id": secret_id,
+                        "domain_id": domain_id,
+                    },
+                    projection={"_id": 1, "asset_id": 1, "disconnected_count": 1},
+                ).limit(CLEANUP_CHUNK_SIZE)
+            )
+
+            if len(state_infos) == 0:
+                break
+
+            operations = [
+                UpdateOne(
+                    {
+                        "asset_id": state_info["asset_id"],
+                        "domain_id": domain_id,
+                        "collection_generation": None,
+                    },
+                    {
+                        "$set": {
+                            "collection_generation": 0,
+                            "disconnected_count": state_info.get(
+                                "disconnected_count", 0
+                            ),
+                        }
+                    },
+                )
+                for state_info in state_infos
+            ]
+
+            bulk_writer.bulk_write(Asset, operations)
+            self.delete_collection_states_by_ids(
+                [state_info["_id"] for state_info in state_infos]
+            )
+            migrated_count += len(state_infos)
+
+        if migrated_count > 0:
+            _LOGGER.debug(
+                f"[migrate_collection_states] migrate {migrated_count} states "
+                f"({collector_id}, {secret_id})"
+            )
+
+        return migrated_count
+
+    def _is_state_enabled(self) -> bool:
+        # assets are stamped with collection generation instead in generation mode
+        return bool(
+            self.collector_id
+            and self.job_task_id
+            and self.secret_id
+            and self.collection_generation is None
+        )
@@ -1,5 +1,6 @@
 import logging
 from typing import Generator, Union
+from spaceone.core import cache, config, utils
 from spaceone.core.manager import BaseManager
 
 from spaceone.inventory_v2.connector import (
@@ -10,10 +11,17 @@ __ALL__ = ["CollectorPluginManager"]
 
 _LOGGER = logging.getLogger(__name__)
 
+_TASKS_CACHE_KEY = (
+    "inventory-v2:plugin-tasks:{domain_id}:{plugin_id}:{version}:{secret_id}:"
+    "{options_hash}"
+)
+
 
 class CollectorPluginManager(BaseManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.collector_version = None
+        self.collector_plugin_conn = None
 
     @staticmethod
     def init_plugin(endpoint: str, options: dict) -> dict:
@@ -24,14 +32,52 @@ class CollectorPluginManager(BaseManager):
         collector_plugin_conn = PluginConnector.get_connector_by_collector_version(
             self.collector_version
         )
-        collector_plugin_conn.verify_plugin(endpoint, options, secret_data)
+        collector_plugin_conn.verify_plugin(
+            endpoint, secret_data=secret_data, options=options
+        )
 
     def get_tasks(self, endpoint: str, secret_data: dict, options: dict) -> dict:
         self.collector_version = options.get("collector_version", "v1")
         collector_plugin_conn: PluginConnector = (
             PluginConnector.get_connector_by_collector_version(self.collector_version)
         )
-        return collector_plugin_conn.get_tasks(endpoint, secret_data, options)
+        return collector_plugin_conn.get_tasks(
+            endpoint, options=options, secret_data=secret_data
+        )
+
+    def get_tasks_with_cache(
+        self,
+        endpoint: str,
+        secret_data: dict,
+        plugin_info: dict,
+        secret_id: str,
+        domain_id: str,
+    ) -> dict:
+        # back-to-back collects reuse the tasks of the same plugin version and options
+        options = plugin_info.get("options", {})
+        cache_ttl = config.get_global("COLLECTING_TASKS_CACHE_TTL", 0)
+
+        if not (cache_ttl > 0 and cache.is_set()):
+            return self.get_tasks(endpoint, secret_data, options)
+
+        cache_key = _TASKS_CACHE_KEY.format(
+            domain_id=domain_id,
+            plugin_id=plugin_info.get("plugin_id"),
+            version=plugin_info.get("version"),
+            secret_id=secret_id,
+            options_hash=utils.dict_to_hash(options),
+        )
+
+        if response := cache.get(cache_key):
+            return response
+
+        response = self.get_tasks(endpoint, secret_data, options)
+
+        # empty tasks are not cached, not to replay them if plugin was not ready
+        if response and response.get("tasks"):
+            cache.set(cache_key, response, expire=cache_ttl)
+
+        return response
 
     def collect(
         self,
@@ -39,11 +85,23 @@ class CollectorPluginManager(BaseManager):
         options: dict,
         secret_data: dict,
         task_options: dict = None,
+        resume_token: str = None,
     ) -> Generator[dict, None, None]:
         self.collector_version = options.get("collector_version", "v1")
-        collector_plugin_conn = PluginConnector.get_connector_by_collector_version(
+        self.collector_plugin_conn = PluginConnector.get_connector_by_collector_version(
             self.collector_version
         )
-        return collector_plugin_conn.collect(
-            endpoint, options, secret_data, task_options
-        )
+
+        if resume_token:
+            # only collector version v2 supports resume token
+            return self.collector_plugin_conn.collect(
+                endpoint, options, secret_data, task_options, resume_token
+            )
+        else:
+            return self.collector_plugin_conn.collect(
+                endpoint, options, secret_data, task_options
+            )
+
+    def get_resume_token(self) -> Union[str, None]:
+        # the last token received from plugin, after the resources are consumed
+        return getattr(self.collector_plugin_conn, "resume_token", None)
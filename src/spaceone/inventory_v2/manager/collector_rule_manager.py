@@ -1,17 +1,22 @@
 import logging
-import functools
+import threading
+import time
 from typing import Tuple
-from spaceone.core import utils
+from spaceone.core import cache, config, utils
 from spaceone.core.model.mongo_model import QuerySet
 from spaceone.core.manager import BaseManager
+from spaceone.inventory_v2.lib.rule_program import RuleProgram, compile_rules
 from spaceone.inventory_v2.manager.identity_manager import IdentityManager
-from spaceone.inventory_v2.model.collector_rule.database import (
-    CollectorRule,
-    CollectorRuleCondition,
-)
+from spaceone.inventory_v2.model.collector_rule.database import CollectorRule
 
 _LOGGER = logging.getLogger(__name__)
 
+_RULE_VERSION_KEY = "inventory-v2:collector-rule-version:{domain_id}:{collector_id}"
+
+# compiled rule programs of this process: {(domain_id, collector_id): program_info}
+_RULE_PROGRAMS = {}
+_RULE_PROGRAMS_LOCK = threading.Lock()
+
 
 class CollectorRuleManager(BaseManager):
     def __init__(self, *args, **kwargs):
@@ -20,7 +25,6 @@ class CollectorRuleManager(BaseManager):
         self.identity_mgr = IdentityManager()
         self._project_info = {}
         self._service_account_info = {}
-        self._collector_rule_info = {}
 
     def create_collector_rule(self, params: dict) -> CollectorRule:
         def _rollback(vo: CollectorRule):
@@ -29,10 +33,15 @@ class CollectorRuleManager(BaseManager):
                 f"({vo.collector_rule_id})"
             )
             vo.delete()
+            self.delete_rule_program(vo.collector_id, vo.domain_id)
 
         collector_rule_vo: CollectorRule = self.collector_rule_model.create(params)
         self.transaction.add_rollback(_rollback, collector_rule_vo)
 
+        self.delete_rule_program(
+            collector_rule_vo.collector_id, collector_rule_vo.domain_id
+        )
+
         return collector_rule_vo
 
     def update_collector_rule_by_vo(
@@ -44,14 +53,25 @@ class CollectorRuleManager(BaseManager):
                 f'{old_data["collector_rule_id"]}'
             )
             collector_rule_vo.update(old_data)
+            self.delete_rule_program(
+                collector_rule_vo.collector_id, collector_rule_vo.domain_id
+            )
 
         self.transaction.add_rollback(_rollback, collector_rule_vo.to_dict())
 
-        return collector_rule_vo.update(params)
+        collector_rule_vo = collector_rule_vo.update(params)
+        self.delete_rule_program(
+            collector_rule_vo.collector_id, collector_rule_vo.domain_id
+        )
+
+        return collector_rule_vo
+
+    def delete_collector_rule_by_vo(self, collector_rule_vo: CollectorRule) -> None:
+        collector_id = collector_rule_vo.collector_id
+        domain_id = collector_rule_vo.domain_id
 
-    @staticmethod
-    def delete_collector_rule_by_vo(collector_rule_vo: CollectorRule) -> None:
         collector_rule_vo.delete()
+        self.delete_rule_program(collector_id, domain_id)
 
     def get_collector_rule(
         self, collector_rule_id: str, domain_id: str, workspace_id: str = None
@@ -78,36 +98,34 @@ class CollectorRuleManager(BaseManager):
     def change_asset_data(
         self, collector_id: str, domain_id: str, asset_data: dict
     ) -> dict:
-        (
-            managed_collector_rule_vos,
-            custom_collector_rule_vos,
-        ) = self._get_collector_rules(collector_id, domain_id)
-
-        asset_data = self._apply_collector_rule_to_asset_data(
-            asset_data, managed_collector_rule_vos, domain_id
-        )
+        rule_program = self._get_rule_program(collector_id, domain_id)
+
+        # each rule is matched with the asset data changed by previous rules
+        for rules in [rule_program.managed_rules, rule_program.custom_rules]:
+            for predicate, actions, stop_processing in rules:
+                if predicate(asset_data):
+                    asset_data = self._change_asset_data_with_actions(
+                        asset_data, actions, domain_id
+                    )
 
-        asset_data = self._apply_collector_rule_to_asset_data(
-            asset_data, custom_collector_rule_vos, domain_id
-        )
+                    if stop_processing:
+                        break
 
         return asset_data
 
-    def _apply_collector_rule_to_asset_data(
-        self, asset_data: dict, collector_rule_vos: QuerySet, domain_id: str
-    ) -> dict:
-        for collector_rule_vo in collector_rule_vos:
-            is_match = self._change_asset_data_by_rule(asset_data, collector_rule_vo)
-
-            if is_match:
-                asset_data = self._change_asset_data_with_actions(
-                    asset_data, collector_rule_vo.actions, domain_id
-                )
-
-            if is_match and collector_rule_vo.options.stop_processing:
-                break
-
-        return asset_data
+    @staticmethod
+    def delete_rule_program(collector_id: str, domain_id: str) -> None:
+        # rule programs of other processes are compiled again by the changed version
+        with _RULE_PROGRAMS_LOCK:
+            _RULE_PROGRAMS.pop((domain_id, collector_id), None)
+
+        if cache.is_set():
+            cache.set(
+                _RULE_VERSION_KEY.format(
+                    domain_id=domain_id, collector_id=collector_id
+                ),
+                utils.generate_id("version"),
+            )
 
     def _change_asset_data_with_actions(
         self, asset_data: dict, actions: dict, domain_id: str
@@ -156,6 +174,12 @@ class CollectorRuleManager(BaseManager):
     def _get_service_account(
         self, target_key: str, target_value: any, domain_id: str
     ) -> dict:
+        if config.get_global("IDENTITY_SNAPSHOT_TTL", 300) > 0:
+            service_account_snapshot = self.identity_mgr.get_service_account_snapshot(
+                domain_id
+            )
+            return service_account_snapshot.find(target_key, target_value)
+
         if (
             f"inventory:service-account:{domain_id}:{target_key}:{target_value}"
             in self._service_account_info
@@ -188,6 +212,10 @@ class CollectorRuleManager(BaseManager):
         return service_account_info
 
     def _get_project(self, target_key: str, target_value: str, domain_id: str) -> dict:
+        if config.get_global("IDENTITY_SNAPSHOT_TTL", 300) > 0:
+            project_snapshot = self.identity_mgr.get_project_snapshot(domain_id)
+            return project_snapshot.find(target_key, target_value)
+
         if (
             f"identity:project:{domain_id}:{target_key}:{target_value}"
             in self._project_info
@@ -217,84 +245,50 @@ class CollectorRuleManager(BaseManager):
         ] = project_info
         return project_info
 
-    def _change_asset_data_by_rule(
-        self, asset_data: dict, collector_rule_vo: CollectorRule
-    ) -> bool:
-        conditions_policy = collector_rule_vo.conditions_policy
-
-        if conditions_policy == "ALWAYS":
-            return True
-        else:
-            results = list(
-                map(
-                    functools.partial(self._check_condition, asset_data),
-                    collector_rule_vo.conditions,
-                )
-            )
+    def _get_rule_program(self, collector_id: str, domain_id: str) -> RuleProgram:
+        program_key = (domain_id, collector_id)
+        cache_ttl = config.get_global("COLLECTOR_RULE_CACHE_TTL", 10)
 
-            if conditions_policy == "ALL":
-                return all(results)
-            else:
-                return any(results)
+        with _RULE_PROGRAMS_LOCK:
+            program_info = _RULE_PROGRAMS.get(program_key)
 
-    @staticmethod
-    def _check_condition(asset_data: dict, condition: CollectorRuleCondition) -> bool:
-        asset_value = utils.get_dict_value(asset_data, condition.key)
-        condition_value = condition.value
-        operator = condition.operator
-
-        if asset_value is None:
-            return False
-
-        if operator == "eq":
-            if asset_value == condition_value:
-                return True
-            else:
-                return False
-        elif operator == "contain":
-            if asset_value.lower().find(condition_value.lower()) >= 0:
-                return True
-            else:
-                return False
-        elif operator == "not":
-            if asset_value != condition_value:
-                return True
-            else:
-                return False
-        elif operator == "not_contain":
-            if asset_value.lower().find(condition_value.lower()) < 0:
-                return True
-            else:
-                return False
-
-        return False
-
-    def _get_collector_rules(
-        self, collector_id: str, domain_id: str
-    ) -> Tuple[QuerySet, QuerySet]:
-        if collector_id in self._collector_rule_info:
-            return self._collector_rule_info[collector_id].get(
-                "managed", []
-            ), self._collector_rule_info[collector_id].get("custom", [])
-
-        managed_query = self._make_collector_rule_query(
-            collector_id, "MANAGED", domain_id
-        )
+        if program_info and time.time() < program_info["checked_at"] + cache_ttl:
+            return program_info["program"]
+
+        version = self._get_rule_version(collector_id, domain_id)
+
+        if program_info and cache.is_set() and program_info["version"] == version:
+            program_info["checked_at"] = time.time()
+            return program_info["program"]
 
         managed_collector_rule_vos, total_count = self.list_collector_rules(
-            managed_query
+            self._make_collector_rule_query(collector_id, "MANAGED", domain_id)
+        )
+        custom_collector_rule_vos, total_count = self.list_collector_rules(
+            self._make_collector_rule_query(collector_id, "CUSTOM", domain_id)
         )
 
-        custom_query = self._make_collector_rule_query(
-            collector_id, "CUSTOM", domain_id
+        rule_program = compile_rules(
+            managed_collector_rule_vos, custom_collector_rule_vos
         )
-        custom_collector_rule_vos, total_count = self.list_collector_rules(custom_query)
 
-        self._collector_rule_info[collector_id] = {}
-        self._collector_rule_info[collector_id]["managed"] = managed_collector_rule_vos
-        self._collector_rule_info[collector_id]["custom"] = custom_collector_rule_vos
+        with _RULE_PROGRAMS_LOCK:
+            _RULE_PROGRAMS[program_key] = {
+                "program": rule_program,
+                "version": version,
+                "checked_at": time.time(),
+            }
+
+        return rule_program
+
+    @staticmethod
+    def _get_rule_version(collector_id: str, domain_id: str) -> str:
+        if cache.is_set():
+            return cache.get(
+                _RULE_VERSION_KEY.format(domain_id=domain_id, collector_id=collector_id)
+            )
 
-        return managed_collector_rule_vos, custom_collector_rule_vos
+        return None
 
     @staticmethod
     def _make_collector_rule_query(
@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+from typing import List, Union
+
+from spaceone.core import cache, config, queue, utils
+from spaceone.core.manager import BaseManager
+
+_LOGGER = logging.getLogger(__name__)
+
+_LEASE_KEY = "inventory-v2:collecting-lease:{job_id}:{collector_id}"
+_LEASE_COUNT_KEY = "inventory-v2:collecting-lease-count:{job_id}:{collector_id}"
+_DEFERRED_TASK_KEY = "inventory-v2:deferred-task:{job_id}:{collector_id}"
+_DEFERRED_TASK_REGISTRY_KEY = "inventory-v2:deferred-task-keys"
+
+# lease is kept per job task and counted by its sub tasks
+_ACQUIRE_LEASE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local is_holder = redis.call('ZSCORE', KEYS[1], ARGV[3])
+if is_holder or redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], tonumber(ARGV[1]) + tonumber(ARGV[4]), ARGV[3])
+    if is_holder then
+        redis.call('HINCRBY', KEYS[2], ARGV[3], 1)
+    else
+        redis.call('HSET', KEYS[2], ARGV[3], 1)
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    redis.call('EXPIRE', KEYS[2], ARGV[4])
+    return 1
+end
+return 0
+"""
+
+_RELEASE_LEASE_SCRIPT = """
+local count = redis.call('HINCRBY', KEYS[2], ARGV[1], -1)
+if count <= 0 then
+    redis.call('HDEL', KEYS[2], ARGV[1])
+    redis.call('ZREM', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+_POP_TASKS_SCRIPT = """
+local tasks = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #tasks > 0 then
+    redis.call('ZREM', KEYS[1], unpack(tasks))
+end
+if redis.call('ZCARD', KEYS[1]) == 0 then
+    redis.call('SREM', KEYS[2], KEYS[1])
+end
+return tasks
+"""
+
+
+@cache.connect
+def _get_redis_connection(cache_cls):
+    return getattr(cache_cls, "conn", None)
+
+
+class ConcurrencyManager(BaseManager):
+    """
+    Admission of collecting tasks per (job_id, collector_id).
+    Job tasks hold leases in redis cache while collecting, and tasks over the
+    concurrency are deferred and pushed again when a lease is released or
+    when they are due.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queue_name = "inventory_q"
+        self.lease_timeout = config.get_global("COLLECTING_LEASE_TIMEOUT", 10800)
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return cache.is_set() and _get_redis_connection() is not None
+
+    def acquire_lease(
+        self, job_id: str, collector_id: str, job_task_id: str, max_concurrency: int
+    ) -> bool:
+        conn = _get_redis_connection()
+        acquire_lease = conn.register_script(_ACQUIRE_LEASE_SCRIPT)
+
+        is_acquired = acquire_lease(
+            keys=[
+                _LEASE_KEY.format(job_id=job_id, collector_id=collector_id),
+                _LEASE_COUNT_KEY.format(job_id=job_id, collector_id=collector_id),
+            ],
+            args=[int(time.time()), max_concurrency, job_task_id, self.lease_timeout],
+        )
+
+        return is_acquired == 1
+
+    def release_lease(self, job_id: str, collector_id: str, job_task_id: str) -> None:
+        conn = _get_redis_connection()
+        release_lease = conn.register_script(_RELEASE_LEASE_SCRIPT)
+
+        remained_count = release_lease(
+            keys=[
+                _LEASE_KEY.format(job_id=job_id, collector_id=collector_id),
+                _LEASE_COUNT_KEY.format(job_id=job_id, collector_id=collector_id),
+            ],
+            args=[job_task_id],
+        )
+
+        _LOGGER.debug(
+            f"[release_lease] {job_task_id}: remained sub tasks = {remained_count}"
+        )
+
+        # a slot may be freed, so push a deferred task without waiting
+        self.push_deferred_tasks(job_id, collector_id, limit=1, is_due=False)
+
+    def defer_task(
+        self, job_id: str, collector_id: str, task: dict, delay: int
+    ) -> None:
+        json_task = utils.dump_json(task)
+
+        if self.is_enabled():
+            conn = _get_redis_connection()
+
+            # deferred_id keeps the same sub tasks as different members
+            member = utils.dump_json(
+                {"deferred_id": utils.generate_id("deferred"), "task": json_task}
+            )
+            key = _DEFERRED_TASK_KEY.format(job_id=job_id, collector_id=collector_id)
+
+            # keys of deferred tasks are kept in registry to be found without KEYS
+            pipeline = conn.pipeline()
+            pipeline.zadd(key, {member: time.time() + delay})
+            pipeline.sadd(_DEFERRED_TASK_REGISTRY_KEY, key)
+            pipeline.execute()
+        else:
+            # push the task later without blocking the worker thread
+            timer = threading.Timer(delay, queue.put, [self.queue_name, json_task])
+            timer.daemon = True
+            timer.start()
+
+    def push_deferred_tasks(
+        self,
+        job_id: str = None,
+        collector_id: str = None,
+        limit: int = 100,
+        is_due: bool = True,
+    ) -> int:
+        """Push deferred tasks to queue
+        Args:
+            job_id (str): all jobs if not set
+            collector_id (str): all collectors if not set
+            limit (int): max number of tasks per job
+            is_due (bool): push only the tasks which are due
+
+        Returns:
+            count of pushed tasks
+        """
+
+        pushed_count = 0
+        for json_task in self.pop_deferred_tasks(job_id, collector_id, limit, is_due):
+            queue.put(self.queue_name, json_task)
+            pushed_count += 1
+
+        return pushed_count
+
+    def pop_deferred_tasks(
+        self,
+        job_id: str = None,
+        collector_id: str = None,
+        limit: int = 100,
+        is_due: bool = True,
+    ) -> List[str]:
+        if not self.is_enabled():
+            return []
+
+        conn = _get_redis_connection()
+        pop_tasks = conn.register_script(_POP_TASKS_SCRIPT)
+        max_score = time.time() if is_due else "+inf"
+
+        json_tasks = []
+        for key in self._list_deferred_task_keys(job_id, collector_id):
+            for member in pop_tasks(
+                keys=[key, _DEFERRED_TASK_REGISTRY_KEY], args=[max_score, limit]
+            ):
+                json_tasks.append(utils.load_json(member)["task"])
+
+        return json_tasks
+
+    @staticmethod
+    def _list_deferred_task_keys(
+        job_id: Union[str, None], collector_id: Union[str, None]
+    ) -> List[str]:
+        if job_id and collector_id:
+            return [_DEFERRED_TASK_KEY.format(job_id=job_id, collector_id=collector_id)]
+
+        conn = _get_redis_connection()
+        keys = [
+            key.decode() if isinstance(key, bytes) else key
+            for key in conn.smembers(_DEFERRED_TASK_REGISTRY_KEY)
+        ]
+
+        if job_id:
+            prefix = _DEFERRED_TASK_KEY.format(job_id=job_id, collector_id="")
+            keys = [key for key in keys if key.startswith(prefix)]
+
+        return keys
@@ -1,9 +1,18 @@
+import copy
 import logging
-from typing import Union
-from operator import itemgetter
+from datetime import datetime, timedelta
+from typing import Union, List, Tuple
+
+from pymongo import ASCENDING, ReplaceOne
+from spaceone.core import config
 from spaceone.core.manager import BaseManager
-from spaceone.core import utils
-from spaceone.inventory_v2.model.asset.database import Asset, History
+from spaceone.core.model.mongo_model import QuerySet
+
+from spaceone.inventory_v2.conf.collector_conf import *
+from spaceone.inventory_v2.lib import bulk_writer, cursor_pagination
+from spaceone.inventory_v2.lib.compressor import compress_diff, decompress_diff
+from spaceone.inventory_v2.lib.diff_engine import DiffEngine
+from spaceone.inventory_v2.model.asset.database import Asset, History, HistoryArchive
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,10 +36,12 @@ class HistoryManager(BaseManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.history_model = History
+        self.history_archive_model = HistoryArchive
         self.merged_data = {}
         self.is_changed = False
         self.collector_id = self.transaction.get_meta("collector_id")
         self.job_id = self.transaction.get_meta("job_id")
+        self.job_task_id = self.transaction.get_meta("job_task_id")
         self.plugin_id = self.transaction.get_meta("plugin_id")
         self.secret_id = self.transaction.get_meta("secret.secret_id")
         self.service_account_id = self.transaction.get_meta("secret.service_account_id")
@@ -52,13 +63,209 @@ class HistoryManager(BaseManager):
             vo.delete()
 
         history_vo: History = self.history_model.create(params)
-        self.transaction.add_rollback(_rollback, history_vo)
+
+        if bulk_writer.is_rollback_enabled(self.transaction):
+            self.transaction.add_rollback(_rollback, history_vo)
 
         return history_vo
 
+    def create_histories(self, params_list: List[dict]) -> None:
+        def _rollback(history_ids: List[str]):
+            _LOGGER.info(f"[ROLLBACK] Delete Records : {len(history_ids)} histories")
+            self.history_model.filter(history_id=history_ids).delete()
+
+        if len(params_list) == 0:
+            return None
+
+        documents = [
+            bulk_writer.make_document(self.history_model, params)
+            for params in params_list
+        ]
+        bulk_writer.insert_many(self.history_model, documents, HISTORY_INSERT_SIZE)
+
+        if bulk_writer.is_rollback_enabled(self.transaction):
+            self.transaction.add_rollback(
+                _rollback, [document["history_id"] for document in documents]
+            )
+
+    def filter_histories(self, **conditions) -> QuerySet:
+        return self.history_model.filter(**conditions)
+
+    def list_histories(self, query: dict) -> Tuple[List[dict], int]:
+        """List histories of History and HistoryArchive with the same query
+        Archived histories are older than all histories in History,
+        so they follow the histories of History in the default ordering (-created_at).
+
+        Returns:
+            histories_info (list)
+            total_count (int)
+        """
+
+        history_vos, total_count = self.history_model.query(**query)
+        histories_info = [history_vo.to_dict() for history_vo in history_vos]
+
+        if config.get_global("HISTORY_HOT_DAYS", 0) > 0:
+            archive_query = copy.deepcopy(query)
+            page = archive_query.get("page", {})
+            limit = page.get("limit", 0)
+
+            if limit > 0:
+                start = max(page.get("start", 1), 1)
+                archive_query["page"] = {
+                    "start": max(start - total_count, 1),
+                    "limit": limit - len(histories_info),
+                }
+
+            if limit > 0 and archive_query["page"]["limit"] <= 0:
+                archive_query["count_only"] = True
+
+            archive_vos, archive_count = self.history_archive_model.query(
+                **archive_query
+            )
+
+            for archive_vo in archive_vos:
+                history_info = archive_vo.to_dict()
+                history_info["diff"] = decompress_diff(history_info.get("diff", []))
+                histories_info.append(history_info)
+
+            total_count += archive_count
+
+        return histories_info, total_count
+
+    def list_histories_by_cursor(
+        self, query: dict, cursor: str
+    ) -> Tuple[List[dict], Union[str, None], Union[str, None]]:
+        """List histories of History and HistoryArchive with cursor
+        Returns:
+            histories_info (list)
+            next_cursor (str)
+            prev_cursor (str)
+        """
+
+        models = [self.history_model]
+        if config.get_global("HISTORY_HOT_DAYS", 0) > 0:
+            models.append(self.history_archive_model)
+
+        history_vos, next_cursor, prev_cursor = cursor_pagination.list_by_cursor(
+            models, query, cursor
+        )
+
+        histories_info = []
+        for history_vo in history_vos:
+            history_info = history_vo.to_dict()
+            if isinstance(history_vo, HistoryArchive):
+                history_info["diff"] = decompress_diff(history_info.get("diff", []))
+
+            histories_info.append(history_info)
+
+        return histories_info, next_cursor, prev_cursor
+
+    def sweep_histories(self, params: dict) -> None:
+        """Move old histories to HistoryArchive and delete expired histories
+        Args:
+            params (dict): {}
+
+        Returns:
+            None
+        """
+
+        hot_days = config.get_global("HISTORY_HOT_DAYS", 0)
+        retention_days = config.get_global("HISTORY_RETENTION_DAYS", 0)
+
+        if hot_days > 0:
+            archived_count = self.archive_histories(
+                datetime.utcnow() - timedelta(days=hot_days)
+            )
+            _LOGGER.debug(f"[sweep_histories] archived histories: {archived_count}")
+
+        if retention_days > 0:
+            deleted_count = self.delete_expired_histories(
+                datetime.utcnow() - timedelta(days=retention_days)
+            )
+            _LOGGER.debug(f"[sweep_histories] deleted histories: {deleted_count}")
+
+    def archive_histories(self, archived_before: datetime) -> int:
+        """Move histories created before archived_before by chunk
+        Histories are written to archive by _id first, so that the sweep can be
+        stopped and run again at any time.
+
+        Returns:
+            archived_count (int)
+        """
+
+        compress_size = config.get_global("HISTORY_COMPRESS_SIZE", 4096)
+        history_collection = self.history_model._get_collection()
+        archived_count = 0
+
+        while True:
+            documents = list(
+                history_collection.find({"created_at": {"$lt": archived_before}})
+                .sort("created_at", ASCENDING)
+                .limit(HISTORY_SWEEP_SIZE)
+            )
+
+            if len(documents) == 0:
+                break
+
+            for document in documents:
+                document["created_month"] = document["created_at"].strftime("%Y-%m")
+                document["diff"] = compress_diff(
+                    document.get("diff", []), compress_size
+                )
+
+            failures = bulk_writer.bulk_write(
+                self.history_archive_model,
+                [
+                    ReplaceOne({"_id": document["_id"]}, document, upsert=True)
+                    for document in documents
+                ],
+            )
+
+            archived_ids = [
+                document["_id"]
+                for index, document in enumerate(documents)
+                if index not in failures
+            ]
+
+            if len(archived_ids) == 0:
+                _LOGGER.error("[archive_histories] failed to archive histories")
+                break
+
+            history_collection.delete_many({"_id": {"$in": archived_ids}})
+            archived_count += len(archived_ids)
+
+        return archived_count
+
+    def delete_expired_histories(self, expired_before: datetime) -> int:
+        """Delete histories created before expired_before
+        Archived histories are deleted by month (created_month) before expired_before.
+
+        Returns:
+            deleted_count (int)
+        """
+
+        history_result = self.history_model._get_collection().delete_many(
+            {"created_at": {"$lt": expired_before}}
+        )
+        archive_result = self.history_archive_model._get_collection().delete_many(
+            {"created_month": {"$lt": expired_before.strftime("%Y-%m")}}
+        )
+
+        return history_result.deleted_count + archive_result.deleted_count
+
     def add_new_history(self, asset_vo: Asset, new_data: dict) -> None:
         self._create_history(asset_vo, new_data)
 
+    def add_new_histories(self, new_data_list: List[dict]) -> None:
+        params_list = []
+        for new_data in new_data_list:
+            if params := self._make_history_params(
+                new_data["asset_id"], new_data["domain_id"], new_data
+            ):
+                params_list.append(params)
+
+        self.create_histories(params_list)
+
     def add_update_history(
         self, asset_vo: Asset, new_data: dict, old_data: dict
     ) -> None:
@@ -67,6 +274,17 @@ class HistoryManager(BaseManager):
         if len(set(new_keys) & set(DIFF_KEYS)) > 0:
             self._create_history(asset_vo, new_data, old_data)
 
+    def add_update_histories(self, updated_data_list: List[Tuple[dict, dict]]) -> None:
+        params_list = []
+        for new_data, old_data in updated_data_list:
+            if len(set(new_data.keys()) & set(DIFF_KEYS)) > 0:
+                if params := self._make_history_params(
+                    old_data["asset_id"], old_data["domain_id"], new_data, old_data
+                ):
+                    params_list.append(params)
+
+        self.create_histories(params_list)
+
     def add_delete_history(self, asset_vo: Asset) -> None:
         params = {
             "asset_id": asset_vo.asset_id,
@@ -76,9 +294,38 @@ class HistoryManager(BaseManager):
 
         self.create_history(params)
 
+    def add_delete_histories(self, assets: List[dict]) -> None:
+        params_list = []
+        for asset_info in assets:
+            params = {
+                "asset_id": asset_info["asset_id"],
+                "action": "DELETE",
+                "updated_by": self.updated_by,
+                "project_id": asset_info.get("project_id"),
+                "workspace_id": asset_info.get("workspace_id"),
+                "domain_id": asset_info["domain_id"],
+            }
+
+            if self.updated_by == "COLLECTOR":
+                params["collector_id"] = self.collector_id
+                params["job_id"] = self.job_id
+                params["job_task_id"] = self.job_task_id
+
+            params_list.append(params)
+
+        self.create_histories(params_list)
+
     def _create_history(
         self, asset_vo: Asset, new_data: dict, old_data: dict = None
     ) -> None:
+        if params := self._make_history_params(
+            asset_vo.asset_id, asset_vo.domain_id, new_data, old_data
+        ):
+            self.create_history(params)
+
+    def _make_history_params(
+        self, asset_id: str, domain_id: str, new_data: dict, old_data: dict = None
+    ) -> Union[dict, None]:
         if old_data:
             action = "UPDATE"
         else:
@@ -92,8 +339,8 @@ class HistoryManager(BaseManager):
 
         if diff_count > 0:
             params = {
-                "asset_id": asset_vo.asset_id,
-                "domain_id": asset_vo.domain_id,
+                "asset_id": asset_id,
+                "domain_id": domain_id,
                 "action": action,
                 "diff": diff,
                 "diff_count": diff_count,
@@ -103,12 +350,18 @@ class HistoryManager(BaseManager):
             if self.updated_by == "COLLECTOR":
                 params["collector_id"] = self.collector_id
                 params["job_id"] = self.job_id
+                params["job_task_id"] = self.job_task_id
             else:
                 params["user_id"] = self.user_id
 
-            self.create_history(params)
+            return params
+
+        return None
+
+    @staticmethod
+    def _make_diff(new_data: dict, old_data: dict, exclude_keys: list) -> list:
+        diff_engine = DiffEngine(exclude_keys, MAX_KEY_DEPTH)
 
-    def _make_diff(self, new_data: dict, old_data: dict, exclude_keys: list) -> list:
         diff = []
         for key in DIFF_KEYS:
             if key in new_data:
@@ -117,138 +370,6 @@ class HistoryManager(BaseManager):
                 else:
                     old_value = None
 
-                diff += self._get_diff_data(key, new_data[key], old_value, exclude_keys)
-
-        return diff
-
-    def _get_diff_data(
-        self,
-        key: str,
-        new_value: any,
-        old_value: any,
-        exclude_keys: list,
-        depth: int = 1,
-        parent_key: str = None,
-    ) -> list:
-        diff = []
-
-        if depth == MAX_KEY_DEPTH:
-            if new_value != old_value:
-                diff_data = self._generate_diff_data(
-                    key, parent_key, new_value, old_value, exclude_keys
-                )
-                if diff_data:
-                    diff.append(diff_data)
-        elif isinstance(new_value, dict):
-            if parent_key:
-                parent_key = f"{parent_key}.{key}"
-            else:
-                parent_key = key
-
-            for sub_key, sub_value in new_value.items():
-                if isinstance(old_value, dict):
-                    sub_old_value = old_value.get(sub_key)
-                else:
-                    sub_old_value = None
-
-                diff += self._get_diff_data(
-                    sub_key,
-                    sub_value,
-                    sub_old_value,
-                    exclude_keys,
-                    depth + 1,
-                    parent_key,
-                )
-        else:
-            if new_value != old_value:
-                diff_data = self._generate_diff_data(
-                    key, parent_key, new_value, old_value, exclude_keys
-                )
-                if diff_data:
-                    diff.append(diff_data)
+                diff += diff_engine.make_diff(key, new_data[key], old_value)
 
         return diff
-
-    def _generate_diff_data(
-        self,
-        key: str,
-        parent_key: str,
-        new_value: any,
-        old_value: any,
-        exclude_keys: list,
-    ) -> Union[dict, None]:
-        if old_value is None:
-            diff_type = "ADDED"
-        else:
-            diff_type = "CHANGED"
-
-        before = self._change_diff_value(old_value)
-        after = self._change_diff_value(new_value)
-        diff_key = key if parent_key is None else f"{parent_key}.{key}"
-
-        if diff_key in exclude_keys:
-            return None
-        elif before == after:
-            return None
-        else:
-            return {
-                "key": diff_key,
-                "before": before,
-                "after": after,
-                "type": diff_type,
-            }
-
-    def _change_diff_value(self, value: any) -> any:
-        if isinstance(value, dict):
-            return utils.dump_json(self._sort_dict_value(value))
-        elif isinstance(value, list):
-            return utils.dump_json(self._sort_list_values(value))
-        elif value is None:
-            return value
-        else:
-            return str(value)
-
-    def _sort_dict_value(self, value: dict) -> dict:
-        try:
-            for k, v in value.items():
-                if isinstance(v, dict):
-                    value[k] = self._sort_dict_value(v)
-                elif isinstance(v, list):
-                    value[k] = self._sort_list_values(v)
-
-            return dict(sorted(value.items()))
-        except Exception as e:
-            # _LOGGER.warning(
-            #     f"[_sort_dict_value] dict value sort error: {e}", exc_info=True
-            # )
-            pass
-
-        return value
-
-    def _sort_list_values(self, values: list) -> list:
-        if len(values) > 0:
-            if isinstance(values[0], dict):
-                changed_list_values = []
-                for value in values:
-                    changed_list_values.append(self._sort_dict_value(value))
-
-                sort_keys = list(changed_list_values[0].keys())
-
-                if len(sort_keys) > 0:
-                    try:
-                        return sorted(
-                            changed_list_values, key=itemgetter(*sort_keys[:3])
-                        )
-                    except Exception as e:
-                        # _LOGGER.warning(
-                        #     f"[_sort_list_values] list value sort error: {e}",
-                        #     exc_info=True,
-                        # )
-                        pass
-
-                return changed_list_values
-
-            else:
-                return sorted(values)
-
-        return values
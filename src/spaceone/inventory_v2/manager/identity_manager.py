@@ -1,22 +1,28 @@
 import logging
 from typing import Union
 
-from spaceone.core import cache
 from spaceone.core import config
 from spaceone.core.manager import BaseManager
-from spaceone.core.connector.space_connector import SpaceConnector
 from spaceone.core.auth.jwt.jwt_util import JWTUtil
 
+from spaceone.inventory_v2.connector.pooled_space_connector import (
+    PooledSpaceConnector,
+)
+from spaceone.inventory_v2.lib import near_cache
+from spaceone.inventory_v2.lib.identity_snapshot import IdentitySnapshot, get_snapshot
+
 _LOGGER = logging.getLogger(__name__)
 
+_SNAPSHOT_PAGE_SIZE = 1000
+
 
 class IdentityManager(BaseManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         token = self.transaction.get_meta("token") or kwargs.get("token")
         self.token_type = JWTUtil.get_value_from_token(token, "typ")
-        self.identity_conn: SpaceConnector = self.locator.get_connector(
-            SpaceConnector,
+        self.identity_conn: PooledSpaceConnector = self.locator.get_connector(
+            PooledSpaceConnector,
             service="identity",
             token=token,
         )
@@ -85,7 +91,7 @@ class IdentityManager(BaseManager):
             )
         return service_account_name_map
 
-    @cache.cacheable(
+    @near_cache.cacheable(
         key="inventory:service-account:{domain_id}:{service_account_id}", expire=300
     )
     def get_service_account(self, service_account_id: str, domain_id: str) -> dict:
@@ -111,7 +117,7 @@ class IdentityManager(BaseManager):
         else:
             return self.identity_conn.dispatch("ServiceAccount.list", {"query": query})
 
-    @cache.cacheable(key="inventory:project:{domain_id}:{project_id}", expire=3600)
+    @near_cache.cacheable(key="inventory:project:{domain_id}:{project_id}", expire=3600)
     def get_project(self, project_id, domain_id) -> dict:
         token = self.transaction.get_meta("token")
         token_type = JWTUtil.get_value_from_token(token, "typ")
@@ -162,7 +168,7 @@ class IdentityManager(BaseManager):
         else:
             return self.identity_conn.dispatch("ProjectGroup.list", params)
 
-    @cache.cacheable(
+    @near_cache.cacheable(
         key="inventory:project:query:{domain_id}:{query_hash}", expire=3600
     )
     def list_projects_with_cache(
@@ -170,7 +176,7 @@ class IdentityManager(BaseManager):
     ) -> dict:
         return self.list_projects({"query": query}, domain_id)
 
-    @cache.cacheable(
+    @near_cache.cacheable(
         key="inventory:service-account:query:{domain_id}:{query_hash}", expire=3600
     )
     def list_service_accounts_with_cache(
@@ -178,6 +184,47 @@ class IdentityManager(BaseManager):
     ) -> dict:
         return self.list_service_accounts(query, domain_id)
 
+    def get_project_snapshot(self, domain_id: str) -> IdentitySnapshot:
+        return get_snapshot(
+            "project",
+            domain_id,
+            config.get_global("IDENTITY_SNAPSHOT_TTL", 300),
+            lambda: self._list_all_resources(
+                lambda query: self.list_projects({"query": query}, domain_id)
+            ),
+        )
+
+    def get_service_account_snapshot(self, domain_id: str) -> IdentitySnapshot:
+        return get_snapshot(
+            "service_account",
+            domain_id,
+            config.get_global("IDENTITY_SNAPSHOT_TTL", 300),
+            lambda: self._list_all_resources(
+                lambda query: self.list_service_accounts(query, domain_id)
+            ),
+        )
+
+    @staticmethod
+    def _list_all_resources(list_method) -> list:
+        resources = []
+        start = 1
+
+        while True:
+            response = list_method(
+                {"page": {"start": start, "limit": _SNAPSHOT_PAGE_SIZE}}
+            )
+            results = response.get("results", [])
+            resources += results
+
+            if len(results) < _SNAPSHOT_PAGE_SIZE or len(resources) >= response.get(
+                "total_count", 0
+            ):
+                break
+
+            start += _SNAPSHOT_PAGE_SIZE
+
+        return resources
+
     def list_schemas(self, query: dict, domain_id: str) -> dict:
         # For general user, use access token
         return self.identity_conn.dispatch("Schema.list", {"query": query})
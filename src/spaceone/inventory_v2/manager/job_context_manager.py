@@ -0,0 +1,122 @@
+import logging
+from typing import List
+
+from spaceone.core import cache, config
+from spaceone.core.manager import BaseManager
+
+from spaceone.inventory_v2.error.collector import ERROR_JOB_CONTEXT_NOT_FOUND
+
+_LOGGER = logging.getLogger(__name__)
+
+_JOB_CONTEXT_KEY = "inventory-v2:job-context:{domain_id}:{job_id}"
+_SECRET_CONTEXT_KEY = "inventory-v2:job-context:{domain_id}:{job_id}:secret:{secret_id}"
+
+# keys of collecting task which are stored in job context instead of task message
+_JOB_CONTEXT_FIELDS = ["plugin_info"]
+_SECRET_CONTEXT_FIELDS = ["secret_info", "secret_data"]
+
+
+class JobContextManager(BaseManager):
+    """
+    Context shared by collecting tasks is stored once in cache.
+    plugin_info is stored per job, and secret_info and secret_data are stored
+    per secret of the job, so that task messages carry only task_options and the
+    reference to the context (domain_id, job_id and secret_id).
+    Job context keeps secret_ids of the job, so that all keys are deleted directly.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.context_ttl = config.get_global("COLLECTING_JOB_CONTEXT_TTL", 0)
+
+    def is_enabled(self) -> bool:
+        return cache.is_set() and self.context_ttl > 0
+
+    def save_job_context(
+        self, job_id: str, domain_id: str, task: dict, secret_ids: List[str]
+    ) -> None:
+        job_context = {key: task.get(key) for key in _JOB_CONTEXT_FIELDS}
+        job_context["secret_ids"] = secret_ids
+
+        cache.set(
+            _JOB_CONTEXT_KEY.format(domain_id=domain_id, job_id=job_id),
+            job_context,
+            expire=self.context_ttl,
+        )
+
+    def save_secret_context(
+        self, job_id: str, secret_id: str, domain_id: str, task: dict
+    ) -> None:
+        cache.set(
+            _SECRET_CONTEXT_KEY.format(
+                domain_id=domain_id, job_id=job_id, secret_id=secret_id
+            ),
+            {key: task.get(key) for key in _SECRET_CONTEXT_FIELDS},
+            expire=self.context_ttl,
+        )
+
+    @staticmethod
+    def make_reference(task: dict) -> dict:
+        reference = {
+            key: value
+            for key, value in task.items()
+            if key not in _JOB_CONTEXT_FIELDS + _SECRET_CONTEXT_FIELDS
+        }
+        reference["secret_id"] = task["secret_info"]["secret_id"]
+        reference["use_job_context"] = True
+        return reference
+
+    @staticmethod
+    def load_context(params: dict) -> dict:
+        """Fill params of collecting task from job context
+
+        Returns:
+            params (dict): params with plugin_info, secret_info and secret_data
+        """
+
+        job_id = params["job_id"]
+        job_task_id = params["job_task_id"]
+        secret_id = params.get("secret_id")
+        domain_id = params["domain_id"]
+
+        job_context = None
+        secret_context = None
+
+        if cache.is_set():
+            job_context = cache.get(
+                _JOB_CONTEXT_KEY.format(domain_id=domain_id, job_id=job_id)
+            )
+            secret_context = cache.get(
+                _SECRET_CONTEXT_KEY.format(
+                    domain_id=domain_id, job_id=job_id, secret_id=secret_id
+                )
+            )
+
+        if job_context is None or secret_context is None:
+            raise ERROR_JOB_CONTEXT_NOT_FOUND(job_id=job_id, job_task_id=job_task_id)
+
+        return {
+            **params,
+            **{key: job_context.get(key) for key in _JOB_CONTEXT_FIELDS},
+            **secret_context,
+        }
+
+    @staticmethod
+    def delete_job_context(job_id: str, domain_id: str) -> None:
+        if not cache.is_set():
+            return None
+
+        job_context_key = _JOB_CONTEXT_KEY.format(domain_id=domain_id, job_id=job_id)
+        job_context = cache.get(job_context_key)
+
+        # keys are deleted directly without scanning keys of cache
+        keys = [job_context_key]
+        if job_context:
+            keys += [
+                _SECRET_CONTEXT_KEY.format(
+                    domain_id=domain_id, job_id=job_id, secret_id=secret_id
+                )
+                for secret_id in job_context.get("secret_ids", [])
+            ]
+
+        cache.delete(*keys)
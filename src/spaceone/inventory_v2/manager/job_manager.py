@@ -1,10 +1,13 @@
 import logging
-from typing import Tuple, List
+from typing import Tuple, List, Union
 from datetime import datetime, timedelta
-from spaceone.core import cache, config
+from pymongo import ReturnDocument
+from spaceone.core import cache, config, queue, utils
 from spaceone.core.manager import BaseManager
 from spaceone.core.model.mongo_model import QuerySet
 from spaceone.inventory_v2.error import *
+from spaceone.inventory_v2.lib import cursor_pagination, task_queue
+from spaceone.inventory_v2.manager.job_context_manager import JobContextManager
 from spaceone.inventory_v2.manager.metric_data_manager import MetricDataManager
 from spaceone.inventory_v2.manager.metric_manager import MetricManager
 from spaceone.inventory_v2.model import JobTask
@@ -51,6 +54,35 @@ class JobManager(BaseManager):
 
         return self.job_model.create(job_params)
 
+    def push_planning_task(self, params: dict) -> None:
+        task = self._make_planning_task(params)
+        queue.put("inventory_q", utils.dump_json(task))
+
+    def _make_planning_task(self, params: dict) -> dict:
+        # planning is authorized with the same token as the collect request
+        metadata = {"token": self.transaction.meta.get("token")}
+        for key in ["x_domain_id", "x_workspace_id"]:
+            if value := self.transaction.meta.get(key):
+                metadata[key] = value
+
+        task = {
+            "name": "planning_job",
+            "version": "v1",
+            "executionEngine": "BaseWorker",
+            "stages": [
+                {
+                    "locator": "SERVICE",
+                    "name": "CollectorService",
+                    "metadata": metadata,
+                    "method": "plan_job",
+                    "params": {"params": params},
+                }
+            ],
+        }
+
+        task_queue.validate_task(task)
+        return task
+
     @staticmethod
     def update_job_by_vo(params: dict, job_vo: Job) -> Job:
         return job_vo.update(params)
@@ -76,26 +108,58 @@ class JobManager(BaseManager):
     def list_jobs(self, query: dict) -> Tuple[QuerySet, int]:
         return self.job_model.query(**query)
 
+    def list_jobs_by_cursor(
+        self, query: dict, cursor: str
+    ) -> Tuple[List[Job], Union[str, None], Union[str, None]]:
+        return cursor_pagination.list_by_cursor([self.job_model], query, cursor)
+
     def analyze_jobs(self, query: dict) -> dict:
         return self.job_model.analyze(**query)
 
     def stat_jobs(self, query: dict) -> dict:
         return self.job_model.stat(**query)
 
-    def increase_success_tasks(self, job_id: str, domain_id: str) -> None:
-        job_vo: Job = self.get_job(job_id, domain_id)
-        job_vo.increment("success_tasks")
-        self.decrease_remained_tasks_by_vo(job_vo)
+    def increase_success_tasks(
+        self, job_id: str, domain_id: str, changed_count_info: dict = None
+    ) -> None:
+        self._decrease_remained_tasks(
+            job_id, domain_id, "success_tasks", changed_count_info
+        )
 
-    def increase_failure_tasks(self, job_id: str, domain_id: str) -> None:
-        job_vo: Job = self.get_job(job_id, domain_id)
-        job_vo.increment("failure_tasks")
-        self.decrease_remained_tasks_by_vo(job_vo)
+    def increase_failure_tasks(
+        self, job_id: str, domain_id: str, changed_count_info: dict = None
+    ) -> None:
+        self._decrease_remained_tasks(
+            job_id, domain_id, "failure_tasks", changed_count_info
+        )
 
-    def decrease_remained_tasks_by_vo(self, job_vo: Job) -> None:
-        job_vo = job_vo.decrement("remained_tasks")
+    def _decrease_remained_tasks(
+        self,
+        job_id: str,
+        domain_id: str,
+        result_key: str,
+        changed_count_info: dict = None,
+    ) -> None:
+        # result and changed counts of job task are added in one write
+        increment_data = {
+            key: value
+            for key, value in (changed_count_info or {}).items()
+            if isinstance(value, int) and value > 0
+        }
+        increment_data[result_key] = 1
+        increment_data["remained_tasks"] = -1
+
+        job_data = self.job_model._get_collection().find_one_and_update(
+            {"job_id": job_id, "domain_id": domain_id},
+            {"$inc": increment_data, "$set": {"updated_at": datetime.utcnow()}},
+            projection=["remained_tasks"],
+            return_document=ReturnDocument.AFTER,
+        )
+
+        if job_data and job_data["remained_tasks"] == 0:
+            job_vo: Job = self.get_job(job_id, domain_id)
+            JobContextManager.delete_job_context(job_id, domain_id)
 
-        if job_vo.remained_tasks == 0:
             if job_vo.status == "IN_PROGRESS":
                 if job_vo.failure_tasks > 0:
                     self.make_failure_by_vo(job_vo)
@@ -105,20 +169,14 @@ class JobManager(BaseManager):
             if self._is_changed(job_vo):
                 self._run_metric_queries(job_vo.plugin_id, job_vo.domain_id)
 
-    def _is_changed(self, job_vo: Job) -> bool:
-        job_task_vos: List[JobTask] = self.job_task_model.filter(
-            job_id=job_vo.job_id, domain_id=job_vo.domain_id
+    @staticmethod
+    def _is_changed(job_vo: Job) -> bool:
+        # changed counts are rolled up onto job by job tasks
+        is_changed = (
+            job_vo.created_count > 0
+            or job_vo.updated_count > 0
+            or job_vo.deleted_count > 0
         )
-        is_changed = False
-
-        for job_task_vo in job_task_vos:
-            if (
-                job_task_vo.created_count > 0
-                or job_task_vo.updated_count > 0
-                or job_task_vo.deleted_count > 0
-            ):
-                is_changed = True
-                break
 
         _LOGGER.debug(
             f"[_is_changed] job_id: {job_vo.job_id}, is_changed: {is_changed}"
@@ -181,7 +239,7 @@ class JobManager(BaseManager):
             "filter": [
                 {"k": "domain_id", "v": domain_id, "o": "eq"},
                 {"k": "created_at", "v": created_at, "o": "lt"},
-                {"k": "status", "v": "IN_PROGRESS", "o": "eq"},
+                {"k": "status", "v": ["PLANNING", "IN_PROGRESS"], "o": "in"},
             ]
         }
 
@@ -208,7 +266,7 @@ class JobManager(BaseManager):
             "filter": [
                 {"k": "domain_id", "v": domain_id, "o": "eq"},
                 {"k": "collector_id", "v": collector_id, "o": "eq"},
-                {"k": "status", "v": "IN_PROGRESS", "o": "eq"},
+                {"k": "status", "v": ["PLANNING", "IN_PROGRESS"], "o": "in"},
                 {
                     "k": "request_workspace_id",
                     "v": changed_request_workspace_id,
@@ -227,6 +285,32 @@ class JobManager(BaseManager):
     def make_failure_by_vo(self, job_vo: Job) -> None:
         self._update_job_status_by_vo(job_vo, "FAILURE")
 
+    def make_in_progress_from_planning(
+        self, job_id: str, domain_id: str, total_tasks: int
+    ) -> Union[Job, None]:
+        # status is changed only if the job is still in PLANNING (not canceled)
+        job_data = self.job_model._get_collection().find_one_and_update(
+            {"job_id": job_id, "domain_id": domain_id, "status": "PLANNING"},
+            {
+                "$set": {
+                    "status": "IN_PROGRESS",
+                    "total_tasks": total_tasks,
+                    "remained_tasks": total_tasks,
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+            projection=["job_id"],
+        )
+
+        if job_data is None:
+            return None
+
+        _LOGGER.debug(
+            f"[make_in_progress_from_planning] job_id: {job_id}, "
+            f"total_tasks: {total_tasks}"
+        )
+        return self.get_job(job_id, domain_id)
+
     def make_canceled_by_vo(self, job_vo: Job) -> None:
         _LOGGER.debug(f"[make_canceled_by_vo] cancel job: {job_vo.job_id}")
         self._update_job_status_by_vo(job_vo, "CANCELED")
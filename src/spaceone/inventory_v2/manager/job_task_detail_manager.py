@@ -1,9 +1,11 @@
 import logging
-from typing import Tuple
+from typing import List, Tuple
 
+from pymongo import InsertOne
 from spaceone.core.manager import BaseManager
 from spaceone.core.model.mongo_model import QuerySet
 
+from spaceone.inventory_v2.lib import bulk_writer
 from spaceone.inventory_v2.model.job_task.database import JobTask, JobTaskDetail
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,6 +32,27 @@ class JobTaskDetailManager(BaseManager):
 
         return job_task_detail_vo
 
+    def create_job_task_details(self, job_task_ids: List[str], job_id: str) -> None:
+        def _rollback(_job_task_ids: List[str]):
+            _LOGGER.info(
+                f"[ROLLBACK] Delete job task details: {len(_job_task_ids)} details"
+            )
+            self.job_task_detail_model.filter(job_task_id=_job_task_ids).delete()
+
+        documents = [
+            bulk_writer.make_document(
+                self.job_task_detail_model,
+                {"job_task_id": job_task_id, "job_id": job_id},
+            )
+            for job_task_id in job_task_ids
+        ]
+        bulk_writer.bulk_write(
+            self.job_task_detail_model,
+            [InsertOne(document) for document in documents],
+        )
+
+        self.transaction.add_rollback(_rollback, job_task_ids)
+
     def get_job_task_detail(
         self,
         job_task_id: str,
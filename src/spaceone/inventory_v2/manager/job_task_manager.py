@@ -1,25 +1,48 @@
 import logging
-from typing import Tuple, Union
-from jsonschema import validate
+from typing import List, Tuple, Union
 from datetime import datetime
 
+from pymongo import InsertOne, ReturnDocument
 from spaceone.core import config, queue, utils
 from spaceone.core.manager import BaseManager
-from spaceone.core.scheduler.task_schema import SPACEONE_TASK_SCHEMA
 from spaceone.core.model.mongo_model import QuerySet
 
+from spaceone.inventory_v2.conf.collector_conf import (
+    ERROR_FLUSH_SIZE,
+    MAX_ERROR_SAMPLES,
+    MAX_ERROR_TYPES,
+    MAX_MESSAGE_LENGTH,
+)
+from spaceone.inventory_v2.lib import bulk_writer, cursor_pagination, task_queue
 from spaceone.inventory_v2.manager.cleanup_manager import CleanupManager
+from spaceone.inventory_v2.manager.concurrency_manager import ConcurrencyManager
 from spaceone.inventory_v2.manager.job_manager import JobManager
 from spaceone.inventory_v2.model.job_task.database import JobTask, JobTaskDetail
 
 _LOGGER = logging.getLogger(__name__)
 
+_COLLECTING_COUNT_FIELDS = [
+    "created_count",
+    "updated_count",
+    "deleted_count",
+    "disconnected_count",
+    "failure_count",
+    "skipped_count",
+    "total_count",
+]
+_CHANGED_COUNT_FIELDS = ["created_count", "updated_count", "deleted_count"]
+_JOB_TASK_PROGRESS_FIELDS = ["status", "remained_sub_tasks"] + _CHANGED_COUNT_FIELDS
+# error of the types which are not saved since the job task has MAX_ERROR_TYPES
+_OVERFLOW_ERROR_CODE = "ERROR_TOO_MANY_ERROR_TYPES"
+
 
 class JobTaskManager(BaseManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.job_task_model = JobTask
         self.job_task_detail_model = JobTaskDetail
+        self._error_buffer = {}
+        self._buffered_error_count = 0
 
     def create_job_task(self, params: dict) -> JobTask:
         def _rollback(vo: JobTask):
@@ -30,6 +53,36 @@ class JobTaskManager(BaseManager):
         self.transaction.add_rollback(_rollback, job_task_vo)
         return job_task_vo
 
+    def create_job_tasks(self, params_list: List[dict]) -> List[Union[str, None]]:
+        """Create job tasks with one round trip
+
+        Returns:
+            job_task_ids (list): job_task_id of each params (None, if it is failed)
+        """
+
+        def _rollback(job_task_ids: List[str]):
+            _LOGGER.info(f"[ROLLBACK] Delete job tasks: {len(job_task_ids)} job tasks")
+            self.job_task_model.filter(job_task_id=job_task_ids).delete()
+
+        documents = [
+            bulk_writer.make_document(self.job_task_model, params)
+            for params in params_list
+        ]
+        failures = bulk_writer.bulk_write(
+            self.job_task_model, [InsertOne(document) for document in documents]
+        )
+
+        job_task_ids = [
+            None if index in failures else document["job_task_id"]
+            for index, document in enumerate(documents)
+        ]
+
+        self.transaction.add_rollback(
+            _rollback, [job_task_id for job_task_id in job_task_ids if job_task_id]
+        )
+
+        return job_task_ids
+
     def create_job_task_detail(self, job_task_vo: JobTask) -> JobTaskDetail:
         def _rollback(vo: JobTaskDetail):
             _LOGGER.info(f"[ROLLBACK] Delete job task detail: {vo.job_task_id}")
@@ -70,10 +123,36 @@ class JobTaskManager(BaseManager):
     def list(self, query: dict) -> Tuple[QuerySet, int]:
         return self.job_task_model.query(**query)
 
+    def list_by_cursor(
+        self, query: dict, cursor: str
+    ) -> Tuple[List[JobTask], Union[str, None], Union[str, None]]:
+        return cursor_pagination.list_by_cursor([self.job_task_model], query, cursor)
+
     def stat(self, query: dict) -> dict:
         return self.job_task_model.stat(**query)
 
     def push_job_task(self, params: dict) -> None:
+        task = self._make_collecting_task(params)
+        queue.put("inventory_q", utils.dump_json(task))
+
+    def push_job_tasks(self, params_list: List[dict]) -> None:
+        tasks = [
+            utils.dump_json(self._make_collecting_task(params))
+            for params in params_list
+        ]
+        task_queue.put_tasks("inventory_q", tasks)
+
+    def defer_job_task(self, params: dict, delay: int) -> None:
+        task = self._make_collecting_task(params)
+
+        concurrency_mgr: ConcurrencyManager = self.locator.get_manager(
+            ConcurrencyManager
+        )
+        concurrency_mgr.defer_task(
+            params["job_id"], params["collector_id"], task, delay
+        )
+
+    def _make_collecting_task(self, params: dict) -> dict:
         token = self.transaction.meta.get("token")
         params["token"] = token
         task = {
@@ -91,24 +170,162 @@ class JobTaskManager(BaseManager):
             ],
         }
 
-        validate(task, schema=SPACEONE_TASK_SCHEMA)
-        queue.put("inventory_q", utils.dump_json(task))
+        task_queue.validate_task(task)
+        return task
 
-    @staticmethod
     def add_error(
+        self,
         job_task_vo: JobTask,
         error_code: str,
         error_message: str,
         additional: dict = None,
     ) -> None:
-        error_info = {"error_code": error_code, "message": str(error_message).strip()}
+        """Buffer an error of job task
+        Errors are aggregated by (error_code, resource_type) with count and
+        sample messages, and saved by flush_errors().
+        """
+
+        message = str(error_message).strip()[:MAX_MESSAGE_LENGTH]
+        additional = additional or {}
+        key = (job_task_vo.job_task_id, error_code, additional.get("resource_type"))
+
+        if key not in self._error_buffer:
+            self._error_buffer[key] = {
+                "job_task_vo": job_task_vo,
+                "error_code": error_code,
+                "additional": additional,
+                "count": 0,
+                "messages": [],
+            }
+
+        error_info = self._error_buffer[key]
+        error_info["count"] += 1
+
+        if len(error_info["messages"]) < MAX_ERROR_SAMPLES:
+            error_info["messages"].append(message)
+            _LOGGER.error(
+                f"[add_error] {job_task_vo.job_task_id}: {error_code} => {message}"
+            )
+        else:
+            _LOGGER.debug(
+                f"[add_error] {job_task_vo.job_task_id}: {error_code} => {message}"
+            )
+
+        self._buffered_error_count += 1
+        if self._buffered_error_count >= ERROR_FLUSH_SIZE:
+            self.flush_errors()
+
+    def flush_errors(self) -> None:
+        error_buffer = self._error_buffer
+        self._error_buffer = {}
+        self._buffered_error_count = 0
+
+        for error_info in error_buffer.values():
+            job_task_vo = error_info["job_task_vo"]
+            try:
+                self._save_error(job_task_vo, error_info)
+            except Exception as e:
+                _LOGGER.error(
+                    f"[flush_errors] failed to save errors ({job_task_vo.job_task_id}): {e}"
+                )
+
+    def _save_error(self, job_task_vo: JobTask, error_info: dict) -> None:
+        collection = self.job_task_model._get_collection()
+        error_condition = {
+            "error_code": error_info["error_code"],
+            "additional.resource_type": error_info["additional"].get("resource_type"),
+        }
+        overflow_condition = {"error_code": _OVERFLOW_ERROR_CODE}
+        overflow_messages = {
+            "$each": [
+                f"{error_info['error_code']}: {message}"
+                for message in error_info["messages"]
+            ],
+            "$slice": MAX_ERROR_SAMPLES,
+        }
+        sample_messages = {"$each": error_info["messages"], "$slice": MAX_ERROR_SAMPLES}
+
+        # other sub tasks can add the same error type at the same time
+        for _ in range(2):
+            result = collection.update_one(
+                {"_id": job_task_vo.pk, "errors": {"$elemMatch": error_condition}},
+                {
+                    "$inc": {"errors.$.count": error_info["count"]},
+                    "$push": {"errors.$.messages": sample_messages},
+                },
+            )
+            if result.matched_count > 0:
+                return None
 
-        if additional:
-            error_info["additional"] = additional
+            result = collection.update_one(
+                {
+                    "_id": job_task_vo.pk,
+                    "errors": {"$not": {"$elemMatch": error_condition}},
+                    f"errors.{MAX_ERROR_TYPES - 1}": {"$exists": False},
+                },
+                {
+                    "$push": {
+                        "errors": {
+                            "error_code": error_info["error_code"],
+                            "message": error_info["messages"][0],
+                            "additional": error_info["additional"],
+                            "count": error_info["count"],
+                            "messages": error_info["messages"],
+                        }
+                    }
+                },
+            )
+            if result.matched_count > 0:
+                return None
 
-        job_task_vo.append("errors", error_info)
-        _LOGGER.error(
-            f"[add_error] {job_task_vo.job_task_id}: {error_info}", exc_info=True
+            # error types over MAX_ERROR_TYPES are counted in one overflow entry,
+            # so that counts of errors are not lost
+            result = collection.update_one(
+                {
+                    "_id": job_task_vo.pk,
+                    "$and": [
+                        {"errors": {"$not": {"$elemMatch": error_condition}}},
+                        {"errors": {"$elemMatch": overflow_condition}},
+                    ],
+                },
+                {
+                    "$inc": {"errors.$[overflow].count": error_info["count"]},
+                    "$push": {"errors.$[overflow].messages": overflow_messages},
+                },
+                array_filters=[{"overflow.error_code": _OVERFLOW_ERROR_CODE}],
+            )
+            if result.matched_count > 0:
+                return None
+
+            result = collection.update_one(
+                {
+                    "_id": job_task_vo.pk,
+                    f"errors.{MAX_ERROR_TYPES - 1}": {"$exists": True},
+                    "$and": [
+                        {"errors": {"$not": {"$elemMatch": error_condition}}},
+                        {"errors": {"$not": {"$elemMatch": overflow_condition}}},
+                    ],
+                },
+                {
+                    "$push": {
+                        "errors": {
+                            "error_code": _OVERFLOW_ERROR_CODE,
+                            "message": f"Errors over {MAX_ERROR_TYPES} types.",
+                            "additional": {},
+                            "count": error_info["count"],
+                            "messages": overflow_messages["$each"],
+                        }
+                    }
+                },
+            )
+            if result.matched_count > 0:
+                return None
+
+    @staticmethod
+    def add_pipeline_stats(job_task_vo: JobTask, stages: List[dict]) -> None:
+        job_task_vo.append("pipeline_stats", {"stages": stages})
+        _LOGGER.debug(
+            f"[add_pipeline_stats] {job_task_vo.job_task_id}: {utils.dump_json(stages)}"
         )
 
     @staticmethod
@@ -158,50 +375,105 @@ class JobTaskManager(BaseManager):
         job_task_vo: JobTask,
         collecting_count_info: dict = None,
     ) -> None:
-        self._update_job_status_by_vo(
-            job_task_vo,
-            "FAILURE",
-            finished_at=datetime.utcnow(),
+        _LOGGER.debug(
+            f"[update_job_status] collector_id: {job_task_vo.collector_id}, "
+            f"job_task_id: {job_task_vo.job_task_id}, status: FAILURE"
         )
 
-        self.decrease_remained_sub_tasks(job_task_vo, collecting_count_info)
+        # status is updated with the remained sub tasks in one write
+        self.decrease_remained_sub_tasks(
+            job_task_vo,
+            collecting_count_info,
+            {"status": "FAILURE", "finished_at": datetime.utcnow()},
+        )
 
     def decrease_remained_sub_tasks(
-        self, job_task_vo: JobTask, collecting_count_info: dict = None
-    ) -> JobTask:
-        if collecting_count_info:
-            self._update_collecting_count_info(job_task_vo, collecting_count_info)
+        self,
+        job_task_vo: JobTask,
+        collecting_count_info: dict = None,
+        update_data: dict = None,
+    ) -> dict:
+        """Decrease remained_sub_tasks and increase collecting counts atomically
+
+        Returns:
+            job_task_data (dict): job task document after update
+        """
 
-        job_task_vo: JobTask = job_task_vo.decrement("remained_sub_tasks")
-        if job_task_vo.remained_sub_tasks == 0:
+        # errors of sub task are saved before the job task is finished
+        self.flush_errors()
+
+        increment_data = self._make_collecting_count_increment(collecting_count_info)
+        increment_data["remained_sub_tasks"] = -1
+
+        job_task_data = self._find_and_update_job_task(
+            job_task_vo, increment_data, update_data
+        )
+
+        if job_task_data["remained_sub_tasks"] == 0:
             job_mgr: JobManager = self.locator.get_manager(JobManager)
-            if job_task_vo.status == "IN_PROGRESS":
+            if job_task_data["status"] == "IN_PROGRESS":
                 deleted_resources_info = self._update_disconnected_and_deleted_count(
                     job_task_vo
                 )
-                self._update_collecting_count_info(job_task_vo, deleted_resources_info)
 
-                self.make_success_by_vo(job_task_vo)
+                _LOGGER.debug(
+                    f"[update_job_status] collector_id: {job_task_vo.collector_id}, "
+                    f"job_task_id: {job_task_vo.job_task_id}, status: SUCCESS"
+                )
+                job_task_data = self._find_and_update_job_task(
+                    job_task_vo,
+                    self._make_collecting_count_increment(deleted_resources_info),
+                    {"status": "SUCCESS", "finished_at": datetime.utcnow()},
+                )
+
                 job_mgr.increase_success_tasks(
-                    job_task_vo.job_id, job_task_vo.domain_id
+                    job_task_vo.job_id,
+                    job_task_vo.domain_id,
+                    self._get_changed_count_info(job_task_data),
                 )
             else:
                 job_mgr.increase_failure_tasks(
-                    job_task_vo.job_id, job_task_vo.domain_id
+                    job_task_vo.job_id,
+                    job_task_vo.domain_id,
+                    self._get_changed_count_info(job_task_data),
                 )
 
-        return job_task_vo
+        return job_task_data
+
+    def _find_and_update_job_task(
+        self, job_task_vo: JobTask, increment_data: dict, update_data: dict = None
+    ) -> dict:
+        update_data = update_data or {}
+        update_data["updated_at"] = datetime.utcnow()
+
+        update = {"$set": update_data}
+        if increment_data:
+            update["$inc"] = increment_data
 
-    @staticmethod
-    def _update_collecting_count_info(
-        job_task_vo: JobTask, collecting_count_info: dict
-    ) -> None:
         _LOGGER.debug(
-            f"[_update_collecting_count_info] update collecting count => {utils.dump_json(collecting_count_info)}"
+            f"[_find_and_update_job_task] update job task ({job_task_vo.job_task_id}) "
+            f"=> {utils.dump_json(increment_data)}"
         )
-        for key, value in collecting_count_info.items():
-            if isinstance(value, int) and value > 0:
-                job_task_vo.increment(key, value)
+
+        return self.job_task_model._get_collection().find_one_and_update(
+            {"_id": job_task_vo.pk},
+            update,
+            projection=_JOB_TASK_PROGRESS_FIELDS,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @staticmethod
+    def _make_collecting_count_increment(collecting_count_info: dict = None) -> dict:
+        return {
+            key: value
+            for key, value in (collecting_count_info or {}).items()
+            if key in _COLLECTING_COUNT_FIELDS and isinstance(value, int) and value > 0
+        }
+
+    @staticmethod
+    def _get_changed_count_info(job_task_data: dict) -> dict:
+        # counts of job task are rolled up onto job when job task is finished
+        return {key: job_task_data.get(key, 0) for key in _CHANGED_COUNT_FIELDS}
 
     @staticmethod
     def _update_disconnected_and_deleted_count(job_task_vo: JobTask) -> dict:
@@ -212,6 +484,7 @@ class JobTaskManager(BaseManager):
                 job_task_vo.secret_id,
                 job_task_vo.job_task_id,
                 job_task_vo.domain_id,
+                job_task_vo.collection_generation,
             )
         except Exception as e:
             _LOGGER.error(f"[_update_collection_state] failed: {e}")
@@ -1,11 +1,12 @@
 import logging
-from typing import Tuple
+from typing import List, Tuple, Union
 from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
 
 from spaceone.core.model.mongo_model import QuerySet
 from spaceone.core.manager import BaseManager
-from spaceone.core import utils, cache
+from spaceone.core import utils
+from spaceone.inventory_v2.lib import cursor_pagination, near_cache
 from spaceone.inventory_v2.model.metric_data.database import (
     MetricData,
     MonthlyMetricData,
@@ -50,8 +51,10 @@ class MetricDataManager(BaseManager):
         )
         monthly_metric_data_vos.delete()
 
-        cache.delete_pattern(f"inventory:metric-data:*:{domain_id}:{metric_id}:*")
-        cache.delete_pattern(f"inventory:metric-query-history:{domain_id}:{metric_id}")
+        near_cache.delete_pattern(f"inventory:metric-data:*:{domain_id}:{metric_id}:*")
+        near_cache.delete_pattern(
+            f"inventory:metric-query-history:{domain_id}:{metric_id}"
+        )
 
     def filter_metric_data(self, **conditions) -> QuerySet:
         return self.metric_data_model.filter(**conditions)
@@ -65,6 +68,14 @@ class MetricDataManager(BaseManager):
 
         return self.metric_data_model.query(**query)
 
+    def list_metric_data_by_cursor(
+        self, query: dict, cursor: str, status: str = None
+    ) -> Tuple[List[MetricData], Union[str, None], Union[str, None]]:
+        if status != "IN_PROGRESS":
+            query = self._append_status_filter(query)
+
+        return cursor_pagination.list_by_cursor([self.metric_data_model], query, cursor)
+
     def list_monthly_metric_data(
         self, query: dict, status: str = None
     ) -> Tuple[QuerySet, int]:
@@ -124,7 +135,7 @@ class MetricDataManager(BaseManager):
         _LOGGER.debug(f"[analyze_yearly_metric_data] Query: {query}")
         return self.monthly_metric_data.analyze(**query)
 
-    @cache.cacheable(
+    @near_cache.cacheable(
         key="inventory:metric-data:daily:{domain_id}:{metric_id}:{query_hash}",
         expire=3600 * 24,
     )
@@ -138,7 +149,7 @@ class MetricDataManager(BaseManager):
     ) -> dict:
         return self.analyze_metric_data(query, target)
 
-    @cache.cacheable(
+    @near_cache.cacheable(
         key="inventory:metric-data:monthly:{domain_id}:{metric_id}:{query_hash}",
         expire=3600 * 24,
     )
@@ -152,7 +163,7 @@ class MetricDataManager(BaseManager):
     ) -> dict:
         return self.analyze_monthly_metric_data(query, target)
 
-    @cache.cacheable(
+    @near_cache.cacheable(
         key="inventory:metric-data:yearly:{domain_id}:{metric_id}:{query_hash}",
         expire=3600 * 24,
     )
@@ -194,7 +205,7 @@ class MetricDataManager(BaseManager):
     def list_metric_query_history(self, query: dict) -> Tuple[QuerySet, int]:
         return self.history_model.query(**query)
 
-    @cache.cacheable(
+    @near_cache.cacheable(
         key="inventory:metric-query-history:{domain_id}:{metric_id}",
         expire=600,
     )
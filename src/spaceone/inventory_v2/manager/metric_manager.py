@@ -8,7 +8,8 @@ from dateutil.relativedelta import relativedelta
 from spaceone.core import config, queue
 from spaceone.core.model.mongo_model import QuerySet
 from spaceone.core.manager import BaseManager
-from spaceone.core import utils, cache
+from spaceone.core import utils
+from spaceone.inventory_v2.lib import near_cache
 from spaceone.inventory_v2.error.metric import (
     ERROR_NOT_SUPPORT_RESOURCE_TYPE,
     ERROR_METRIC_QUERY_RUN_FAILED,
@@ -327,7 +328,7 @@ class MetricManager(BaseManager):
         )
         return response.get("results", [])
 
-    @cache.cacheable(key="inventory:managed-metric:{domain_id}:sync", expire=300)
+    @near_cache.cacheable(key="inventory:managed-metric:{domain_id}:sync", expire=300)
     def create_managed_metric(self, domain_id: str) -> bool:
         managed_resource_mgr = ManagedResourceManager()
 
@@ -647,8 +648,10 @@ class MetricManager(BaseManager):
 
     @staticmethod
     def _delete_analyze_cache(domain_id: str, metric_id: str) -> None:
-        cache.delete_pattern(f"inventory:metric-data:*:{domain_id}:{metric_id}:*")
-        cache.delete_pattern(f"inventory:metric-query-history:{domain_id}:{metric_id}")
+        near_cache.delete_pattern(f"inventory:metric-data:*:{domain_id}:{metric_id}:*")
+        near_cache.delete_pattern(
+            f"inventory:metric-query-history:{domain_id}:{metric_id}"
+        )
 
     @staticmethod
     def _get_labels_info(query_options: dict) -> list:
@@ -1,20 +1,27 @@
 import logging
 from typing import Tuple
 
-from spaceone.core import config
+from spaceone.core import cache, config
 from spaceone.core.manager import BaseManager
-from spaceone.core.connector.space_connector import SpaceConnector
+from spaceone.inventory_v2.connector.pooled_space_connector import (
+    PooledSpaceConnector,
+)
+from spaceone.inventory_v2.error.collector import *
 
 __ALL__ = ["PluginManager"]
 
 _LOGGER = logging.getLogger(__name__)
 
+_ENDPOINT_CACHE_KEY = (
+    "inventory-v2:plugin-endpoint:{domain_id}:{plugin_id}:{version}:{upgrade_mode}"
+)
+
 
 class PluginManager(BaseManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.plugin_connector: SpaceConnector = self.locator.get_connector(
-            SpaceConnector, service="plugin"
+        self.plugin_connector: PooledSpaceConnector = self.locator.get_connector(
+            PooledSpaceConnector, service="plugin"
         )
 
     def get_endpoint(
@@ -24,17 +31,66 @@ class PluginManager(BaseManager):
         upgrade_mode: str = "AUTO",
         version: str = None,
     ) -> Tuple[str, str]:
+        cache_key = _ENDPOINT_CACHE_KEY.format(
+            domain_id=domain_id,
+            plugin_id=plugin_id,
+            version=version,
+            upgrade_mode=upgrade_mode,
+        )
+
+        if cache.is_set():
+            if endpoint_info := cache.get(cache_key):
+                if error_message := endpoint_info.get("error_message"):
+                    raise ERROR_PLUGIN_ENDPOINT(
+                        plugin_id=plugin_id, reason=error_message
+                    )
+
+                return endpoint_info["endpoint"], endpoint_info["updated_version"]
+
         system_token = config.get_global("TOKEN")
 
-        response = self.plugin_connector.dispatch(
-            "Plugin.get_plugin_endpoint",
-            {
-                "plugin_id": plugin_id,
-                "domain_id": domain_id,
-                "upgrade_mode": upgrade_mode,
-                "version": version,
-            },
-            token=system_token,
-        )
+        try:
+            response = self.plugin_connector.dispatch(
+                "Plugin.get_plugin_endpoint",
+                {
+                    "plugin_id": plugin_id,
+                    "domain_id": domain_id,
+                    "upgrade_mode": upgrade_mode,
+                    "version": version,
+                },
+                token=system_token,
+            )
+        except Exception as e:
+            if cache.is_set():
+                # sub tasks of a failed plugin do not call plugin service again
+                error_message = e.message if isinstance(e, ERROR_BASE) else str(e)
+                cache.set(
+                    cache_key,
+                    {"error_message": error_message},
+                    expire=config.get_global("PLUGIN_ENDPOINT_ERROR_CACHE_TTL", 10),
+                )
+            raise e
+
+        endpoint = response.get("endpoint")
+        updated_version = response.get("updated_version")
+
+        if cache.is_set():
+            cache.set(
+                cache_key,
+                {"endpoint": endpoint, "updated_version": updated_version},
+                expire=config.get_global("PLUGIN_ENDPOINT_CACHE_TTL", 60),
+            )
+
+        return endpoint, updated_version
 
-        return response.get("endpoint"), response.get("updated_version")
+    @staticmethod
+    def delete_endpoint_cache(plugin_id: str, domain_id: str) -> None:
+        if cache.is_set():
+            cache.delete_pattern(
+                _ENDPOINT_CACHE_KEY.format(
+                    domain_id=domain_id,
+                    plugin_id=plugin_id,
+                    version="*",
+                    upgrade_mode="*",
+                )
+            )
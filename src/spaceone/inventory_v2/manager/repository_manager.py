@@ -1,7 +1,9 @@
 import logging
 
 from spaceone.core.manager import BaseManager
-from spaceone.core.connector.space_connector import SpaceConnector
+from spaceone.inventory_v2.connector.pooled_space_connector import (
+    PooledSpaceConnector,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -9,8 +11,8 @@ _LOGGER = logging.getLogger(__name__)
 class RepositoryManager(BaseManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.repo_connector: SpaceConnector = self.locator.get_connector(
-            "SpaceConnector", service="repository"
+        self.repo_connector: PooledSpaceConnector = self.locator.get_connector(
+            PooledSpaceConnector, service="repository"
         )
 
     def get_plugin(self, plugin_id: str) -> dict:
@@ -2,9 +2,12 @@ import logging
 
 from spaceone.core import config
 from spaceone.core.manager import BaseManager
-from spaceone.core.connector.space_connector import SpaceConnector
 from spaceone.core.auth.jwt.jwt_util import JWTUtil
 
+from spaceone.inventory_v2.connector.pooled_space_connector import (
+    PooledSpaceConnector,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -14,8 +17,8 @@ class SecretManager(BaseManager):
         token = self.transaction.get_meta("token")
         self.token_type = JWTUtil.get_value_from_token(token, "typ")
 
-        self.secret_connector: SpaceConnector = self.locator.get_connector(
-            SpaceConnector, service="secret"
+        self.secret_connector: PooledSpaceConnector = self.locator.get_connector(
+            PooledSpaceConnector, service="secret"
         )
 
     def get_secret(self, secret_id: str, domain_id: str) -> dict:
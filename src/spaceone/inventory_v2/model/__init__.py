@@ -3,7 +3,10 @@ from spaceone.inventory_v2.model.asset_type.database import AssetType
 from spaceone.inventory_v2.model.region.database import Region
 from spaceone.inventory_v2.model.collector.database import Collector
 from spaceone.inventory_v2.model.collector_rule.database import CollectorRule
-from spaceone.inventory_v2.model.collection_state.database import CollectionState
+from spaceone.inventory_v2.model.collection_state.database import (
+    CollectionState,
+    CollectionGeneration,
+)
 from spaceone.inventory_v2.model.namespace.database import Namespace
 from spaceone.inventory_v2.model.namespace_group.database import NamespaceGroup
 from spaceone.inventory_v2.model.metric.database import Metric
@@ -11,4 +14,4 @@ from spaceone.inventory_v2.model.metric_data.database import MetricData
 from spaceone.inventory_v2.model.metric_example.database import MetricExample
 from spaceone.inventory_v2.model.job.database import Job
 from spaceone.inventory_v2.model.job_task.database import JobTask, JobTaskDetail
-from spaceone.inventory_v2.model.asset.database import History
+from spaceone.inventory_v2.model.asset.database import History, HistoryArchive
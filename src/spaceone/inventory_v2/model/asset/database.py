@@ -28,6 +28,7 @@ class History(MongoModel):
     updated_by = StringField(max_length=40, choices=("COLLECTOR", "USER"))
     collector_id = StringField(max_length=40, default=None, null=True)
     job_id = StringField(max_length=40, default=None, null=True)
+    job_task_id = StringField(max_length=40, default=None, null=True)
     user_id = StringField(max_length=255, default=None, null=True)
     project_id = StringField(max_length=40)
     workspace_id = StringField(max_length=40)
@@ -44,6 +45,7 @@ class History(MongoModel):
             "user_id",
             "collector_id",
             "job_id",
+            "job_task_id",
         ],
         "ordering": ["-created_at"],
         "indexes": [
@@ -54,7 +56,56 @@ class History(MongoModel):
             {"fields": ["domain_id", "history_id"], "name": "COMPOUND_INDEX_FOR_GET"},
             "collector_id",
             "job_id",
+            "job_task_id",
             "domain_id",
+            "created_at",
+        ],
+    }
+
+
+class HistoryArchive(MongoModel):
+    """
+    Histories older than HISTORY_HOT_DAYS are moved from History by HistoryManager.
+    Large values of diff are compressed, and histories are removed by created_month.
+    """
+
+    history_id = StringField(max_length=40, unique=True)
+    asset_id = StringField(max_length=40, required=True)
+    action = StringField(
+        max_length=20, choices=("CREATE", "UPDATE", "DELETE"), required=True
+    )
+    diff = ListField(EmbeddedDocumentField(HistoryDiff), default=[])
+    diff_count = IntField(default=0)
+    updated_by = StringField(max_length=40, choices=("COLLECTOR", "USER"))
+    collector_id = StringField(max_length=40, default=None, null=True)
+    job_id = StringField(max_length=40, default=None, null=True)
+    job_task_id = StringField(max_length=40, default=None, null=True)
+    user_id = StringField(max_length=255, default=None, null=True)
+    project_id = StringField(max_length=40)
+    workspace_id = StringField(max_length=40)
+    domain_id = StringField(max_length=40)
+    created_month = StringField(max_length=7, required=True)
+    created_at = DateTimeField()
+
+    meta = {
+        "minimal_fields": [
+            "history_id",
+            "action",
+            "diff_count",
+            "asset_id",
+            "updated_by",
+            "user_id",
+            "collector_id",
+            "job_id",
+            "job_task_id",
+        ],
+        "ordering": ["-created_at"],
+        "indexes": [
+            {
+                "fields": ["domain_id", "asset_id", "-created_at"],
+                "name": "COMPOUND_INDEX_FOR_SEARCH",
+            },
+            "created_month",
         ],
     }
 
@@ -82,6 +133,9 @@ class Asset(MongoModel):
     updated_at = DateTimeField(auto_now=True)
     last_collected_at = DateTimeField(default=None, null=True)
     deleted_at = DateTimeField(default=None, null=True)
+    collection_generation = IntField(default=None, null=True)
+    disconnected_count = IntField(default=0)
+    content_hash = StringField(max_length=40, default=None, null=True)
 
     meta = {
         "updatable_fields": [
@@ -100,6 +154,9 @@ class Asset(MongoModel):
             "updated_at",
             "last_collected_at",
             "deleted_at",
+            "content_hash",
+            "collection_generation",
+            "disconnected_count",
         ],
         "minimal_fields": [
             "asset_id",
@@ -190,6 +247,19 @@ class Asset(MongoModel):
                 ],
                 "name": "COMPOUND_INDEX_FOR_SEARCH_4",
             },
+            {
+                "fields": [
+                    "domain_id",
+                    "collector_id",
+                    "secret_id",
+                    "collection_generation",
+                ],
+                "name": "COMPOUND_INDEX_FOR_SWEEP_1",
+            },
+            {
+                "fields": ["domain_id", "collector_id", "-disconnected_count"],
+                "name": "COMPOUND_INDEX_FOR_SWEEP_2",
+            },
             "resource_id",
             "state",
             "workspace_id",
@@ -211,4 +281,6 @@ class Asset(MongoModel):
                 resource_type="Asset", resource_id=self.asset_id
             )
 
-        self.update({"state": "DELETED", "deleted_at": datetime.utcnow()})
+        self.update(
+            {"state": "DELETED", "deleted_at": datetime.utcnow(), "content_hash": None}
+        )
@@ -56,6 +56,7 @@ class AssetGetRequest(BaseModel):
 
 class AssetSearchQueryRequest(BaseModel):
     query: Union[dict, None] = None
+    cursor: Union[str, None] = None
     user_projects: Union[List[str], None] = None
     workspace_id: Union[str, None] = None
     domain_id: str
@@ -63,6 +64,7 @@ class AssetSearchQueryRequest(BaseModel):
 
 class AssetHistorySearchQueryRequest(BaseModel):
     query: Union[dict, None] = None
+    cursor: Union[str, None] = None
     history_id: Union[str, None] = None
     asset_id: str
     action: Union[Action, None] = None
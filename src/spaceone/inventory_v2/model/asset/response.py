@@ -4,6 +4,8 @@ from typing import Union, List, Literal
 from pydantic import BaseModel
 from spaceone.core import utils
 
+from spaceone.inventory_v2.lib import cursor_pagination
+
 __all__ = ["AssetResponse", "AssetsResponse", "AssetHistoriesResponse"]
 
 Action = Literal["CREATE", "UPDATE", "DELETE"]
@@ -19,6 +21,7 @@ class AssetHistoryResponse(BaseModel):
     user_id: Union[str, None]
     collector_id: Union[str, None]
     job_id: Union[str, None]
+    job_task_id: Union[str, None]
     domain_id: Union[str, None]
     created_at: Union[datetime, None]
 
@@ -30,7 +33,13 @@ class AssetHistoryResponse(BaseModel):
 
 class AssetHistoriesResponse(BaseModel):
     results: List[AssetHistoryResponse]
-    total_count: int
+    total_count: Union[int, None] = None
+    next_cursor: Union[str, None] = None
+    prev_cursor: Union[str, None] = None
+
+    def dict(self, *args, **kwargs):
+        data = super().dict(*args, **kwargs)
+        return cursor_pagination.exclude_empty_cursors(data)
 
 
 class AssetResponse(BaseModel):
@@ -61,4 +70,10 @@ class AssetResponse(BaseModel):
 
 class AssetsResponse(BaseModel):
     results: List[AssetResponse]
-    total_count: int
+    total_count: Union[int, None] = None
+    next_cursor: Union[str, None] = None
+    prev_cursor: Union[str, None] = None
+
+    def dict(self, *args, **kwargs):
+        data = super().dict(*args, **kwargs)
+        return cursor_pagination.exclude_empty_cursors(data)
@@ -44,3 +44,22 @@ class CollectionState(MongoModel):
             "asset_id",
         ],
     }
+
+
+class CollectionGeneration(MongoModel):
+    collector_id = StringField(max_length=40)
+    secret_id = StringField(max_length=40)
+    generation = IntField(default=0)
+    domain_id = StringField(max_length=40)
+    updated_at = DateTimeField(auto_now=True)
+
+    meta = {
+        "updatable_fields": ["generation", "updated_at"],
+        "indexes": [
+            {
+                "fields": ["domain_id", "collector_id", "secret_id"],
+                "name": "COMPOUND_INDEX_FOR_GET",
+                "unique": True,
+            },
+        ],
+    }
@@ -9,7 +9,7 @@ __all__ = [
     "JobStatQueryRequest",
 ]
 
-Status = Literal["CANCELED", "IN_PROGRESS", "FAILURE", "SUCCESS"]
+Status = Literal["CANCELED", "PLANNING", "IN_PROGRESS", "FAILURE", "SUCCESS"]
 
 
 class JobDeleteRequest(BaseModel):
@@ -26,6 +26,7 @@ class JobGetRequest(BaseModel):
 
 class JobSearchQueryRequest(BaseModel):
     query: dict
+    cursor: Union[str, None]
     job_id: Union[str, None]
     collector_id: Union[str, None]
     workspace_id: Union[list, str, None]
@@ -4,6 +4,7 @@ from pydantic import BaseModel
 
 from spaceone.core import utils
 
+from spaceone.inventory_v2.lib import cursor_pagination
 from spaceone.inventory_v2.model.job.request import Status
 
 __all__ = ["JobResponse", "JobsResponse"]
@@ -16,6 +17,9 @@ class JobResponse(BaseModel):
     remained_tasks: Union[int, None] = None
     success_tasks: Union[int, None] = None
     failure_tasks: Union[int, None] = None
+    created_count: Union[int, None] = None
+    updated_count: Union[int, None] = None
+    deleted_count: Union[int, None] = None
     collector_id: Union[str, None] = None
     request_secret_id: Union[str, None] = None
     request_workspace_id: Union[str, None] = None
@@ -38,3 +42,9 @@ class JobResponse(BaseModel):
 class JobsResponse(BaseModel):
     results: List[JobResponse]
     total_count: Union[int, None] = None
+    next_cursor: Union[str, None] = None
+    prev_cursor: Union[str, None] = None
+
+    def dict(self, *args, **kwargs):
+        data = super().dict(*args, **kwargs)
+        return cursor_pagination.exclude_empty_cursors(data)
@@ -2,6 +2,17 @@ from mongoengine import *
 from spaceone.core.model.mongo_model import MongoModel
 
 
+class JobTaskError(EmbeddedDocument):
+    error_code = StringField()
+    message = StringField()
+    additional = DictField()
+    count = IntField(default=1)
+    messages = ListField(StringField(), default=[])
+
+    def to_dict(self):
+        return dict(self.to_mongo())
+
+
 class JobTask(MongoModel):
     job_task_id = StringField(max_length=40, generate_id="job-task", unique=True)
     status = StringField(
@@ -16,7 +27,11 @@ class JobTask(MongoModel):
     deleted_count = IntField(default=0)
     disconnected_count = IntField(default=0)
     failure_count = IntField(default=0)
+    skipped_count = IntField(default=0)
     total_count = IntField(default=0)
+    collection_generation = IntField(default=None, null=True)
+    pipeline_stats = ListField(DictField(), default=[])
+    errors = ListField(EmbeddedDocumentField(JobTaskError), default=[])
     job_id = StringField(max_length=40)
     secret_id = StringField(max_length=40)
     collector_id = StringField(max_length=40)
@@ -38,6 +53,7 @@ class JobTask(MongoModel):
             "deleted_count",
             "disconnected_count",
             "failure_count",
+            "skipped_count",
             "started_at",
             "updated_at",
             "finished_at",
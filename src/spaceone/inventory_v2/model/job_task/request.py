@@ -35,6 +35,7 @@ class JobTaskGetDetailRequest(BaseModel):
 
 class JobTaskSearchQueryRequest(BaseModel):
     query: dict
+    cursor: Union[str, None]
     job_task_id: Union[str, None]
     status: Union[Status, None]
     provider: Union[str, None]
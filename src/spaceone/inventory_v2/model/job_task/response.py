@@ -4,6 +4,7 @@ from pydantic import BaseModel
 
 from spaceone.core import utils
 
+from spaceone.inventory_v2.lib import cursor_pagination
 from spaceone.inventory_v2.model.job_task.request import Status
 
 __all__ = ["JobTaskResponse", "JobTasksResponse", "JobTaskDetailResponse"]
@@ -18,6 +19,9 @@ class JobTaskResponse(BaseModel):
     failure_count: Union[int, None] = None
     deleted_count: Union[int, None] = None
     disconnected_count: Union[int, None] = None
+    skipped_count: Union[int, None] = None
+    pipeline_stats: Union[List[dict], None] = None
+    errors: Union[List[dict], None] = None
     job_id: Union[str, None] = None
     secret_id: Union[str, None] = None
     service_account_id: Union[str, None] = None
@@ -60,3 +64,9 @@ class JobTaskDetailResponse(BaseModel):
 class JobTasksResponse(BaseModel):
     results: List[JobTaskResponse]
     total_count: Union[int, None] = None
+    next_cursor: Union[str, None] = None
+    prev_cursor: Union[str, None] = None
+
+    def dict(self, *args, **kwargs):
+        data = super().dict(*args, **kwargs)
+        return cursor_pagination.exclude_empty_cursors(data)
@@ -10,6 +10,7 @@ __all__ = [
 
 class MetricDataSearchQueryRequest(BaseModel):
     query: Union[dict, None] = None
+    cursor: Union[str, None] = None
     metric_id: str
     project_id: Union[str, None] = None
     workspace_id: Union[str, None] = None
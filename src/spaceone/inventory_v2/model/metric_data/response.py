@@ -1,6 +1,8 @@
 from typing import Union, List
 from pydantic import BaseModel
 
+from spaceone.inventory_v2.lib import cursor_pagination
+
 
 __all__ = ["MetricDataResponse", "MetricDatasResponse"]
 
@@ -22,4 +24,10 @@ class MetricDataResponse(BaseModel):
 
 class MetricDatasResponse(BaseModel):
     results: List[MetricDataResponse] = []
-    total_count: int
+    total_count: Union[int, None] = None
+    next_cursor: Union[str, None] = None
+    prev_cursor: Union[str, None] = None
+
+    def dict(self, *args, **kwargs):
+        data = super().dict(*args, **kwargs)
+        return cursor_pagination.exclude_empty_cursors(data)
@@ -7,6 +7,7 @@ from typing import List, Union, Tuple
 from spaceone.core.service import *
 from spaceone.core import utils
 
+from spaceone.inventory_v2.lib.tag_hasher import convert_tags_to_hash
 from spaceone.inventory_v2.manager.asset_manager import AssetManager
 from spaceone.inventory_v2.manager.collection_state_manager import (
     CollectionStateManager,
@@ -85,6 +86,61 @@ class AssetService(BaseService):
     def create_resource(self, params: dict) -> Asset:
         history_mgr = HistoryManager()
 
+        params = self._make_create_params(params)
+        domain_id = params["domain_id"]
+
+        asset_vo = self.asset_mgr.create_asset(params)
+
+        # Create New History
+        history_mgr.add_new_history(asset_vo, params)
+
+        # Create Collection State
+        self.state_mgr.create_collection_state(asset_vo.asset_id, domain_id)
+
+        return asset_vo
+
+    def create_resources(self, params_list: List[dict]) -> List[Union[Exception, None]]:
+        """Create assets collected by collector in bulk
+        Args:
+            params_list (list): list of params for create_resource
+
+        Returns:
+            errors (list): error of each params (None if succeeded)
+        """
+
+        history_mgr = HistoryManager()
+        errors = [None] * len(params_list)
+
+        indexes = []
+        create_params_list = []
+        for index, params in enumerate(params_list):
+            try:
+                create_params_list.append(self._make_create_params(params))
+                indexes.append(index)
+            except Exception as e:
+                errors[index] = e
+
+        failures = self.asset_mgr.create_assets(create_params_list)
+
+        created_params_list = []
+        for create_index, index in enumerate(indexes):
+            if create_index in failures:
+                errors[index] = failures[create_index]
+            else:
+                created_params_list.append(create_params_list[create_index])
+
+        # Create New Histories
+        history_mgr.add_new_histories(created_params_list)
+
+        # Create Collection States
+        for domain_id, asset_ids in self._group_asset_ids_by_domain(
+            created_params_list
+        ).items():
+            self.state_mgr.reset_collection_states(asset_ids, domain_id)
+
+        return errors
+
+    def _make_create_params(self, params: dict) -> dict:
         if json_data := params.get("json_data"):
             params["data"] = utils.load_json(json_data)
             if not isinstance(params["data"], dict):
@@ -134,17 +190,7 @@ class AssetService(BaseService):
                 params["service_account_id"], domain_id
             )
 
-        params = self._set_metadata_info_from_transaction(params)
-
-        asset_vo = self.asset_mgr.create_asset(params)
-
-        # Create New History
-        history_mgr.add_new_history(asset_vo, params)
-
-        # Create Collection State
-        self.state_mgr.create_collection_state(asset_vo.asset_id, domain_id)
-
-        return asset_vo
+        return self._set_metadata_info_from_transaction(params)
 
     @transaction(
         permission="inventory-v2:CloudService.write",
@@ -176,14 +222,130 @@ class AssetService(BaseService):
         Returns:
             cloud_service_vo (object)
         """
+        params = params.dict()
+
+        # asset changed by user should be rewritten by the next collecting
+        params["content_hash"] = None
+
         # check if asset type is last
-        asset_vo = self.update_resource(params.dict())
+        asset_vo = self.update_resource(params)
         return AssetResponse(**asset_vo.to_dict())
 
     @check_required(["asset_id", "workspace_id", "domain_id"])
     def update_resource(self, params: dict) -> Asset:
         history_mgr = HistoryManager()
 
+        asset_id = params["asset_id"]
+        workspace_id = params["workspace_id"]
+        user_projects = params.get("user_projects")
+        domain_id = params["domain_id"]
+
+        params = self._convert_update_params(params)
+
+        asset_vo: Asset = self.asset_mgr.get_asset(
+            asset_id, domain_id, workspace_id, user_projects
+        )
+
+        params, old_asset_data = self._make_update_params(params, asset_vo)
+
+        asset_vo = self.asset_mgr.update_asset_by_vo(params, asset_vo)
+
+        # Create Update History
+        history_mgr.add_update_history(asset_vo, params, old_asset_data)
+
+        # Update Collection History
+        state_vo = self.state_mgr.get_collection_state(asset_id, domain_id)
+        if state_vo:
+            self.state_mgr.reset_collection_state(state_vo)
+        else:
+            self.state_mgr.create_collection_state(asset_id, domain_id)
+
+        return asset_vo
+
+    def update_resources(self, params_list: List[dict]) -> List[Union[Exception, None]]:
+        """Update assets collected by collector in bulk
+        Args:
+            params_list (list): list of params for update_resource
+
+        Returns:
+            errors (list): error of each params (None if succeeded)
+        """
+
+        history_mgr = HistoryManager()
+        errors = [None] * len(params_list)
+
+        asset_vo_map = self._get_asset_vo_map(params_list)
+
+        indexes = []
+        asset_vos = []
+        update_params_list = []
+        old_asset_data_list = []
+        for index, params in enumerate(params_list):
+            try:
+                for key in ["asset_id", "workspace_id", "domain_id"]:
+                    if params.get(key) is None:
+                        raise ERROR_REQUIRED_PARAMETER(key=key)
+
+                asset_id = params["asset_id"]
+                workspace_id = params["workspace_id"]
+                user_projects = params.get("user_projects")
+                domain_id = params["domain_id"]
+
+                params = self._convert_update_params(params)
+                asset_vo = self._get_asset_vo_from_map(
+                    asset_vo_map, asset_id, domain_id, workspace_id, user_projects
+                )
+                params, old_asset_data = self._make_update_params(params, asset_vo)
+
+                indexes.append(index)
+                asset_vos.append(asset_vo)
+                update_params_list.append(params)
+                old_asset_data_list.append(old_asset_data)
+            except Exception as e:
+                errors[index] = e
+
+        failures = self.asset_mgr.update_assets_by_vos(update_params_list, asset_vos)
+
+        updated_data_list = []
+        for update_index, index in enumerate(indexes):
+            if update_index in failures:
+                errors[index] = failures[update_index]
+            else:
+                updated_data_list.append(
+                    (
+                        update_params_list[update_index],
+                        old_asset_data_list[update_index],
+                    )
+                )
+
+        # Create Update Histories
+        history_mgr.add_update_histories(updated_data_list)
+
+        # Update Collection States
+        for domain_id, asset_ids in self._group_asset_ids_by_domain(
+            [old_asset_data for new_data, old_asset_data in updated_data_list]
+        ).items():
+            self.state_mgr.reset_collection_states(asset_ids, domain_id)
+
+        return errors
+
+    def touch_resources(self, params_list: List[dict]) -> None:
+        """Refresh assets which are not changed since the last collecting
+        Args:
+            params_list (list): list of params with asset_id and domain_id
+        """
+
+        for domain_id, asset_ids in self._group_asset_ids_by_domain(
+            params_list
+        ).items():
+            self.asset_mgr.touch_assets(
+                asset_ids,
+                domain_id,
+                self.transaction.get_meta("collection_generation"),
+            )
+            self.state_mgr.reset_collection_states(asset_ids, domain_id)
+
+    def _convert_update_params(self, params: dict) -> dict:
         if json_data := params.get("json_data"):
             params["data"] = utils.load_json(json_data)
             if not isinstance(params["data"], dict):
@@ -202,14 +364,6 @@ class AssetService(BaseService):
 
             del params["json_metadata"]
 
-        secret_project_id = self.transaction.get_meta("secret.project_id")
-
-        asset_id = params["asset_id"]
-        workspace_id = params["workspace_id"]
-        user_projects = params.get("user_projects")
-        domain_id = params["domain_id"]
-        provider = self._get_provider_from_meta()
-
         if "ip_addresses" in params and params["ip_addresses"] is None:
             del params["ip_addresses"]
 
@@ -219,12 +373,15 @@ class AssetService(BaseService):
         # Change data through Collector Rule
         if self._is_created_by_collector():
             params = self.collector_rule_mgr.change_asset_data(
-                self.collector_id, domain_id, params
+                self.collector_id, params["domain_id"], params
             )
 
-        asset_vo: Asset = self.asset_mgr.get_asset(
-            asset_id, domain_id, workspace_id, user_projects
-        )
+        return params
+
+    def _make_update_params(self, params: dict, asset_vo: Asset) -> Tuple[dict, dict]:
+        secret_project_id = self.transaction.get_meta("secret.project_id")
+        domain_id = asset_vo.domain_id
+        provider = self._get_provider_from_meta()
 
         if "project_id" in params:
             self.identity_mgr.get_project(params["project_id"], domain_id)
@@ -269,20 +426,61 @@ class AssetService(BaseService):
 
         params = self.asset_mgr.merge_data(params, old_asset_data)
 
-        asset_vo = self.asset_mgr.update_asset_by_vo(params, asset_vo)
+        return params, old_asset_data
 
-        # Create Update History
-        history_mgr.add_update_history(asset_vo, params, old_asset_data)
+    def _get_asset_vo_map(self, params_list: List[dict]) -> dict:
+        asset_vo_map = {}
+        for domain_id, asset_ids in self._group_asset_ids_by_domain(
+            params_list
+        ).items():
+            asset_vos = self.asset_mgr.filter_assets(
+                asset_id=asset_ids, domain_id=domain_id
+            )
+            for asset_vo in asset_vos:
+                asset_vo_map[(asset_vo.domain_id, asset_vo.asset_id)] = asset_vo
 
-        # Update Collection History
-        state_vo = self.state_mgr.get_collection_state(asset_id, domain_id)
-        if state_vo:
-            self.state_mgr.reset_collection_state(state_vo)
-        else:
-            self.state_mgr.create_collection_state(asset_id, domain_id)
+        return asset_vo_map
+
+    @staticmethod
+    def _get_asset_vo_from_map(
+        asset_vo_map: dict,
+        asset_id: str,
+        domain_id: str,
+        workspace_id: str,
+        user_projects: list = None,
+    ) -> Asset:
+        asset_vo = asset_vo_map.get((domain_id, asset_id))
+
+        if (
+            asset_vo is None
+            or asset_vo.workspace_id != workspace_id
+            or (user_projects and asset_vo.project_id not in user_projects)
+        ):
+            conditions = {
+                "asset_id": asset_id,
+                "domain_id": domain_id,
+                "workspace_id": workspace_id,
+            }
+
+            if user_projects:
+                conditions["project_id"] = user_projects
+
+            raise ERROR_NOT_FOUND(
+                key=tuple(conditions.keys()), value=tuple(conditions.values())
+            )
 
         return asset_vo
 
+    @staticmethod
+    def _group_asset_ids_by_domain(params_list: List[dict]) -> dict:
+        asset_ids_by_domain = {}
+        for params in params_list:
+            asset_ids_by_domain.setdefault(params["domain_id"], []).append(
+                params["asset_id"]
+            )
+
+        return asset_ids_by_domain
+
     @transaction(
         permission="inventory-v2:Asset.read",
         role_types=["DOMAIN_ADMIN", "WORKSPACE_OWNER", "WORKSPACE_MEMBER"],
@@ -339,6 +537,7 @@ class AssetService(BaseService):
         Args:
             params (dict): {
                     'query': 'dict (spaceone.api.core.v1.Query)',
+                    'cursor': 'str',                # "" for the first page of cursor mode
                     'asset_id': 'str',
                     'name': 'str',
                     'state': 'str',
@@ -359,6 +558,8 @@ class AssetService(BaseService):
         Returns:
             results (list)
             total_count (int)
+            next_cursor (str)               # only in cursor mode
+            prev_cursor (str)               # only in cursor mode
         """
 
         domain_id = params.domain_id
@@ -366,6 +567,21 @@ class AssetService(BaseService):
         query = params.query or {}
         reference_filter = {"domain_id": domain_id, "workspace_id": workspace_id}
 
+        if params.cursor is not None:
+            asset_vos, next_cursor, prev_cursor = self.asset_mgr.list_assets_by_cursor(
+                query,
+                params.cursor,
+                change_filter=True,
+                domain_id=domain_id,
+                reference_filter=reference_filter,
+            )
+
+            return AssetsResponse(
+                results=[asset_vo.to_dict() for asset_vo in asset_vos],
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+            )
+
         asset_vos, total_count = self.asset_mgr.list_assets(
             query,
             change_filter=True,
@@ -401,6 +617,7 @@ class AssetService(BaseService):
         Args:
             params (dict): {
                     'query': 'dict (spaceone.api.core.v1.Query)',
+                    'cursor': 'str',        # "" for the first page of cursor mode
                     'asset_id': 'str',      # required
                     'history_id': 'str',
                     'action': 'str',
@@ -416,6 +633,8 @@ class AssetService(BaseService):
         Returns:
             results (list)
             total_count (int)
+            next_cursor (str)               # only in cursor mode
+            prev_cursor (str)               # only in cursor mode
         """
 
         self.asset_mgr.get_asset(
@@ -425,10 +644,23 @@ class AssetService(BaseService):
             params.user_projects,
         )
 
+        history_mgr = HistoryManager()
+
         query = params.query or {}
-        history_vos, total_count = self.asset_mgr.list_histories(query)
 
-        histories_info = [history_vo.to_dict() for history_vo in history_vos]
+        if params.cursor is not None:
+            histories_info, next_cursor, prev_cursor = (
+                history_mgr.list_histories_by_cursor(query, params.cursor)
+            )
+
+            return AssetHistoriesResponse(
+                results=histories_info,
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+            )
+
+        histories_info, total_count = history_mgr.list_histories(query)
+
         return AssetHistoriesResponse(results=histories_info, total_count=total_count)
 
     @staticmethod
@@ -452,6 +684,12 @@ class AssetService(BaseService):
             }
         )
 
+        # asset is stamped with generation instead of collection state
+        collection_generation = self.transaction.get_meta("collection_generation")
+        if collection_generation is not None:
+            params["collection_generation"] = collection_generation
+            params["disconnected_count"] = 0
+
         return params
 
     @staticmethod
@@ -467,14 +705,7 @@ class AssetService(BaseService):
 
     @staticmethod
     def _convert_tags_to_hash(dot_tags: dict, provider: str) -> Tuple[dict, dict]:
-        tag_keys = {provider: list(dot_tags.keys())}
-
-        tags = {provider: {}}
-        for key, value in dot_tags.items():
-            hashed_key = utils.string_to_hash(key)
-            tags[provider][hashed_key] = {"key": key, "value": value}
-
-        return tags, tag_keys
+        return convert_tags_to_hash(dot_tags, provider)
 
     @staticmethod
     def _is_different_data(new_data: dict, old_data: dict, provider: str) -> bool:
@@ -1,11 +1,17 @@
 import logging
 import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Union, Tuple
 
 from mongoengine import QuerySet
-from spaceone.core import utils
+from spaceone.core import config, utils
 from spaceone.core.error import *
 from spaceone.core.service import *
+from spaceone.core.transaction import create_transaction, delete_transaction
+
+from spaceone.inventory_v2.error.collector import ERROR_COLLECTOR_PLANNING
 
 from spaceone.inventory_v2.manager.collection_state_manager import (
     CollectionStateManager,
@@ -16,13 +22,14 @@ from spaceone.inventory_v2.manager.collector_plugin_manager import (
 )
 from spaceone.inventory_v2.manager.collector_rule_manager import CollectorRuleManager
 from spaceone.inventory_v2.manager.identity_manager import IdentityManager
+from spaceone.inventory_v2.manager.job_context_manager import JobContextManager
 from spaceone.inventory_v2.manager.job_manager import JobManager
 from spaceone.inventory_v2.manager.job_task_detail_manager import JobTaskDetailManager
 from spaceone.inventory_v2.manager.job_task_manager import JobTaskManager
 from spaceone.inventory_v2.manager.plugin_manager import PluginManager
 from spaceone.inventory_v2.manager.repository_manager import RepositoryManager
 from spaceone.inventory_v2.manager.secret_manager import SecretManager
-from spaceone.inventory_v2.model import Collector
+from spaceone.inventory_v2.model import Collector, Job
 from spaceone.inventory_v2.model.collector.request import *
 from spaceone.inventory_v2.model.collector.response import *
 from spaceone.inventory_v2.model.job.response import JobResponse
@@ -293,9 +300,9 @@ class CollectorService(BaseService):
 
         endpoint, updated_version = plugin_manager.get_endpoint(
             plugin_info["plugin_id"],
-            plugin_info.get("version"),
-            plugin_info.get("upgrade_mode", "AUTO"),
             domain_id,
+            plugin_info.get("upgrade_mode", "AUTO"),
+            plugin_info.get("version"),
         )
 
         secret_ids = self._get_secret_ids_from_filter(
@@ -474,10 +481,7 @@ class CollectorService(BaseService):
             job_vo (object)
         """
 
-        plugin_mgr = PluginManager()
         job_mgr = JobManager()
-        job_task_mgr = JobTaskManager()
-        task_detail_mgr = JobTaskDetailManager()
 
         collector_id = params.collector_id
         domain_id = params.domain_id
@@ -486,6 +490,99 @@ class CollectorService(BaseService):
         collector_vo = self.collector_mgr.get_collector(
             collector_id, domain_id, workspace_id
         )
+
+        if config.get_global("COLLECTING_ASYNC_PLANNING", False):
+            # tasks are planned by worker, so collect only creates the job
+            self._cancel_duplicate_jobs(params.dict())
+
+            create_job_params = params.dict()
+            create_job_params["plugin_id"] = collector_vo.plugin_info.plugin_id
+            create_job_params["status"] = "PLANNING"
+            job_vo = job_mgr.create_job(collector_vo, create_job_params)
+
+            job_mgr.push_planning_task(
+                {
+                    "job_id": job_vo.job_id,
+                    "collector_id": collector_id,
+                    "secret_id": params.secret_id,
+                    "workspace_id": workspace_id,
+                    "domain_id": domain_id,
+                }
+            )
+
+            _LOGGER.debug(f"[collect] push planning task ({job_vo.job_id})")
+            return JobResponse(**job_vo.to_dict())
+
+        collector_vo, tasks = self._make_collecting_tasks(params.dict(), collector_vo)
+
+        self._cancel_duplicate_jobs(params.dict())
+
+        # create job
+        create_job_params = params.dict()
+        create_job_params["plugin_id"] = collector_vo.plugin_info.plugin_id
+        create_job_params["total_tasks"] = len(tasks)
+        create_job_params["remained_tasks"] = len(tasks)
+        job_vo = job_mgr.create_job(collector_vo, create_job_params)
+
+        self._push_collecting_tasks(tasks, job_vo, collector_vo)
+
+        return JobResponse(**job_vo.to_dict())
+
+    @transaction(
+        permission="inventory-v2:Collector.write",
+        role_types=["DOMAIN_ADMIN", "WORKSPACE_OWNER", "WORKSPACE_MEMBER"],
+    )
+    @check_required(["job_id", "collector_id", "domain_id"])
+    def plan_job(self, params: dict) -> None:
+        """Plan tasks of the job created by collect (COLLECTING_ASYNC_PLANNING)
+        Args:
+            params (dict): {
+                'job_id': 'str',            # required
+                'collector_id': 'str',      # required
+                'secret_id': 'str',
+                'workspace_id': 'str | list',
+                'domain_id': 'str',         # required
+            }
+
+        Returns:
+            None
+        """
+
+        job_mgr = JobManager()
+
+        job_id = params["job_id"]
+        domain_id = params["domain_id"]
+
+        job_vo = job_mgr.get_job(job_id, domain_id)
+        if job_vo.status != "PLANNING":
+            _LOGGER.debug(f"[plan_job] skip job not in planning: {job_id}")
+            return None
+
+        try:
+            collector_vo = self.collector_mgr.get_collector(
+                params["collector_id"], domain_id, params.get("workspace_id")
+            )
+            collector_vo, tasks = self._make_collecting_tasks(params, collector_vo)
+        except Exception as e:
+            _LOGGER.error(f"[plan_job] failed to plan job ({job_id}): {e}")
+            job_mgr.make_failure_by_vo(job_vo)
+            raise e
+
+        # job can be canceled by other collect while planning
+        job_vo = job_mgr.make_in_progress_from_planning(job_id, domain_id, len(tasks))
+        if job_vo is None:
+            _LOGGER.debug(f"[plan_job] skip job canceled while planning: {job_id}")
+            return None
+
+        self._push_collecting_tasks(tasks, job_vo, collector_vo)
+
+    def _make_collecting_tasks(
+        self, params: dict, collector_vo: Collector
+    ) -> Tuple[Collector, list]:
+        plugin_mgr = PluginManager()
+
+        collector_id = collector_vo.collector_id
+        domain_id = collector_vo.domain_id
         collector_data = collector_vo.to_dict()
 
         if collector_data["resource_group"] == "WORKSPACE":
@@ -505,14 +602,14 @@ class CollectorService(BaseService):
 
         if updated_version and version != updated_version:
             _LOGGER.debug(
-                f"[collect] upgrade plugin version: {version} -> {updated_version}"
+                f"[_make_collecting_tasks] upgrade plugin version: {version} -> {updated_version}"
             )
             collector_vo = self._update_collector_plugin(
                 endpoint, updated_version, plugin_info, collector_vo
             )
 
         tasks = self._get_tasks(
-            params.dict(),
+            params,
             endpoint,
             collector_id,
             collector_vo.provider,
@@ -522,84 +619,155 @@ class CollectorService(BaseService):
             collector_workspace_id,
         )
 
+        return collector_vo, tasks
+
+    @staticmethod
+    def _cancel_duplicate_jobs(params: dict) -> None:
+        job_mgr = JobManager()
+
         duplicated_job_vos = job_mgr.get_duplicate_jobs(
-            collector_id, domain_id, workspace_id, params.secret_id
+            params["collector_id"],
+            params["domain_id"],
+            params.get("workspace_id"),
+            params.get("secret_id"),
         )
 
         for job_vo in duplicated_job_vos:
             job_mgr.make_canceled_by_vo(job_vo)
 
-        # create job
-        create_job_params = params.dict()
-        create_job_params["plugin_id"] = plugin_id
-        create_job_params["total_tasks"] = len(tasks)
-        create_job_params["remained_tasks"] = len(tasks)
-        job_vo = job_mgr.create_job(collector_vo, create_job_params)
+    def _push_collecting_tasks(
+        self, tasks: list, job_vo: Job, collector_vo: Collector
+    ) -> None:
+        job_mgr = JobManager()
+        job_task_mgr = JobTaskManager()
+        task_detail_mgr = JobTaskDetailManager()
+        job_context_mgr = JobContextManager()
+        state_mgr = CollectionStateManager()
 
-        _LOGGER.debug(f"[collect] total tasks ({job_vo.job_id}): {len(tasks)}")
-        if len(tasks) > 0:
-            for task in tasks:
-                secret_info = task["secret_info"]
-                sub_tasks = task.get("sub_tasks", [])
-                if len(sub_tasks) == 0:
-                    sub_task_count = 1
-                else:
-                    sub_task_count = len(sub_tasks)
+        collector_id = collector_vo.collector_id
+        domain_id = collector_vo.domain_id
+        use_generation = config.get_global("COLLECTING_GENERATION_MODE", False)
 
-                if "sub_tasks" in task:
-                    del task["sub_tasks"]
+        _LOGGER.debug(
+            f"[_push_collecting_tasks] total tasks ({job_vo.job_id}): {len(tasks)}"
+        )
+        if len(tasks) == 0:
+            # close job if no tasks
+            job_mgr.make_success_by_vo(job_vo)
+            return None
+
+        create_params_list = []
+        sub_tasks_list = []
+        for task in tasks:
+            secret_info = task["secret_info"]
+            sub_tasks = task.pop("sub_tasks", [])
+            sub_task_count = max(len(sub_tasks), 1)
+
+            create_params = {
+                "total_sub_tasks": sub_task_count,
+                "remained_sub_tasks": sub_task_count,
+                "job_id": job_vo.job_id,
+                "collector_id": job_vo.collector_id,
+                "secret_id": secret_info.get("secret_id"),
+                "service_account_id": secret_info.get("service_account_id"),
+                "project_id": secret_info.get("project_id"),
+                "workspace_id": secret_info.get("workspace_id"),
+                "domain_id": domain_id,
+            }
 
-                create_params = {
-                    "total_sub_tasks": sub_task_count,
-                    "remained_sub_tasks": sub_task_count,
-                    "job_id": job_vo.job_id,
-                    "collector_id": job_vo.collector_id,
-                    "secret_id": secret_info.get("secret_id"),
-                    "service_account_id": secret_info.get("service_account_id"),
-                    "project_id": secret_info.get("project_id"),
-                    "workspace_id": secret_info.get("workspace_id"),
-                    "domain_id": domain_id,
-                }
+            if use_generation and "error" not in task:
+                # assets not stamped with this generation are disconnected
+                generation = state_mgr.allocate_generation(
+                    collector_id, secret_info.get("secret_id"), domain_id
+                )
+                create_params["collection_generation"] = generation
+                task["collection_generation"] = generation
+
+            create_params_list.append(create_params)
+            sub_tasks_list.append(sub_tasks)
+
+        try:
+            # job tasks and details are created with one round trip for each
+            job_task_ids = job_task_mgr.create_job_tasks(create_params_list)
+            task_detail_mgr.create_job_task_details(
+                [job_task_id for job_task_id in job_task_ids if job_task_id],
+                job_vo.job_id,
+            )
 
-                task.update({"collector_id": collector_id, "job_id": job_vo.job_id})
+            use_job_context = job_context_mgr.is_enabled()
+            context_secret_ids = []
 
-                try:
-                    # create job task
-                    job_task_vo = job_task_mgr.create_job_task(create_params)
-                    task_detail_vo = task_detail_mgr.create_job_task_detail_by_task_vo(
-                        job_task_vo
+            collecting_params_list = []
+            for task, sub_tasks, job_task_id in zip(
+                tasks, sub_tasks_list, job_task_ids
+            ):
+                if job_task_id is None:
+                    _LOGGER.error(
+                        f"[_push_collecting_tasks] Error to create job task ({job_vo.job_id}): "
+                        f"{task['secret_info'].get('secret_id')}"
                     )
-                    task.update({"job_task_id": job_task_vo.job_task_id})
-
-                    if len(sub_tasks) > 0:
-                        for sub_task in sub_tasks:
-                            task_options = sub_task.get("task_options", {})
-                            task.update(
-                                {"task_options": task_options, "is_sub_task": True}
-                            )
-                            _LOGGER.debug(
-                                f"[collect] push sub task ({job_task_vo.job_task_id}) => {utils.dump_json(task_options)}"
-                            )
-                            job_task_mgr.push_job_task(task)
-                    else:
-                        _LOGGER.debug(
-                            f"[collect] push job task ({job_task_vo.job_task_id})"
+                    job_mgr.make_failure_by_vo(job_vo)
+                    continue
+
+                task.update(
+                    {
+                        "collector_id": collector_id,
+                        "job_id": job_vo.job_id,
+                        "job_task_id": job_task_id,
+                    }
+                )
+
+                if error := task.get("error"):
+                    # secret failed to get tasks is reported as a failed job task
+                    job_task_vo = job_task_mgr.get_job_task(job_task_id, domain_id)
+                    job_task_mgr.add_error(
+                        job_task_vo, error["error_code"], error["message"]
+                    )
+                    job_task_mgr.make_failure_by_vo(job_task_vo)
+                    continue
+
+                if use_job_context:
+                    # secret data is stored once per secret of job, not per message
+                    secret_id = task["secret_info"]["secret_id"]
+                    if secret_id not in context_secret_ids:
+                        job_context_mgr.save_secret_context(
+                            job_vo.job_id, secret_id, domain_id, task
                         )
-                        job_task_mgr.push_job_task(task)
+                        context_secret_ids.append(secret_id)
 
-                except Exception as e:
-                    _LOGGER.error(
-                        f"[collect] Error to create job task ({job_vo.job_id}): {e}",
-                        exc_info=True,
+                    task = job_context_mgr.make_reference(task)
+
+                if len(sub_tasks) > 0:
+                    for sub_task in sub_tasks:
+                        task_options = sub_task.get("task_options", {})
+                        _LOGGER.debug(
+                            f"[_push_collecting_tasks] push sub task ({job_task_id}) => {utils.dump_json(task_options)}"
+                        )
+                        collecting_params_list.append(
+                            {**task, "task_options": task_options, "is_sub_task": True}
+                        )
+                else:
+                    _LOGGER.debug(
+                        f"[_push_collecting_tasks] push job task ({job_task_id})"
                     )
-                    job_mgr.make_failure_by_vo(job_vo)
+                    collecting_params_list.append(task)
 
-            self.collector_mgr.update_last_collected_time(collector_vo)
-        else:
-            # close job if no tasks
-            job_mgr.make_success_by_vo(job_vo)
+            if use_job_context:
+                job_context_mgr.save_job_context(
+                    job_vo.job_id, domain_id, tasks[0], context_secret_ids
+                )
 
-        return JobResponse(**job_vo.to_dict())
+            # all collecting tasks are pushed with one pipeline
+            job_task_mgr.push_job_tasks(collecting_params_list)
+
+        except Exception as e:
+            _LOGGER.error(
+                f"[_push_collecting_tasks] Error to create job tasks ({job_vo.job_id}): {e}",
+                exc_info=True,
+            )
+            job_mgr.make_failure_by_vo(job_vo)
+
+        self.collector_mgr.update_last_collected_time(collector_vo)
 
     def _get_tasks(
         self,
@@ -612,19 +780,104 @@ class CollectorService(BaseService):
         domain_id: str,
         collector_workspace_id: str = None,
     ) -> list:
-        secret_mgr = SecretManager()
-        collector_plugin_mgr = CollectorPluginManager()
-
-        tasks = []
-        secret_ids = self._get_secret_ids_from_filter(
+        secrets_info = self._get_secrets_from_filter(
             secret_filter,
             collector_provider,
             domain_id,
             params.get("secret_id"),
             collector_workspace_id,
         )
+        secret_info_map = {
+            secret_info["secret_id"]: secret_info for secret_info in secrets_info
+        }
+        secret_ids = list(secret_info_map.keys())
+
+        if len(secret_ids) == 0:
+            return []
+
+        max_workers = min(
+            config.get_global("COLLECTING_PLANNING_WORKERS", 16), len(secret_ids)
+        )
+        timeout = config.get_global("COLLECTING_PLANNING_TIMEOUT", 60)
+
+        tasks = {}
+        started_at = {}
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        futures = {
+            executor.submit(
+                self._get_task_in_thread,
+                self.transaction.meta,
+                started_at,
+                endpoint,
+                collector_id,
+                plugin_info,
+                secret_id,
+                domain_id,
+            ): secret_id
+            for secret_id in secret_ids
+        }
+
+        try:
+            pending = set(futures.keys())
+            while len(pending) > 0:
+                done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    secret_id = futures[future]
+                    try:
+                        tasks[secret_id] = future.result()
+                    except Exception as e:
+                        reason = e.message if isinstance(e, ERROR_BASE) else str(e)
+                        tasks[secret_id] = self._make_failed_task(
+                            plugin_info, secret_info_map[secret_id], domain_id, reason
+                        )
+
+                # timeout is checked from when the secret is started by a thread.
+                # thread of timed out secret is not stopped, but its task is ignored.
+                for future in list(pending):
+                    secret_id = futures[future]
+                    if time.time() - started_at.get(secret_id, time.time()) > timeout:
+                        pending.discard(future)
+                        tasks[secret_id] = self._make_failed_task(
+                            plugin_info,
+                            secret_info_map[secret_id],
+                            domain_id,
+                            f"timeout ({timeout}s)",
+                        )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        failed_count = len([task for task in tasks.values() if "error" in task])
+        if failed_count > 0:
+            _LOGGER.error(
+                f"[_get_tasks] failed to get tasks of {failed_count} / "
+                f"{len(secret_ids)} secrets ({collector_id})"
+            )
+
+        return [tasks[secret_id] for secret_id in secret_ids]
+
+    @staticmethod
+    def _get_task_in_thread(
+        transaction_meta: dict,
+        started_at: dict,
+        endpoint: str,
+        collector_id: str,
+        plugin_info: dict,
+        secret_id: str,
+        domain_id: str,
+    ) -> dict:
+        started_at[secret_id] = time.time()
+
+        # transaction is stored per thread, so a copy of request's meta is used
+        create_transaction(
+            meta=transaction_meta, thread_id=str(threading.current_thread().ident)
+        )
+
+        try:
+            secret_mgr = SecretManager()
+            collector_plugin_mgr = CollectorPluginManager()
 
-        for secret_id in secret_ids:
             secret_info = secret_mgr.get_secret(secret_id, domain_id)
             secret_data = secret_mgr.get_secret_data(secret_id, domain_id)
 
@@ -635,16 +888,37 @@ class CollectorService(BaseService):
                 "domain_id": domain_id,
             }
 
-            response = collector_plugin_mgr.get_tasks(
+            response = collector_plugin_mgr.get_tasks_with_cache(
                 endpoint,
                 secret_data.get("data", {}),
-                plugin_info.get("options", {}),
+                plugin_info,
+                secret_id,
+                domain_id,
             )
             _LOGGER.debug(f"[get_tasks] sub tasks({collector_id}): {response}")
             _task["sub_tasks"] = response.get("tasks", [])
-            tasks.append(_task)
 
-        return tasks
+            return _task
+
+        finally:
+            delete_transaction()
+
+    @staticmethod
+    def _make_failed_task(
+        plugin_info: dict, secret_info: dict, domain_id: str, reason: str
+    ) -> dict:
+        error = ERROR_COLLECTOR_PLANNING(
+            secret_id=secret_info["secret_id"], reason=reason
+        )
+
+        # listed secret info has workspace_id, project_id and service_account_id
+        # of the job task, which are needed to show it in the workspace
+        return {
+            "plugin_info": plugin_info,
+            "secret_info": secret_info,
+            "domain_id": domain_id,
+            "error": {"error_code": error.error_code, "message": error.message},
+        }
 
     @staticmethod
     def _check_secrets(
@@ -784,6 +1058,11 @@ class CollectorService(BaseService):
             {"plugin_info": plugin_info}, collector_vo
         )
 
+        # cached endpoints of the previous version are not used anymore
+        PluginManager.delete_endpoint_cache(
+            plugin_info["plugin_id"], collector_vo.domain_id
+        )
+
         self.delete_collector_rules(collector_vo.collector_id, collector_vo.domain_id),
 
         collector_rules = plugin_info["metadata"].get("collector_rules", [])
@@ -804,6 +1083,20 @@ class CollectorService(BaseService):
         domain_id: str,
         secret_id: str = None,
         workspace_id: str = None,
+    ) -> list:
+        secrets_info = self._get_secrets_from_filter(
+            secret_filter, provider, domain_id, secret_id, workspace_id
+        )
+
+        return [secret_info.get("secret_id") for secret_info in secrets_info]
+
+    def _get_secrets_from_filter(
+        self,
+        secret_filter: dict,
+        provider: str,
+        domain_id: str,
+        secret_id: str = None,
+        workspace_id: str = None,
     ) -> list:
         secret_manager: SecretManager = self.locator.get_manager(SecretManager)
 
@@ -815,9 +1108,7 @@ class CollectorService(BaseService):
 
         response = secret_manager.list_secrets(query, domain_id)
 
-        return [
-            secret_info.get("secret_id") for secret_info in response.get("results", [])
-        ]
+        return response.get("results", [])
 
     @check_required(["hour"])
     def scheduled_collectors(self, params: dict) -> Tuple[QuerySet, int]:
@@ -878,6 +1169,7 @@ class CollectorService(BaseService):
             collector_id=collector_id, rule_type="MANAGED", domain_id=domain_id
         )
         old_collector_rule_vos.delete()
+        collector_rule_mgr.delete_rule_program(collector_id, domain_id)
 
     @staticmethod
     def _make_secret_filter(
@@ -98,6 +98,7 @@ class JobService(BaseService):
         Args:
             params (dict): {
                 'query': 'dict (spaceone.api.core.v1.Query)',
+                'cursor': 'str',            # "" for the first page of cursor mode
                 'job_id': 'str',
                 'status': 'str',
                 'collector_id': 'dict',
@@ -109,9 +110,23 @@ class JobService(BaseService):
         Returns:
             results (list)
             total_count (int)
+            next_cursor (str)           # only in cursor mode
+            prev_cursor (str)           # only in cursor mode
         """
 
         query = params.query or {}
+
+        if params.cursor is not None:
+            job_vos, next_cursor, prev_cursor = self.job_mgr.list_jobs_by_cursor(
+                query, params.cursor
+            )
+
+            return JobsResponse(
+                results=[job_vo.to_dict() for job_vo in job_vos],
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+            )
+
         job_vos, total_count = self.job_mgr.list_jobs(query)
 
         job_infos = [job_vo.to_dict() for job_vo in job_vos]
@@ -125,6 +125,7 @@ class JobTaskService(BaseService):
         Args:
             params (dict): {
                 'query': 'dict (spaceone.api.core.v2.Query)',
+                'cursor': 'str',                # "" for the first page of cursor mode
                 'job_task_id': 'str',
                 'status': 'str',
                 'job_id': 'str',
@@ -140,9 +141,22 @@ class JobTaskService(BaseService):
         Returns:
             results (list)
             total_count (int)
+            next_cursor (str)               # only in cursor mode
+            prev_cursor (str)               # only in cursor mode
         """
         query = params.query or {}
 
+        if params.cursor is not None:
+            job_task_vos, next_cursor, prev_cursor = self.job_task_mgr.list_by_cursor(
+                query, params.cursor
+            )
+
+            return JobTasksResponse(
+                results=[job_task_vo.to_dict() for job_task_vo in job_task_vos],
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+            )
+
         job_task_vos, total_count = self.job_task_mgr.list(query)
 
         job_task_infos = [job_task_vo.to_dict() for job_task_vo in job_task_vos]
@@ -48,6 +48,7 @@ class MetricDataService(BaseService):
         Args:
             params (dict): {
                 'query': 'dict (spaceone.api.core.v1.Query)',
+                'cursor': 'str',                # "" for the first page of cursor mode
                 'metric_id': 'str',             # required
                 'project_id': 'bool',
                 'workspace_id': 'str',          # injected from auth
@@ -61,6 +62,19 @@ class MetricDataService(BaseService):
 
         query = params.query or {}
 
+        if params.cursor is not None:
+            metric_data_vos, next_cursor, prev_cursor = (
+                self.metric_data_mgr.list_metric_data_by_cursor(query, params.cursor)
+            )
+
+            return MetricDatasResponse(
+                results=[
+                    metric_data_vo.to_dict() for metric_data_vo in metric_data_vos
+                ],
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor,
+            )
+
         metric_data_vos, total_count = self.metric_data_mgr.list_metric_data(query)
 
         metric_datas_info = [